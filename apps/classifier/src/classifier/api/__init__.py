@@ -1,11 +1,12 @@
 """Flask API routes for disaster classification service."""
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from typing import Tuple, Optional, Any
 
 from ..models import get_classifier
-from ..utils import is_related, most_relevant_keywords, matched_keywords
-from ..config import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_TOP_N
+from ..utils import is_related, is_related_from_similarity, most_relevant_keywords, matched_keywords
+from ..config import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_TOP_N, MAX_BATCH_SIZE, CLASSIFIER_VERSION
+from .wire import ARROW_MIME, read_texts, encode_results
 
 
 def create_app() -> Flask:
@@ -60,16 +61,72 @@ def create_app() -> Flask:
             'matched_keywords': matched,
             'top_keywords': top_kw,
             'relevant': bool(relevant),
+            'version': CLASSIFIER_VERSION,
             'meta': {
                 'top_n': top_n
             }
         }
         return jsonify(result), 200
     
+    @app.post('/api/classify/batch')
+    def classify_batch():
+        """
+        Classify many texts in one encoder pass (label, scores, relevance).
+        
+        Takes ``{"texts": [...]}`` as JSON or an Arrow IPC stream with a
+        ``text`` column, and answers in Arrow when the client accepts it.
+        With ``?embeddings=1`` the embedding of every relevant text is
+        returned as well.
+        """
+        with_embeddings = (request.args.get('embeddings') or '').lower() in ('1', 'true', 'yes')
+        if request.mimetype == ARROW_MIME:
+            try:
+                texts = read_texts(request.get_data())
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            data = request.get_json(silent=True) or {}
+            texts = data.get('texts')
+            if not isinstance(texts, list):
+                return jsonify({'error': 'Missing "texts" list in JSON body'}), 400
+            texts = [str(t) for t in texts]
+        if not texts:
+            return jsonify({'error': 'No texts to classify'}), 400
+        if len(texts) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} texts per batch'}), 413
+        
+        classifier = get_classifier()
+        embeddings = classifier.embed(texts)
+        labels, sims = classifier.similarity_matrix(texts, embeddings)
+        best = sims.argmax(axis=1)
+        relevant = [
+            bool(is_related_from_similarity(text, float(row[b])))
+            for text, row, b in zip(texts, sims, best)
+        ]
+        
+        if request.accept_mimetypes.best_match(['application/json', ARROW_MIME]) == ARROW_MIME:
+            return Response(
+                encode_results(labels, sims, relevant, CLASSIFIER_VERSION, embeddings if with_embeddings else None),
+                mimetype=ARROW_MIME
+            )
+        
+        results = []
+        for i, (row, b, rel) in enumerate(zip(sims.tolist(), best, relevant)):
+            result = {
+                'predicted_label': labels[b],
+                'similarity_scores': dict(zip(labels, row)),
+                'relevant': rel,
+            }
+            if with_embeddings:
+                result['embedding'] = embeddings[i].tolist() if rel else None
+            results.append(result)
+        
+        return jsonify({'version': CLASSIFIER_VERSION, 'results': results}), 200
+    
     @app.get('/health')
     def health():
         """Health check endpoint."""
-        return jsonify({'status': 'ok'}), 200
+        return jsonify({'status': 'ok', 'version': CLASSIFIER_VERSION}), 200
     
     return app
 
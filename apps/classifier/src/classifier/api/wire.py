@@ -0,0 +1,86 @@
+"""Arrow IPC encoding of batch classification requests and responses."""
+
+import json
+from typing import List, Optional
+
+import numpy as np
+import pyarrow as pa
+
+# Media type of an Arrow IPC stream
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+
+def read_texts(body: bytes) -> List[str]:
+    """
+    Read the texts of a batch request.
+
+    Args:
+        body: Arrow IPC stream with a string column ``text``
+
+    Returns:
+        Texts in request order
+
+    Raises:
+        ValueError: If the body is not an Arrow stream with a ``text`` column
+    """
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+        column = table.column("text")
+    except (pa.ArrowInvalid, KeyError) as e:
+        raise ValueError(f'Expected an Arrow stream with a "text" column: {e}') from e
+    return ["" if t is None else str(t) for t in column.to_pylist()]
+
+
+def encode_results(
+    labels: List[str],
+    sims: np.ndarray,
+    relevant: List[bool],
+    version: str,
+    embeddings: Optional[np.ndarray] = None,
+) -> bytes:
+    """
+    Encode batch results as one record batch.
+
+    Columns are ``predicted_label`` (dictionary-encoded), ``relevant`` and
+    ``scores``, a fixed-size list of float32 similarities per text in the
+    order of the ``labels`` schema metadata. The classifier version is in
+    the ``version`` metadata. With ``embeddings`` an ``embedding`` column
+    of fixed-size float32 lists is added, null for texts that are not
+    relevant.
+
+    Args:
+        labels: Label names, one per score column
+        sims: Similarity matrix with one row per text
+        relevant: Relevance decision per text
+        version: Classifier version tag
+        embeddings: Optional embedding matrix with one row per text
+
+    Returns:
+        Arrow IPC stream bytes
+    """
+    sims = np.ascontiguousarray(sims, dtype=np.float32)
+    best = sims.argmax(axis=1).astype(np.int32) if len(labels) else np.zeros(len(sims), np.int32)
+    arrays = [
+        pa.DictionaryArray.from_arrays(pa.array(best), pa.array(labels, pa.string())),
+        pa.array(relevant, pa.bool_()),
+        pa.FixedSizeListArray.from_arrays(pa.array(sims.reshape(-1)), len(labels)),
+    ]
+    names = ["predicted_label", "relevant", "scores"]
+    if embeddings is not None:
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        arrays.append(pa.FixedSizeListArray.from_arrays(
+            pa.array(embeddings.reshape(-1)),
+            embeddings.shape[1],
+            mask=pa.array([not r for r in relevant], pa.bool_()),
+        ))
+        names.append("embedding")
+    batch = pa.RecordBatch.from_arrays(
+        arrays,
+        names=names,
+        metadata={"version": version, "labels": json.dumps(labels)},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
@@ -1,7 +1,10 @@
 """Configuration management for the classifier."""
 
+import os
 from pathlib import Path
 
+from .. import __version__
+
 # Base directories
 BASE_DIR = Path(__file__).resolve().parents[3]
 SRC_DIR = BASE_DIR / "src" / "classifier"
@@ -16,6 +19,11 @@ CSV_PATH = str((DATA_DIR / "disaster_dataset.csv").resolve())
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 8000
 DEFAULT_TOP_N = 10
+MAX_BATCH_SIZE = int(os.getenv("CLASSIFIER_MAX_BATCH_SIZE", 256))
+
+# Version tag stored with every classification so stale results can be found
+MODEL_NAME = os.getenv("MODEL_NAME") or "fine-tuned-disaster-classifier"
+CLASSIFIER_VERSION = os.getenv("CLASSIFIER_VERSION") or f"{MODEL_NAME}-{__version__}"
 
 # Model thresholds
 GLOBAL_SIM_CUTOFF = 0.3
@@ -3,7 +3,7 @@
 from sentence_transformers import SentenceTransformer, util
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..config import MODEL_PATH, CSV_PATH, GLOBAL_SIM_CUTOFF, MIN_SIM_CUTOFF, QUANTILE_CUTOFF
 from ..config.keywords import LABEL_KEYWORDS
@@ -83,6 +83,44 @@ class DisasterClassifier:
             }
         }
     
+    def similarity_matrix(
+        self,
+        texts: List[str],
+        embeddings: Optional[np.ndarray] = None,
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Compute the similarity of several texts to every label centroid.
+        
+        Args:
+            texts: Input texts
+            embeddings: Embeddings of the texts from ``embed``, encoded here
+                when not given
+            
+        Returns:
+            Tuple of (label names, float32 matrix with one row per text and
+            one column per label)
+        """
+        idxs = list(self.label_centroids.keys())
+        centroids = np.stack([self.label_centroids[idx] for idx in idxs])
+        if embeddings is None:
+            embeddings = self.model.encode(texts)
+        sims = util.cos_sim(embeddings, centroids).cpu().numpy()
+        return [self.label_map[idx] for idx in idxs], sims.astype(np.float32, copy=False)
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode several texts into unit-length embeddings.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            float32 matrix with one L2-normalized row per text, so a dot
+            product is the cosine similarity
+        """
+        embeddings = self.model.encode(texts, normalize_embeddings=True)
+        return np.asarray(embeddings, dtype=np.float32)
+    
     def encode(self, text: str):
         """Encode text into embedding vector."""
         return self.model.encode(text)
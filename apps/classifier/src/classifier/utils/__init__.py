@@ -5,7 +5,7 @@ from typing import List, Dict, Any
 from sentence_transformers import util
 
 from ..config.keywords import LABEL_KEYWORDS
-from .models import get_classifier
+from ..models import get_classifier
 
 
 def most_relevant_keywords(text: str, top_n: int = 10) -> List[Dict[str, Any]]:
@@ -88,14 +88,31 @@ def is_related(text: str) -> bool:
     ]
     
     max_similarity = max(similarities) if similarities else 0
-    matched = matched_keywords(text)
+    return is_related_from_similarity(text, max_similarity)
+
+
+def is_related_from_similarity(text: str, max_similarity: float) -> bool:
+    """
+    Decide relevance from an already computed best centroid similarity.
+    
+    Args:
+        text: Input text
+        max_similarity: Highest cosine similarity to any label centroid
+        
+    Returns:
+        True if text is disaster-related, False otherwise
+    """
+    classifier = get_classifier()
     
     # Direct similarity check
     if max_similarity >= classifier.global_sim_cutoff:
         return True
     
     # Contextual check with matched keywords
-    elif max_similarity >= classifier.global_sim_cutoff * 0.7 and matched:
+    elif max_similarity >= classifier.global_sim_cutoff * 0.7:
+        matched = matched_keywords(text)
+        if not matched:
+            return False
         contextual_scores = [item['score'] for item in matched]
         avg_context_score = sum(contextual_scores) / len(contextual_scores) if contextual_scores else 0
         return avg_context_score > 0.5
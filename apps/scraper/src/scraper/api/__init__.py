@@ -1,13 +1,37 @@
 """Flask API routes for scraper service."""
 
+import logging
+import os
 import re
-from flask import Flask, request, jsonify
+from datetime import datetime, timedelta, timezone
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from typing import List, Dict, Any, Optional
 
+from ..archive import get_archiver
 from ..manager import get_scraper
-from ..utils import get_db, sanitize_keywords, check_text_relevance, load_keywords_from_file
-from ..config import DEFAULT_HOST, DEFAULT_PORT, BASE_DIR
+from ..metrics import get_metrics
+from ..backfill import get_backfill
+from ..incidents import get_incidents
+from ..stream import get_broadcaster
+from ..utils import get_db, sanitize_keywords, load_keywords_from_file, get_embedded_classifier
+from ..utils.rollups import GRANULARITIES
+from ..config import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    BASE_DIR,
+    LOG_LEVEL,
+    ROLLUP_MAX_POINTS,
+    CLASSIFIER_MODE,
+    RESUME_ON_START,
+)
+
+logger = logging.getLogger(__name__)
+
+DURATION_RE = re.compile(r"^(\d+)([mhd])$")
+DURATION_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+# Range served when neither `range` nor `since` is given
+DEFAULT_RANGES = {'minute': timedelta(hours=1), 'hour': timedelta(days=1)}
 
 
 def create_app() -> Flask:
@@ -16,13 +40,18 @@ def create_app() -> Flask:
     CORS(app)
     
     scraper = get_scraper()
+    backfill = get_backfill()
+    archiver = get_archiver()
+    incidents = get_incidents()
+    broadcaster = get_broadcaster()
+    metrics = get_metrics()
     db = get_db()
     
     # Load default keywords
     default_keywords = load_keywords_from_file(BASE_DIR / "data" / "keywords.json")
     
-    def _parse_keywords(req) -> List[str]:
-        """Parse keywords from request."""
+    def _parse_keywords(req, use_default: bool = True) -> List[str]:
+        """Parse keywords from request, falling back to the default keywords."""
         if req.is_json:
             data = req.get_json(silent=True) or {}
             kws = data.get("keywords")
@@ -33,13 +62,13 @@ def create_app() -> Flask:
         if qs:
             return [k.strip() for k in qs.split(",") if k.strip()]
         
-        return default_keywords
+        return default_keywords if use_default else []
     
     @app.route('/scrape', methods=['GET', 'POST'])
     def scrape():
         """Start scraping with provided keywords."""
         keywords_list = sanitize_keywords(_parse_keywords(request))
-        print(f"Parsed keywords: {keywords_list}")
+        logger.debug("Parsed keywords: %s", keywords_list)
         
         if not keywords_list:
             return jsonify({
@@ -80,52 +109,79 @@ def create_app() -> Flask:
     
     @app.route('/restart', methods=['POST'])
     def restart():
-        """Restart scraping with optional new keywords."""
+        """Apply new keywords live, or restart the scraping thread with ?hard=1."""
         kws = sanitize_keywords(_parse_keywords(request))
-        ok, msg = scraper.restart_scraper(kws if kws else None)
+        hard = (request.args.get('hard') or '').lower() in ('1', 'true', 'yes')
+        ok, msg = scraper.restart_scraper(kws if kws else None, hard=hard)
         status = 200 if ok else 400
-        return jsonify({'message': msg, 'keywords': scraper.latest_keywords}), status
+        return jsonify({'message': msg, 'keywords': scraper.get_keywords()}), status
+    
+    @app.route('/keywords', methods=['GET'])
+    def get_keywords():
+        """Get the configured keywords."""
+        return jsonify({'keywords': scraper.get_keywords(), 'is_running': scraper.is_running})
+    
+    @app.route('/keywords', methods=['PUT', 'POST', 'DELETE'])
+    def update_keywords():
+        """Replace (PUT), add (POST) or remove (DELETE) keywords without a restart."""
+        kws = sanitize_keywords(_parse_keywords(request, use_default=False))
+        if not kws and request.method != 'PUT':
+            return jsonify({'error': 'No keywords provided'}), 400
+        
+        if request.method == 'PUT':
+            current = scraper.set_keywords(kws)
+        elif request.method == 'POST':
+            current = scraper.add_keywords(kws)
+        else:
+            current = scraper.remove_keywords(kws)
+        return jsonify({'keywords': current, 'is_running': scraper.is_running}), 200
     
     @app.route('/status', methods=['GET'])
     def status():
         """Get scraper status."""
         return jsonify(scraper.get_status())
     
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics_snapshot():
+        """Get pipeline counters and latency summaries."""
+        return jsonify(metrics.snapshot())
+    
     @app.route('/results', methods=['GET'])
     def get_results():
         """Get scraping results from database."""
         keyword = request.args.get('keyword')
         keywords_csv = request.args.get('keywords')
         limit = int(request.args.get('limit', '10'))
+        before = request.args.get('before')
         
         if keyword:
-            data = db.fetch_tweets(keyword=keyword, limit=limit)
+            data = db.fetch_tweets(keyword=keyword, limit=limit, before=before)
             return jsonify(data)
         
         if keywords_csv:
             kws = [k.strip() for k in keywords_csv.split(',') if k.strip()]
-            groups = {}
-            for kw in kws:
-                groups[kw] = db.fetch_tweets(keyword=kw, limit=limit)
-            return jsonify(groups)
-        
-        # Return processed in-memory results
-        raw_results = scraper.get_results()
-        processed_results = {}
+            return jsonify(db.fetch_tweets_grouped(kws, limit=limit, before=before))
         
-        for category, texts in raw_results.items():
-            processed_results[category] = []
-            for text in texts:
-                if text and str(text).strip():
-                    relevance_result = check_text_relevance(str(text))
-                    processed_results[category].append(relevance_result)
+        # Serve in-memory results with the relevance stored at scrape time;
+        # unchanged results are answered with 304 before anything is copied
+        etag = scraper.get_results_version()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
         
-        return jsonify(processed_results)
+        etag, results = scraper.get_results_snapshot()
+        response = jsonify(results)
+        response.set_etag(etag)
+        return response
     
     @app.route('/results/raw', methods=['GET'])
     def get_raw_results():
-        """Get raw in-memory results."""
-        return jsonify(scraper.get_results())
+        """Get raw in-memory result texts."""
+        return jsonify({
+            kw: [item['text'] for item in items]
+            for kw, items in scraper.get_results().items()
+        })
     
     @app.route('/tweets/relevant', methods=['GET'])
     def get_relevant_tweets():
@@ -141,29 +197,159 @@ def create_app() -> Flask:
             limit_i = 20
         
         # Fetch relevant tweets
-        tweets = db.fetch_tweets(keywords=kws if kws else None, limit=limit_i, relevant_only=True)
-        
-        # If no results and recompute requested, backfill
-        if not tweets:
-            recompute = (request.args.get('recompute') or '').lower() in ('1', 'true', 'yes')
-            if recompute and db.enabled:
-                # Fetch recent tweets and classify them
-                recent = db.fetch_tweets(keywords=kws if kws else None, limit=limit_i)
-                relevant_tweets = []
-                
-                for tweet in recent:
-                    text = tweet.get('text', '')
-                    if text:
-                        result = check_text_relevance(text)
-                        relevant = bool(result.get('relevant', False))
-                        if relevant:
-                            tweet['relevant'] = True
-                            relevant_tweets.append(tweet)
-                
-                tweets = relevant_tweets
+        tweets = db.fetch_tweets(
+            keywords=kws if kws else None,
+            limit=limit_i,
+            relevant_only=True,
+            before=request.args.get('before')
+        )
+        
+        # Classification never runs inline; recompute schedules a background backfill
+        recompute = (request.args.get('recompute') or '').lower() in ('1', 'true', 'yes')
+        if recompute:
+            backfill.start()
         
         return jsonify(tweets)
     
+    @app.route('/timeseries', methods=['GET'])
+    def get_timeseries():
+        """Get tweet counts per keyword and time bucket from the rollups."""
+        granularity = (request.args.get('granularity') or 'hour').lower()
+        if granularity not in GRANULARITIES:
+            return jsonify({'error': f"granularity must be one of {', '.join(GRANULARITIES)}"}), 400
+        
+        try:
+            until = _parse_time(request.args.get('until')) or datetime.now(timezone.utc)
+            since = _parse_time(request.args.get('since'))
+            span = _parse_duration(request.args.get('range'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if since is None:
+            try:
+                since = until - (span or DEFAULT_RANGES[granularity])
+            except OverflowError:
+                return jsonify({'error': 'range reaches past the earliest supported time'}), 400
+        
+        step = GRANULARITIES[granularity]
+        if since >= until:
+            return jsonify({'error': 'since must be before until'}), 400
+        if (until - since) / step > ROLLUP_MAX_POINTS:
+            return jsonify({'error': f'range exceeds {ROLLUP_MAX_POINTS} {granularity} buckets'}), 400
+        
+        kws = sanitize_keywords(_parse_keywords(request, use_default=False))
+        kws = kws or scraper.get_keywords() or default_keywords
+        return jsonify({
+            'granularity': granularity,
+            'since': since.isoformat(),
+            'until': until.isoformat(),
+            'series': db.fetch_timeseries(kws, granularity, since, until),
+        })
+    
+    @app.route('/incidents', methods=['GET'])
+    def list_incidents():
+        """Get incidents clustered from relevant tweets, most recently active first."""
+        try:
+            limit = max(1, min(200, int(request.args.get('limit', '50'))))
+            since = _parse_time(request.args.get('since'))
+            span = _parse_duration(request.args.get('range'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if since is None and span is not None:
+            try:
+                since = datetime.now(timezone.utc) - span
+            except OverflowError:
+                return jsonify({'error': 'range reaches past the earliest supported time'}), 400
+        
+        return jsonify(incidents.list_incidents(
+            label=request.args.get('label') or None,
+            keyword=request.args.get('keyword') or None,
+            since=since,
+            active_only=(request.args.get('active') or '').lower() in ('1', 'true', 'yes'),
+            limit=limit,
+        ))
+    
+    @app.route('/incidents/<incident_id>', methods=['GET'])
+    def get_incident(incident_id: str):
+        """Get one incident with its newest tweets."""
+        incident = incidents.get_incident(incident_id)
+        if incident is None:
+            return jsonify({'error': 'Unknown incident'}), 404
+        try:
+            limit = max(1, min(100, int(request.args.get('limit', '20'))))
+        except ValueError:
+            limit = 20
+        incident['tweets'] = db.fetch_tweets(
+            incident_id=incident_id,
+            limit=limit,
+            before=request.args.get('before')
+        )
+        return jsonify(incident)
+    
+    @app.route('/backfill', methods=['GET'])
+    def backfill_status():
+        """Get progress of the reclassification backfill."""
+        return jsonify(backfill.get_status())
+    
+    @app.route('/backfill', methods=['POST'])
+    def start_backfill():
+        """Reclassify tweets missing or stale for the current classifier version."""
+        pending_only = (request.args.get('pending') or '').lower() in ('1', 'true', 'yes')
+        ok, msg = backfill.start(pending_only=pending_only)
+        status = 202 if ok else 409
+        return jsonify({'message': msg, **backfill.get_status()}), status
+    
+    @app.route('/archive', methods=['GET'])
+    def get_archived_tweets():
+        """Get tweets moved out of Mongo by the retention archiver."""
+        kws = sanitize_keywords(_parse_keywords(request, use_default=False))
+        relevant_only = (request.args.get('relevant') or '').lower() in ('1', 'true', 'yes')
+        try:
+            limit = max(1, min(1000, int(request.args.get('limit', '100'))))
+            since = _parse_time(request.args.get('since'))
+            until = _parse_time(request.args.get('until'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(archiver.query(
+            keywords=kws or None,
+            since=since,
+            until=until,
+            relevant_only=relevant_only,
+            limit=limit,
+            before=request.args.get('before'),
+        ))
+    
+    @app.route('/archive/status', methods=['GET'])
+    def archive_status():
+        """Get progress of the retention archiver."""
+        return jsonify(archiver.get_status())
+    
+    @app.route('/archive', methods=['POST'])
+    def run_archive():
+        """Archive tweets older than the hot window now."""
+        ok, msg = archiver.trigger()
+        status = 202 if ok else 409
+        return jsonify({'message': msg, **archiver.get_status()}), status
+    
+    @app.route('/stream', methods=['GET'])
+    def stream():
+        """Push newly stored tweets as server-sent events."""
+        keywords_csv = request.args.get('keywords') or request.args.get('keyword') or ''
+        kws = sanitize_keywords([k for k in keywords_csv.split(',') if k.strip()])
+        relevant_only = (request.args.get('relevant') or '').lower() in ('1', 'true', 'yes')
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since')
+        
+        sub, backlog = broadcaster.subscribe(
+            keywords=set(kws) if kws else None,
+            relevant_only=relevant_only,
+            last_event_id=last_event_id
+        )
+        return Response(
+            stream_with_context(broadcaster.stream(sub, backlog)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
     @app.route('/health', methods=['GET'])
     def health():
         """Health check endpoint."""
@@ -176,8 +362,62 @@ def create_app() -> Flask:
     return app
 
 
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp or epoch seconds, taking naive values as UTC."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        try:
+            return datetime.fromtimestamp(seconds, timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f"Timestamp out of range: {value}")
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {value}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _parse_duration(value: Optional[str]) -> Optional[timedelta]:
+    """Parse a duration such as ``90m``, ``24h`` or ``7d``."""
+    if not value:
+        return None
+    match = DURATION_RE.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid range: {value} (use e.g. 90m, 24h, 7d)")
+    try:
+        return timedelta(**{DURATION_UNITS[match.group(2)]: int(match.group(1))})
+    except OverflowError:
+        raise ValueError(f"Range out of bounds: {value}")
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    """Send log records from every scraper module to stderr at the given level."""
+    logging.basicConfig(
+        level=getattr(logging, level, logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
 def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, debug: bool = True):
     """Run the Flask development server."""
+    configure_logging()
     app = create_app()
-    print(f"Starting Flask server on http://{host}:{port}")
+    # With the debug reloader only the child process serving requests archives,
+    # checkpoints and loads the embedded model
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        scraper = get_scraper()
+        scraper.checkpointer.start(scraper.export_state)
+        if RESUME_ON_START and scraper.resume_scraping():
+            logger.info("Resumed scraping %s keywords from checkpoint", len(scraper.get_keywords()))
+        get_archiver().start()
+        if CLASSIFIER_MODE == "embedded":
+            get_embedded_classifier().start()
+        # Tweets left pending by the previous run
+        get_backfill().start(pending_only=True)
+    logger.info("Starting Flask server on http://%s:%s", host, port)
     app.run(host=host, port=port, debug=debug)
@@ -0,0 +1,317 @@
+"""Tiered retention: moves old tweets from Mongo to compressed Parquet files."""
+
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from threading import Thread, Event, Lock
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .metrics import get_metrics
+from .utils import get_db
+from .utils.database import DatabaseManager, decode_cursor
+from .config import (
+    HOT_RETENTION_DAYS,
+    ARCHIVE_DIR,
+    ARCHIVE_CHUNK_SIZE,
+    ARCHIVE_INTERVAL_SECONDS,
+    ARCHIVE_COMPRESSION_LEVEL,
+)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+TIMESTAMP = pa.timestamp("ms", tz="UTC")
+ARCHIVE_SCHEMA = pa.schema([
+    ("_id", pa.string()),
+    ("keyword", pa.string()),
+    ("text", pa.string()),
+    ("text_sha1", pa.string()),
+    ("tweet_id", pa.string()),
+    ("author", pa.string()),
+    ("tweeted_at", TIMESTAMP),
+    ("link", pa.string()),
+    ("relevant", pa.bool_()),
+    ("label", pa.string()),
+    ("scores", pa.map_(pa.string(), pa.float64())),
+    ("classifier_version", pa.string()),
+    ("classified_at", TIMESTAMP),
+    ("inserted_at", TIMESTAMP),
+    ("simhash", pa.int64()),
+    ("near_duplicate_of", pa.string()),
+    ("incident_id", pa.string()),
+])
+
+
+class TweetArchiver:
+    """
+    Keeps the ``tweets`` collection to a hot window and archives the rest.
+
+    A background thread periodically reads tweets older than the hot window
+    in ``inserted_at`` order, one chunk at a time, writes each chunk as one
+    zstd-compressed Parquet file per day (``<dir>/date=2025-09-03/part-*.parquet``),
+    and deletes the chunk from Mongo
+    only after its files are on disk. A file is written under a temporary
+    name and renamed, so readers never see a partial file; a crash between
+    writing and deleting archives a chunk twice, which ``query`` drops.
+    """
+
+    def __init__(
+        self,
+        directory: Path = ARCHIVE_DIR,
+        retention_days: float = HOT_RETENTION_DAYS,
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+        interval: float = ARCHIVE_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize the archiver.
+
+        Args:
+            directory: Root directory of the Parquet archive
+            retention_days: Days tweets stay in Mongo, 0 disables archiving
+            chunk_size: Tweets read, written and deleted per step
+            interval: Seconds between archiving passes
+        """
+        self.directory = Path(directory)
+        self.retention = timedelta(days=retention_days)
+        self.chunk_size = max(1, chunk_size)
+        self.interval = interval
+        self.db: DatabaseManager = get_db()
+        self.thread: Optional[Thread] = None
+        self.stop_event = Event()
+        self.wake_event = Event()
+        self._lock = Lock()
+        self._status: Dict[str, Any] = {
+            'state': 'idle',
+            'enabled': self.enabled,
+            'retention_days': retention_days,
+            'archived': 0,
+            'files': 0,
+            'last_run_at': None,
+            'last_cutoff': None,
+            'error': None,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a hot window is configured."""
+        return self.retention > timedelta(0)
+
+    def start(self) -> bool:
+        """Start the periodic archiving thread if enabled and not running."""
+        if not self.enabled or not self.db.enabled:
+            return False
+        if self.thread and self.thread.is_alive():
+            return False
+        self.db.ensure_archive_index()
+        self.stop_event.clear()
+        self.thread = Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop after the chunk in progress."""
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def trigger(self) -> tuple[bool, str]:
+        """
+        Run a pass now instead of waiting for the interval.
+
+        Returns:
+            Tuple of (triggered, message)
+        """
+        if not self.enabled:
+            return False, "Archiving disabled (SCRAPER_HOT_RETENTION_DAYS is 0)"
+        if not self.db.enabled:
+            return False, "Database disabled"
+        self.start()
+        self.wake_event.set()
+        return True, "Archive pass scheduled"
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get totals of the archiver since startup."""
+        with self._lock:
+            return dict(self._status)
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            self.run_once()
+            self.wake_event.wait(self.interval)
+            self.wake_event.clear()
+
+    def run_once(self) -> int:
+        """
+        Archive every tweet older than the hot window.
+
+        Returns:
+            Number of tweets moved to the archive
+        """
+        cutoff = datetime.now(timezone.utc) - self.retention
+        with self._lock:
+            self._status.update(state='running', last_cutoff=cutoff.isoformat(), error=None)
+        moved = 0
+        try:
+            while not self.stop_event.is_set():
+                docs = self.db.find_archivable(cutoff, self.chunk_size)
+                if not docs:
+                    break
+                with metrics.timer('archive_chunk_seconds'):
+                    files = self._write_chunk(docs)
+                    deleted = self.db.delete_tweets([d["_id"] for d in docs])
+                moved += len(docs)
+                metrics.inc('archived_tweets_total', len(docs))
+                with self._lock:
+                    self._status['archived'] += len(docs)
+                    self._status['files'] += files
+                if deleted < len(docs):
+                    logger.warning("[archive] %s of %s archived tweets were already gone", len(docs) - deleted, len(docs))
+            state = 'idle'
+        except Exception as e:
+            state = 'error'
+            with self._lock:
+                self._status['error'] = str(e)
+            logger.warning("[archive] pass failed: %s", e)
+        with self._lock:
+            self._status.update(state=state, last_run_at=time.time())
+        if moved:
+            logger.info("[archive] moved %s tweets older than %s", moved, cutoff.isoformat())
+        return moved
+
+    def _write_chunk(self, docs: List[Dict[str, Any]]) -> int:
+        """Write a chunk as one Parquet file per day; returns the number of files."""
+        by_day: Dict[date, List[Dict[str, Any]]] = {}
+        for doc in docs:
+            by_day.setdefault(doc["inserted_at"].astimezone(timezone.utc).date(), []).append(doc)
+
+        for day, rows in by_day.items():
+            partition = self.directory / f"date={day.isoformat()}"
+            partition.mkdir(parents=True, exist_ok=True)
+            name = f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+            tmp = partition / f".{name}.tmp"
+            table = pa.Table.from_pylist([row for doc in rows for row in _to_rows(doc)], schema=ARCHIVE_SCHEMA)
+            pq.write_table(
+                table,
+                tmp,
+                compression="zstd",
+                compression_level=ARCHIVE_COMPRESSION_LEVEL,
+                row_group_size=self.chunk_size,
+            )
+            os.replace(tmp, partition / name)
+        return len(by_day)
+
+    def query(
+        self,
+        keywords: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        relevant_only: bool = False,
+        limit: int = 100,
+        before: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read archived tweets, newest first, in the format of ``fetch_tweets``.
+
+        Day partitions are read newest first and reading stops once ``limit``
+        tweets are found, so recent history costs a few files however large
+        the archive grows. Filters are pushed down to Parquet row group
+        statistics.
+
+        Args:
+            keywords: Keywords to return, or None for all
+            since: Only tweets inserted at or after this time
+            until: Only tweets inserted before this time
+            relevant_only: Only return relevant tweets
+            limit: Maximum number of tweets
+            before: Keyset cursor from a previous page (``cursor`` of its last tweet)
+
+        Returns:
+            Tweet dictionaries, each with a ``cursor`` for the next page
+        """
+        position = decode_cursor(before) if before else None
+        if position:
+            until = min(until, position[0]) if until else position[0]
+
+        conditions = []
+        if keywords:
+            conditions.append(pc.field("keyword").isin(keywords))
+        if relevant_only:
+            conditions.append(pc.field("relevant") == True)  # noqa: E712 - builds an expression
+        if since:
+            conditions.append(pc.field("inserted_at") >= pa.scalar(since, TIMESTAMP))
+        if until:
+            # The cursor's own timestamp stays in range for rows with smaller ids
+            upper = pc.field("inserted_at") <= pa.scalar(until, TIMESTAMP)
+            conditions.append(upper if position else pc.field("inserted_at") < pa.scalar(until, TIMESTAMP))
+        expr = None
+        for cond in conditions:
+            expr = cond if expr is None else expr & cond
+
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        for partition in self._partitions(since, until):
+            table = ds.dataset(partition, format="parquet", schema=ARCHIVE_SCHEMA).to_table(filter=expr)
+            table = table.sort_by([("inserted_at", "descending"), ("_id", "descending")])
+            for batch in table.to_batches(max_chunksize=max(1, limit)):
+                for row in batch.to_pylist():
+                    if row["_id"] in seen:
+                        continue
+                    seen.add(row["_id"])
+                    if position and row["inserted_at"] == position[0] and row["_id"] >= str(position[1]):
+                        continue
+                    results.append(DatabaseManager._serialize(row))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def _partitions(self, since: Optional[datetime], until: Optional[datetime]) -> List[Path]:
+        """Day directories overlapping a range, newest first."""
+        if not self.directory.exists():
+            return []
+        first = since.astimezone(timezone.utc).date().isoformat() if since else ""
+        last = until.astimezone(timezone.utc).date().isoformat() if until else "9999-12-31"
+        days = [
+            path for path in self.directory.glob("date=*")
+            if path.is_dir() and first <= path.name[len("date="):] <= last
+        ]
+        return sorted(days, reverse=True)
+
+
+def _to_rows(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten a tweet document into archive rows.
+
+    A text-keyed document becomes one row per keyword with the same ``_id``,
+    so keyword filters stay plain column predicates; ``query`` returns each
+    ``_id`` once.
+    """
+    row = {name: doc.get(name) for name in ARCHIVE_SCHEMA.names}
+    row["_id"] = str(doc["_id"])
+    row["relevant"] = bool(doc.get("relevant", False))
+    row["scores"] = [(str(k), float(v)) for k, v in (doc.get("scores") or {}).items()]
+    for field in ("tweeted_at", "classified_at", "inserted_at"):
+        if not isinstance(row[field], datetime):
+            row[field] = None
+    keywords = doc.get("keywords")
+    if not keywords:
+        return [row]
+    return [dict(row, keyword=kw) for kw in keywords]
+
+
+# Global archiver instance
+_archiver: Optional[TweetArchiver] = None
+
+
+def get_archiver() -> TweetArchiver:
+    """Get or create the global archiver."""
+    global _archiver
+    if _archiver is None:
+        _archiver = TweetArchiver()
+    return _archiver
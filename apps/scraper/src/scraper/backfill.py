@@ -0,0 +1,181 @@
+"""Background reclassification of stored tweets."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, Event, Lock
+from typing import Dict, Any, List, Optional
+
+from .utils import get_db, classify_texts, get_classifier_version
+from .utils.circuit import OPEN, get_classifier_breaker
+from .config import BACKFILL_BATCH_SIZE, BACKFILL_CONCURRENCY
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillJob:
+    """
+    Reclassifies tweets whose classification is missing or stale.
+    
+    A full run pages through every tweet not classified by the current
+    version. A pending run only drains the queue of tweets stored while the
+    classifier was unavailable; one starts by itself whenever the classifier
+    answers again after failures. Runs pause when the circuit breaker opens.
+    """
+
+    def __init__(self, batch_size: int = BACKFILL_BATCH_SIZE, concurrency: int = BACKFILL_CONCURRENCY):
+        """
+        Initialize the backfill job.
+
+        Args:
+            batch_size: Tweets sent to the classifier per request
+            concurrency: Batches classified in parallel
+        """
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.db = get_db()
+        self.thread: Optional[Thread] = None
+        self.stop_event = Event()
+        self.breaker = get_classifier_breaker()
+        self._lock = Lock()
+        self._status: Dict[str, Any] = {
+            'state': 'idle',
+            'pending_only': False,
+            'version': None,
+            'scanned': 0,
+            'updated': 0,
+            'failed': 0,
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a backfill run is in progress."""
+        return bool(self.thread and self.thread.is_alive())
+
+    def start(self, pending_only: bool = False) -> tuple[bool, str]:
+        """
+        Start a backfill run in the background.
+
+        Args:
+            pending_only: Only classify tweets stored as pending
+
+        Returns:
+            Tuple of (started, message)
+        """
+        with self._lock:
+            if self.is_running:
+                return False, "Backfill already running"
+            if not self.db.enabled:
+                return False, "Database disabled"
+
+            version = get_classifier_version()
+            if not version:
+                return False, "Classifier unavailable"
+
+            self.stop_event.clear()
+            self._status.update(
+                state='running', pending_only=pending_only, version=version, scanned=0, updated=0, failed=0,
+                started_at=time.time(), finished_at=None, error=None,
+            )
+            self.thread = Thread(target=self._run, args=(version, pending_only), daemon=True)
+            self.thread.start()
+            return True, "Backfill started"
+
+    def stop(self) -> bool:
+        """Ask a running backfill to stop after the batches in flight."""
+        if not self.is_running:
+            return False
+        self.stop_event.set()
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get progress of the current or last run and the pending queue length."""
+        with self._lock:
+            status = dict(self._status)
+        status['pending'] = self.db.count_pending()
+        return status
+
+    def resume(self):
+        """
+        Restart a paused full run, else drain the pending queue.
+
+        Registered as the recovery listener of the classifier breaker; a full
+        run covers pending tweets as well.
+        """
+        with self._lock:
+            full = self._status['state'] == 'paused' and not self._status['pending_only']
+        started, _ = self.start(pending_only=not full)
+        if started:
+            logger.info("[backfill] classifier recovered, resuming %s", "backfill" if full else "pending tweets")
+
+    def _run(self, version: str, pending_only: bool = False):
+        """Page through stale or pending documents by ``_id`` and classify them in batches."""
+        last_id = None
+        paused = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                while not self.stop_event.is_set():
+                    if self.breaker.state == OPEN:
+                        # Resumed by the recovery listener
+                        paused = True
+                        break
+                    limit = self.batch_size * self.concurrency
+                    if pending_only:
+                        docs = self.db.find_pending(after_id=last_id, limit=limit)
+                    else:
+                        docs = self.db.find_stale_classifications(version, after_id=last_id, limit=limit)
+                    if not docs:
+                        break
+                    last_id = docs[-1]['_id']
+
+                    batches = [
+                        docs[i:i + self.batch_size]
+                        for i in range(0, len(docs), self.batch_size)
+                    ]
+                    for updated, failed in pool.map(self._classify_batch, batches):
+                        with self._lock:
+                            self._status['scanned'] += updated + failed
+                            self._status['updated'] += updated
+                            self._status['failed'] += failed
+
+            state = 'stopped' if self.stop_event.is_set() else 'paused' if paused else 'done'
+            with self._lock:
+                self._status.update(state=state, finished_at=time.time())
+            logger.info("[backfill] %s: %s", state, self.get_status())
+        except Exception as e:
+            with self._lock:
+                self._status.update(state='error', error=str(e), finished_at=time.time())
+            logger.warning("[backfill] error: %s", e)
+
+    def _classify_batch(self, docs: List[Dict[str, Any]]) -> tuple[int, int]:
+        """
+        Classify one batch and store the results.
+
+        Returns:
+            Tuple of (documents updated, documents the classifier failed on)
+        """
+        texts = [doc.get('text') or '' for doc in docs]
+        classified = classify_texts(texts)
+        updates = [
+            (doc['_id'], item)
+            for doc, item in zip(docs, classified)
+            if item.get('classifier_version')
+        ]
+        self.db.update_classifications(updates)
+        return len(updates), len(docs) - len(updates)
+
+
+# Global backfill instance
+_backfill_job: Optional[BackfillJob] = None
+
+
+def get_backfill() -> BackfillJob:
+    """Get or create the global backfill job."""
+    global _backfill_job
+    if _backfill_job is None:
+        _backfill_job = BackfillJob()
+        _backfill_job.breaker.on_recovery(_backfill_job.resume)
+    return _backfill_job
@@ -0,0 +1 @@
+"""Throughput benchmark of the scraping pipeline against local stand-ins."""
@@ -0,0 +1,295 @@
+"""Run the scraping pipeline against local stand-ins and report throughput.
+
+Run from the scraper's ``src`` directory:
+
+    python -m scraper.bench --duration 300 --keywords flood,cyclone,earthquake
+
+The scraper configuration is read from the environment at import time, so
+the stand-ins are started and the environment is set before any other
+scraper module is imported.
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from .standins import (
+    RecordedPages,
+    SyntheticTimeline,
+    start_page_server,
+    start_stub_classifier,
+)
+
+logger = logging.getLogger("scraper.bench")
+
+# Summaries reported as stage latencies, in pipeline order
+STAGE_METRICS = (
+    "scrape_seconds",
+    "process_seconds",
+    "classifier_request_seconds",
+    "classifier_batch_size",
+    "mongo_write_seconds",
+    "mongo_write_batch_size",
+)
+# URI nothing listens on; the database manager gives up after the timeout
+_NO_MONGO_URI = "mongodb://127.0.0.1:9/?serverSelectionTimeoutMS=200"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Scraper throughput benchmark")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run the scraper")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds excluded from steady-state numbers")
+    parser.add_argument("--sample-interval", type=float, default=5, help="Seconds between samples")
+    parser.add_argument("--keywords", default="flood,cyclone,earthquake,wildfire,landslide",
+                        help="Comma-separated keywords")
+    parser.add_argument("--pages", help="Directory of saved result pages (*.html) served in rotation "
+                                        "instead of synthetic timelines")
+    parser.add_argument("--tweet-rate", type=float, default=2.0,
+                        help="New synthetic tweets per keyword and second")
+    parser.add_argument("--page-size", type=int, default=20, help="Tweets per synthetic page")
+    parser.add_argument("--backlog", type=int, default=200, help="Synthetic tweets per keyword at start")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Seconds added to every page")
+    parser.add_argument("--classifier-latency", type=float, default=0.05,
+                        help="Seconds added to every classifier batch")
+    parser.add_argument("--classifier-per-text", type=float, default=0.002,
+                        help="Seconds added per classified text")
+    parser.add_argument("--rps", type=float, default=50, help="Request rate allowed against the page server")
+    parser.add_argument("--min-interval", type=float, default=1, help="Shortest time between keyword visits")
+    parser.add_argument("--max-interval", type=float, default=30, help="Longest time between keyword visits")
+    parser.add_argument("--mongo", default="auto",
+                        help="'mongomock', 'none', a mongodb:// URI, or 'auto' for mongomock when installed")
+    parser.add_argument("--db-name", default="weather_bench",
+                        help="Database used with a mongodb:// URI; dropped at start")
+    parser.add_argument("--no-tracemalloc", action="store_true",
+                        help="Skip Python allocation tracing (faster, RSS only)")
+    parser.add_argument("--top", type=int, default=5, help="Allocation sites with the most growth to list")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report to this file")
+    return parser.parse_args(argv)
+
+
+def resolve_mongo(mode: str) -> str:
+    """Turn ``--mongo auto`` into a concrete backend."""
+    if mode != "auto":
+        return mode
+    try:
+        import mongomock  # noqa: F401
+        return "mongomock"
+    except ImportError:
+        return "none"
+
+
+def configure_environment(args: argparse.Namespace, page_url: str, classifier_url: str, mongo: str):
+    """Point the scraper configuration at the stand-ins."""
+    os.environ.update({
+        "SCRAPER_ENGINE": "http",
+        "XCANCEL_BASE_URL": page_url,
+        "CLASSIFIER_URL": classifier_url,
+        "RATE_LIMIT_INITIAL_RPS": str(args.rps),
+        "RATE_LIMIT_MAX_RPS": str(args.rps),
+        "RATE_LIMIT_BURST": str(max(1.0, args.rps)),
+        "SCHEDULER_MIN_INTERVAL_SECONDS": str(args.min_interval),
+        "SCHEDULER_MAX_INTERVAL_SECONDS": str(max(args.min_interval, args.max_interval)),
+        "SCRAPER_PROFILE_ROOT": tempfile.mkdtemp(prefix="scraper-bench-profiles-"),
+    })
+    if mongo.startswith("mongodb://") or mongo.startswith("mongodb+srv://"):
+        os.environ["MONGODB_URI"] = mongo
+        os.environ["DB_NAME"] = args.db_name
+    elif mongo == "none":
+        os.environ["MONGODB_URI"] = _NO_MONGO_URI
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def counter_total(snapshot: Dict[str, Any], name: str) -> float:
+    """Sum a counter over all of its label sets."""
+    return sum(series['value'] for series in snapshot['counters'].get(name, []))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the benchmark.
+
+    Returns:
+        Report with throughput, stage latencies and memory growth
+    """
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    source = (
+        RecordedPages(args.pages) if args.pages
+        else SyntheticTimeline(args.tweet_rate, args.page_size, args.backlog)
+    )
+    pages = start_page_server(source, latency=args.page_latency)
+    classifier = start_stub_classifier(args.classifier_latency, args.classifier_per_text)
+    mongo = resolve_mongo(args.mongo)
+    configure_environment(args, pages.url, classifier.url, mongo)
+
+    from .. import config
+    if config.XCANCEL_BASE_URL != pages.url or config.CLASSIFIER_URL != classifier.url:
+        raise SystemExit(
+            "Stand-in URLs were overridden, probably by a .env file in the scraper "
+            "directory; move it aside to run the benchmark"
+        )
+
+    from ..utils import database
+    if mongo == "mongomock":
+        import mongomock
+        database.MongoClient = mongomock.MongoClient
+    elif mongo.startswith("mongodb"):
+        from pymongo import MongoClient
+        MongoClient(mongo).drop_database(args.db_name)
+
+    from ..manager import get_scraper
+    from ..metrics import get_metrics
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    scraper = get_scraper()
+    metrics = get_metrics()
+    metrics.reset()
+
+    def sample(elapsed: float) -> Dict[str, Any]:
+        snap = metrics.snapshot()
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        return {
+            't': round(elapsed, 1),
+            'found': counter_total(snap, 'tweets_found_total'),
+            'stored': counter_total(snap, 'tweets_new_total'),
+            'traced_bytes': traced,
+            'rss_bytes': rss_bytes(),
+        }
+
+    samples = [sample(0.0)]
+    warm_snapshot = None
+    started = time.perf_counter()
+    scraper.start_scraping(keywords)
+    try:
+        while True:
+            elapsed = time.perf_counter() - started
+            if elapsed >= args.duration:
+                break
+            time.sleep(min(args.sample_interval, args.duration - elapsed))
+            elapsed = time.perf_counter() - started
+            samples.append(sample(elapsed))
+            if warm_snapshot is None and elapsed >= args.warmup and tracemalloc.is_tracing():
+                warm_snapshot = tracemalloc.take_snapshot()
+            logger.info(
+                "t=%.0fs stored=%d found=%d rss=%s",
+                elapsed, samples[-1]['stored'], samples[-1]['found'], samples[-1]['rss_bytes'],
+            )
+    finally:
+        scraper.stop_scraping()
+        pages.stop()
+        classifier.stop()
+
+    elapsed = time.perf_counter() - started
+    snap = metrics.snapshot()
+    report: Dict[str, Any] = {
+        'config': {k: v for k, v in vars(args).items() if k != 'json_path'},
+        'mongo': mongo,
+        'db_enabled': scraper.db.enabled,
+        'elapsed_sec': round(elapsed, 1),
+        'tweets_found': counter_total(snap, 'tweets_found_total'),
+        'tweets_stored': counter_total(snap, 'tweets_new_total'),
+        'stages': {name: snap['summaries'].get(name, []) for name in STAGE_METRICS},
+        'counters': snap['counters'],
+        'timeline': samples,
+    }
+    report['tweets_per_sec'] = round(report['tweets_stored'] / elapsed, 2) if elapsed else None
+    report['steady_tweets_per_sec'] = _steady_rate(samples, args.warmup)
+    report['memory'] = _memory_report(samples, args.warmup, warm_snapshot, args.top)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return report
+
+
+def _steady_rate(samples: List[Dict[str, Any]], warmup: float) -> Optional[float]:
+    """Stored tweets per second after the warmup period."""
+    steady = [s for s in samples if s['t'] >= warmup]
+    if len(steady) < 2 or steady[-1]['t'] <= steady[0]['t']:
+        return None
+    return round((steady[-1]['stored'] - steady[0]['stored']) / (steady[-1]['t'] - steady[0]['t']), 2)
+
+
+def _memory_report(samples, warmup, warm_snapshot, top: int) -> Dict[str, Any]:
+    """Memory growth between the end of the warmup and the end of the run."""
+    steady = [s for s in samples if s['t'] >= warmup] or samples
+    first, last = steady[0], samples[-1]
+    stored = last['stored'] - first['stored']
+    report: Dict[str, Any] = {
+        'rss_start_bytes': samples[0]['rss_bytes'],
+        'rss_end_bytes': last['rss_bytes'],
+    }
+    for key in ('traced_bytes', 'rss_bytes'):
+        if first[key] is None or last[key] is None:
+            continue
+        growth = last[key] - first[key]
+        name = key.replace('_bytes', '')
+        report[f'{name}_growth_bytes'] = growth
+        report[f'{name}_growth_per_1k_tweets'] = round(growth / stored * 1000) if stored else None
+    if tracemalloc.is_tracing():
+        report['traced_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        if warm_snapshot is not None and top > 0:
+            diff = tracemalloc.take_snapshot().compare_to(warm_snapshot, 'lineno')
+            report['top_growth'] = [
+                {'site': str(stat.traceback), 'size_diff_bytes': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in diff[:top]
+            ]
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a readable summary of a benchmark report."""
+    print(f"elapsed: {report['elapsed_sec']}s  mongo: {report['mongo']} (enabled: {report['db_enabled']})")
+    print(f"tweets found: {report['tweets_found']:.0f}  stored: {report['tweets_stored']:.0f}")
+    print(f"throughput: {report['tweets_per_sec']} tweets/s overall, "
+          f"{report['steady_tweets_per_sec']} tweets/s after warmup")
+
+    print("\nstage                          labels                         count      p50      p95      p99      max")
+    for name, series_list in report['stages'].items():
+        for series in series_list:
+            labels = ",".join(f"{k}={v}" for k, v in sorted(series['labels'].items())) or "-"
+            print(f"{name:<30} {labels[:30]:<30} {series['count']:>5} "
+                  f"{_fmt(series['p50'])} {_fmt(series['p95'])} {_fmt(series['p99'])} {_fmt(series['max'])}")
+
+    print("\nmemory:")
+    for key, value in report['memory'].items():
+        if key == 'top_growth':
+            continue
+        print(f"  {key}: {value}")
+    for stat in report['memory'].get('top_growth', []):
+        print(f"  {stat['size_diff_bytes']:>+12} B  {stat['count_diff']:>+8}  {stat['site']}")
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:>8.4f}" if value is not None else f"{'-':>8}"
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark from the command line."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "WARNING").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    logger.setLevel(logging.INFO)
+    report = run(args)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
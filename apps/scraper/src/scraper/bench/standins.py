@@ -0,0 +1,276 @@
+"""Local stand-ins for xcancel.com and the classifier service.
+
+Nothing here imports the scraper configuration, so the servers can be
+started before the environment the scraper reads is set.
+"""
+
+import html
+import json
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+import pyarrow as pa
+
+STUB_CLASSIFIER_VERSION = "bench-stub"
+STUB_LABELS = ("flood", "cyclone", "earthquake", "wildfire", "landslide", "not_disaster")
+# Media type of an Arrow IPC stream, as exchanged with the classifier
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+
+class SyntheticTimeline:
+    """
+    Result timelines that keep growing while the benchmark runs.
+
+    Every keyword gets ``tweets_per_sec`` new tweets per second, on top of
+    ``backlog`` tweets that exist at start, so each visit has something new
+    to find and pagination stops at the first tweet seen before.
+    """
+
+    def __init__(self, tweets_per_sec: float, page_size: int, backlog: int):
+        """
+        Initialize the timeline.
+
+        Args:
+            tweets_per_sec: New tweets per keyword and second
+            page_size: Tweets per result page
+            backlog: Tweets per keyword that exist at start
+        """
+        self.tweets_per_sec = tweets_per_sec
+        self.page_size = max(1, page_size)
+        self.backlog = backlog
+        self.started = time.time()
+
+    def newest(self) -> int:
+        """Index of the newest tweet, the same for every keyword."""
+        return self.backlog + int((time.time() - self.started) * self.tweets_per_sec)
+
+    def page(self, keyword: str, offset: int) -> Tuple[List[int], Optional[int]]:
+        """
+        Get one result page, newest first.
+
+        Args:
+            keyword: Search keyword
+            offset: Tweets to skip from the newest one
+
+        Returns:
+            Tuple of (tweet indices, offset of the next page or None at the end)
+        """
+        top = self.newest() - offset
+        indices = list(range(top, max(0, top - self.page_size), -1))
+        more = top - self.page_size > 0
+        return indices, (offset + self.page_size if more else None)
+
+    @staticmethod
+    def text(keyword: str, index: int) -> str:
+        """Deterministic tweet text for a keyword and index."""
+        return f"{keyword} update #{index}: reports from district {index % 97}, level {index % 5}"
+
+    @staticmethod
+    def tweet_id(keyword: str, index: int) -> str:
+        """Deterministic status id for a keyword and index."""
+        return str(zlib.crc32(keyword.encode("utf-8")) * 10_000_000 + index)
+
+    def render(self, keyword: str, offset: int) -> str:
+        """Render a page with the markup the scraper's parser expects."""
+        indices, next_offset = self.page(keyword, offset)
+        items = "".join(self._item(keyword, i) for i in indices)
+        more = ""
+        if next_offset is not None:
+            query = urlencode({"f": "tweets", "q": keyword, "cursor": next_offset})
+            more = f'<div class="show-more"><a href="?{query}">Load more</a></div>'
+        return f'<html><body><div class="timeline">{items}{more}</div></body></html>'
+
+    def _item(self, keyword: str, index: int) -> str:
+        author = f"station{index % 13}"
+        status = f"/{author}/status/{self.tweet_id(keyword, index)}#m"
+        posted = time.gmtime(self.started + (index - self.backlog) / max(self.tweets_per_sec, 1e-6))
+        title = time.strftime("%b %d, %Y · %I:%M %p UTC", posted)
+        return (
+            f'<div class="timeline-item"><a class="tweet-link" href="{status}"></a>'
+            f'<div class="tweet-header"><a class="username" href="/{author}">@{author}</a>'
+            f'<span class="tweet-date"><a href="{status}" title="{title}">1m</a></span></div>'
+            f'<div class="tweet-content media-body">{html.escape(self.text(keyword, index))}</div></div>'
+        )
+
+
+class RecordedPages:
+    """Saved result pages served in rotation."""
+
+    def __init__(self, directory: str):
+        """
+        Load every ``*.html`` file of a directory.
+
+        Args:
+            directory: Directory with saved xcancel result pages
+        """
+        files = sorted(Path(directory).glob("*.html"))
+        if not files:
+            raise ValueError(f"No .html files in {directory}")
+        self.pages = [f.read_text(encoding="utf-8", errors="replace") for f in files]
+        self._next = 0
+        self._lock = Lock()
+
+    def render(self, keyword: str, offset: int) -> str:
+        """Get the next page; keyword and cursor are ignored."""
+        with self._lock:
+            page = self.pages[self._next % len(self.pages)]
+            self._next += 1
+        return page
+
+
+class _StandInServer:
+    """Threaded HTTP server running in a daemon thread."""
+
+    def __init__(self, handler: type, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "_StandInServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body, content_type: str):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_page_server(source, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0) -> _StandInServer:
+    """
+    Serve xcancel-style ``/search`` result pages.
+
+    Args:
+        source: ``SyntheticTimeline`` or ``RecordedPages``
+        latency: Seconds added to every response
+        host: Bind address
+        port: Bind port, 0 for any free port
+
+    Returns:
+        Running server; point ``XCANCEL_BASE_URL`` at its ``url``
+    """
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path.rstrip("/") != "/search":
+                self._send(200, '<html><body><div class="search-bar"></div></body></html>', "text/html")
+                return
+            query = parse_qs(parsed.query)
+            keyword = (query.get("q") or [""])[0]
+            try:
+                offset = int((query.get("cursor") or ["0"])[0])
+            except ValueError:
+                offset = 0
+            if latency:
+                time.sleep(latency)
+            self._send(200, source.render(keyword, offset), "text/html; charset=utf-8")
+
+    return _StandInServer(Handler, host, port).start()
+
+
+def stub_classification(text: str) -> Dict[str, Any]:
+    """Deterministic classification in the classifier's batch response format."""
+    bucket = zlib.crc32(text.encode("utf-8"))
+    label = STUB_LABELS[bucket % len(STUB_LABELS)]
+    return {
+        'predicted_label': label,
+        'similarity_scores': {lbl: (0.9 if lbl == label else 0.1) for lbl in STUB_LABELS},
+        'relevant': label != "not_disaster",
+    }
+
+
+def _arrow_results(results: List[Dict[str, Any]]) -> bytes:
+    """Encode stub results in the classifier's Arrow batch response format."""
+    labels = list(STUB_LABELS)
+    scores = [item['similarity_scores'][lbl] for item in results for lbl in labels]
+    batch = pa.RecordBatch.from_arrays(
+        [
+            pa.array([item['predicted_label'] for item in results], pa.string()).dictionary_encode(),
+            pa.array([item['relevant'] for item in results], pa.bool_()),
+            pa.FixedSizeListArray.from_arrays(pa.array(scores, pa.float32()), len(labels)),
+        ],
+        names=["predicted_label", "relevant", "scores"],
+        metadata={"version": STUB_CLASSIFIER_VERSION, "labels": json.dumps(labels)},
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def start_stub_classifier(
+    latency: float = 0.0,
+    per_text_latency: float = 0.0,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> _StandInServer:
+    """
+    Serve ``/api/classify/batch`` and ``/health`` like the classifier service.
+
+    Args:
+        latency: Seconds added to every batch request
+        per_text_latency: Seconds added per text in a batch
+        host: Bind address
+        port: Bind port, 0 for any free port
+
+    Returns:
+        Running server; point ``CLASSIFIER_URL`` at its ``url``
+    """
+
+    class Handler(_QuietHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") == "/health":
+                body = {'status': 'ok', 'version': STUB_CLASSIFIER_VERSION}
+                self._send(200, json.dumps(body), "application/json")
+            else:
+                self._send(404, json.dumps({'error': 'Not found'}), "application/json")
+
+        def do_POST(self):
+            # Query options such as ?embeddings=1 are accepted and ignored
+            if urlparse(self.path).path.rstrip("/") != "/api/classify/batch":
+                self._send(404, json.dumps({'error': 'Not found'}), "application/json")
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            data = self.rfile.read(length)
+            arrow = (self.headers.get("Content-Type") or "").startswith(ARROW_MIME)
+            try:
+                if arrow:
+                    texts = pa.ipc.open_stream(data).read_all().column("text").to_pylist()
+                else:
+                    texts = json.loads(data or b"{}").get("texts") or []
+            except (ValueError, KeyError, pa.ArrowInvalid):
+                self._send(400, json.dumps({'error': 'Invalid request body'}), "application/json")
+                return
+            time.sleep(latency + per_text_latency * len(texts))
+            results = [stub_classification(str(t)) for t in texts]
+            if ARROW_MIME in (self.headers.get("Accept") or ""):
+                self._send(200, _arrow_results(results), ARROW_MIME)
+                return
+            body = {'version': STUB_CLASSIFIER_VERSION, 'results': results}
+            self._send(200, json.dumps(body), "application/json")
+
+    return _StandInServer(Handler, host, port).start()
@@ -0,0 +1,198 @@
+"""Periodic checkpoints of scraper state, so a restarted process resumes warm."""
+
+import atexit
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Thread, Event, Lock
+from typing import Any, Callable, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from .metrics import get_metrics
+from .utils import DatabaseManager
+from .config import STATE_KEY, STATE_FILE, STATE_CHECKPOINT_SECONDS, STATE_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+# Bumped when the layout of a checkpoint changes; older checkpoints are ignored
+STATE_FORMAT = 1
+
+
+class StateCheckpointer:
+    """
+    Saves a state snapshot every ``interval`` seconds and loads it back.
+
+    The snapshot is one document in ``scraper_state`` keyed by ``key`` when
+    Mongo is connected, otherwise a JSON file written under a temporary name
+    and renamed, so a crash never leaves a partial checkpoint. A snapshot
+    equal to the last one written is skipped, and a final one is written at
+    interpreter exit. Checkpoints older than ``max_age`` seconds are ignored
+    on load, since their results and schedule no longer describe the feed.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        key: str = STATE_KEY,
+        path: Path = STATE_FILE,
+        interval: float = STATE_CHECKPOINT_SECONDS,
+        max_age: float = STATE_MAX_AGE_SECONDS,
+    ):
+        """
+        Initialize the checkpointer.
+
+        Args:
+            db: Database manager; the file is used while it is not connected
+            key: Identifier of this scraper's checkpoint document
+            path: Checkpoint file used without Mongo
+            interval: Seconds between checkpoints, 0 disables checkpointing
+            max_age: Seconds after which a checkpoint is too old to restore
+        """
+        self.db = db
+        self.key = key
+        self.path = Path(path)
+        self.interval = interval
+        self.max_age = max_age
+        self.state_col = db.db["scraper_state"] if db.enabled else None
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+        self._snapshot: Optional[Callable[[], Dict[str, Any]]] = None
+        self._lock = Lock()
+        # Last state written or loaded, without format and timestamp
+        self._last: Optional[Dict[str, Any]] = None
+        self._status: Dict[str, Any] = {
+            'enabled': self.enabled,
+            'backend': 'mongo' if self.state_col is not None else 'file',
+            'saves': 0,
+            'last_saved_at': None,
+            'restored_from': None,
+            'error': None,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether periodic checkpoints are configured."""
+        return self.interval > 0
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the last checkpoint.
+
+        Returns:
+            The saved state, or None if there is none, it is unreadable,
+            stale or of another format
+        """
+        if not self.enabled:
+            return None
+        try:
+            if self.state_col is not None:
+                doc = self.state_col.find_one({"_id": self.key})
+                state = doc.get("state") if doc else None
+            elif self.path.exists():
+                state = json.loads(self.path.read_text(encoding="utf-8"))
+            else:
+                state = None
+        except (PyMongoError, OSError, ValueError) as e:
+            logger.warning("[state] checkpoint could not be read: %s", e)
+            return None
+
+        if not state or state.get('format') != STATE_FORMAT:
+            return None
+        age = time.time() - float(state.get('saved_at') or 0)
+        if age > self.max_age:
+            logger.info("[state] ignoring checkpoint from %.0fs ago", age)
+            return None
+        with self._lock:
+            self._last = {k: v for k, v in state.items() if k not in ('format', 'saved_at')}
+            self._status['restored_from'] = state.get('saved_at')
+        return state
+
+    def save(self, state: Dict[str, Any]) -> bool:
+        """
+        Write a checkpoint unless it equals the last one written.
+
+        Args:
+            state: JSON-compatible state; ``format`` and ``saved_at`` are added
+
+        Returns:
+            True if a checkpoint was written
+        """
+        with self._lock:
+            if state == self._last:
+                return False
+        body = state
+        state = dict(body, format=STATE_FORMAT, saved_at=time.time())
+        try:
+            if self.state_col is not None:
+                self.state_col.replace_one({"_id": self.key}, {"_id": self.key, "state": state}, upsert=True)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f".{self.path.name}.tmp")
+                tmp.write_text(json.dumps(state), encoding="utf-8")
+                os.replace(tmp, self.path)
+        except (PyMongoError, OSError, TypeError, ValueError) as e:
+            metrics.inc('state_checkpoints_total', outcome='error')
+            with self._lock:
+                self._status['error'] = str(e)
+            logger.warning("[state] checkpoint failed: %s", e)
+            return False
+
+        metrics.inc('state_checkpoints_total', outcome='saved')
+        with self._lock:
+            self._last = body
+            self._status['saves'] += 1
+            self._status['last_saved_at'] = state['saved_at']
+            self._status['error'] = None
+        return True
+
+    def start(self, snapshot: Callable[[], Dict[str, Any]]) -> bool:
+        """
+        Start checkpointing in the background.
+
+        Args:
+            snapshot: Returns the state to save
+
+        Returns:
+            True if the thread was started
+        """
+        if not self.enabled:
+            return False
+        if self.thread and self.thread.is_alive():
+            return False
+        if self._snapshot is None:
+            atexit.register(self.flush)
+        self._snapshot = snapshot
+        self.stop_event.clear()
+        self.thread = Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop the thread after writing a final checkpoint."""
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+        self.flush()
+
+    def flush(self) -> bool:
+        """Write a checkpoint now."""
+        if self._snapshot is None:
+            return False
+        try:
+            return self.save(self._snapshot())
+        except Exception as e:
+            logger.warning("[state] snapshot failed: %s", e)
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the backend and checkpoint counters for status reporting."""
+        with self._lock:
+            return dict(self._status)
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.flush()
@@ -21,12 +21,149 @@ DB_NAME = os.getenv("DB_NAME") or os.getenv("MONGO_DB") or "weather"
 
 # Classifier API
 CLASSIFIER_URL = (os.getenv("CLASSIFIER_URL") or "http://localhost:8000").rstrip("/")
+CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", 64))
+# Encoding of batch classifier traffic: "arrow" sends texts and receives score
+# matrices as Arrow IPC streams, "json" for classifiers without Arrow support
+CLASSIFIER_WIRE_FORMAT = (os.getenv("CLASSIFIER_WIRE_FORMAT") or "arrow").strip().lower()
+# "http" calls the classifier service at CLASSIFIER_URL, "embedded" loads the
+# classifier package into the scraper process (single-node setups)
+CLASSIFIER_MODE = (os.getenv("CLASSIFIER_MODE") or "http").strip().lower()
+EMBEDDED_CLASSIFIER_TIMEOUT_SECONDS = float(os.getenv("EMBEDDED_CLASSIFIER_TIMEOUT_SECONDS", 120))
+# Circuit breaker around classifier requests: CIRCUIT_FAILURE_THRESHOLD failed
+# or slower than CIRCUIT_SLOW_CALL_SECONDS requests in a row open it, calls then
+# fail fast and one probe is sent every CIRCUIT_RESET_SECONDS
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CLASSIFIER_CIRCUIT_FAILURES", 3))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CLASSIFIER_CIRCUIT_RESET_SECONDS", 30))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CLASSIFIER_CIRCUIT_SLOW_SECONDS", 10))
+
+# Background reclassification of tweets missing or stale for the current
+# classifier version
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", 64))
+BACKFILL_CONCURRENCY = int(os.getenv("BACKFILL_CONCURRENCY", 2))
 
 # Scraper Configuration
 DEFAULT_KEYWORDS = []
 BACKOFF_SECONDS = 1
 MAX_BACKOFF_SECONDS = 60
 STALL_TIMEOUT_SECONDS = 180
+# Stall recovery escalates every STALL_ESCALATION_SECONDS: fresh tab, then
+# killing the driver, then restarting the scraping thread
+STALL_ESCALATION_SECONDS = float(os.getenv("SCRAPER_STALL_ESCALATION_SECONDS", 60))
+# Consecutive driver errors before the driver is restarted instead of recovered
+DRIVER_RECOVERY_ATTEMPTS = int(os.getenv("SCRAPER_DRIVER_RECOVERY_ATTEMPTS", 2))
+PAGE_LOAD_TIMEOUT_SECONDS = float(os.getenv("SCRAPER_PAGE_LOAD_TIMEOUT_SECONDS", 45))
+
+# Per-host adaptive rate limiting (requests per second): halve on rate-limit or
+# challenge pages, add RATE_LIMIT_INCREASE_RPS after each healthy streak
+RATE_LIMIT_INITIAL_RPS = float(os.getenv("RATE_LIMIT_INITIAL_RPS", 0.5))
+RATE_LIMIT_MIN_RPS = float(os.getenv("RATE_LIMIT_MIN_RPS", 0.02))
+RATE_LIMIT_MAX_RPS = float(os.getenv("RATE_LIMIT_MAX_RPS", 4))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", 2))
+RATE_LIMIT_INCREASE_RPS = float(os.getenv("RATE_LIMIT_INCREASE_RPS", 0.05))
+RATE_LIMIT_HEALTHY_STREAK = int(os.getenv("RATE_LIMIT_HEALTHY_STREAK", 10))
+RATE_LIMIT_BLOCK_COOLDOWN_SECONDS = float(os.getenv("RATE_LIMIT_BLOCK_COOLDOWN_SECONDS", 15))
+
+# Result pagination: each cycle follows the timeline until it reaches a tweet
+# already stored for the keyword, bounded by these caps
+MAX_PAGES_PER_KEYWORD = int(os.getenv("SCRAPER_MAX_PAGES_PER_KEYWORD", 5))
+MAX_ITEMS_PER_KEYWORD = int(os.getenv("SCRAPER_MAX_ITEMS_PER_KEYWORD", 100))
+RESULTS_PER_KEYWORD = 5
+
+# Keyword scheduling: visits are spaced so each one finds about
+# SCHEDULER_TARGET_NEW_PER_VISIT new tweets, within these bounds
+SCHEDULER_MIN_INTERVAL_SECONDS = float(os.getenv("SCHEDULER_MIN_INTERVAL_SECONDS", 30))
+SCHEDULER_MAX_INTERVAL_SECONDS = float(os.getenv("SCHEDULER_MAX_INTERVAL_SECONDS", 1800))
+SCHEDULER_TARGET_NEW_PER_VISIT = float(os.getenv("SCHEDULER_TARGET_NEW_PER_VISIT", 10))
+SCHEDULER_SMOOTHING = 0.3
+
+# Seen-set of stored tweet hashes, used to skip known tweets before they reach
+# the classifier or the database
+SEEN_FILTER_CAPACITY = int(os.getenv("SCRAPER_SEEN_FILTER_CAPACITY", 200000))
+SEEN_FILTER_ERROR_RATE = float(os.getenv("SCRAPER_SEEN_FILTER_ERROR_RATE", 0.001))
+
+# Near-duplicate suppression: a tweet whose SimHash is at most
+# NEAR_DUP_MAX_DISTANCE bits (-1 disables, at most 15) from a tweet classified
+# in the last NEAR_DUP_WINDOW_SECONDS reuses that classification
+NEAR_DUP_MAX_DISTANCE = int(os.getenv("SCRAPER_NEAR_DUP_MAX_DISTANCE", 3))
+NEAR_DUP_WINDOW_SECONDS = float(os.getenv("SCRAPER_NEAR_DUP_WINDOW_SECONDS", 6 * 3600))
+NEAR_DUP_CAPACITY = int(os.getenv("SCRAPER_NEAR_DUP_CAPACITY", 100000))
+
+# Incident clustering: a relevant tweet joins the active incident whose centroid
+# embedding is most similar, if at least INCIDENT_SIMILARITY, else it starts a
+# new one. Centroid weights halve every INCIDENT_HALF_LIFE_SECONDS, incidents
+# without tweets for INCIDENT_IDLE_SECONDS are closed, and each tweet is
+# compared with at most INCIDENT_MAX_ACTIVE incidents
+INCIDENTS_ENABLED = (os.getenv("SCRAPER_INCIDENTS") or "true").strip().lower() in ("1", "true", "yes")
+INCIDENT_SIMILARITY = float(os.getenv("SCRAPER_INCIDENT_SIMILARITY", 0.7))
+INCIDENT_HALF_LIFE_SECONDS = float(os.getenv("SCRAPER_INCIDENT_HALF_LIFE_SECONDS", 3 * 3600))
+INCIDENT_IDLE_SECONDS = float(os.getenv("SCRAPER_INCIDENT_IDLE_SECONDS", 12 * 3600))
+INCIDENT_MAX_ACTIVE = int(os.getenv("SCRAPER_INCIDENT_MAX_ACTIVE", 1000))
+INCIDENT_SAMPLES = 5
+
+# Scraping engine: "selenium" drives headless Chrome, "http" fetches result
+# pages directly and falls back to Selenium when a challenge page is served
+SCRAPER_ENGINE = (os.getenv("SCRAPER_ENGINE") or "selenium").strip().lower()
+XCANCEL_BASE_URL = (os.getenv("XCANCEL_BASE_URL") or "https://xcancel.com").rstrip("/")
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.7339.82 Safari/537.36"
+)
+# Browser profiles: a pool of reusable --user-data-dir slots (tmpfs by default),
+# optionally seeded from a template profile
+PROFILE_ROOT = os.getenv("SCRAPER_PROFILE_ROOT") or None
+PROFILE_POOL_SIZE = int(os.getenv("SCRAPER_PROFILE_POOL_SIZE", 2))
+PROFILE_TEMPLATE_DIR = os.getenv("SCRAPER_PROFILE_TEMPLATE_DIR") or None
+
+HTTP_CONCURRENCY = int(os.getenv("SCRAPER_HTTP_CONCURRENCY", 8))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("SCRAPER_HTTP_TIMEOUT_SECONDS", 20))
+
+# Tweet storage: "keyword" keeps one document per keyword and tweet, "text" one
+# document per tweet (status id, else normalized text) with a keywords set, so
+# a tweet matching several keywords is stored and classified once
+TWEET_STORAGE_MODE = (os.getenv("SCRAPER_TWEET_STORAGE") or "keyword").strip().lower()
+
+# Pre-aggregated tweet counts per keyword in minute and hour buckets, served
+# by /timeseries; minute buckets expire after ROLLUP_MINUTE_RETENTION_DAYS
+# (0 keeps them), and a response is capped at ROLLUP_MAX_POINTS buckets
+ROLLUP_MINUTE_RETENTION_DAYS = float(os.getenv("SCRAPER_ROLLUP_MINUTE_RETENTION_DAYS", 14))
+ROLLUP_MAX_POINTS = int(os.getenv("SCRAPER_ROLLUP_MAX_POINTS", 2000))
+
+# Tiered retention: tweets older than HOT_RETENTION_DAYS (0 keeps everything in
+# Mongo) are moved in chunks to date-partitioned, zstd-compressed Parquet files
+# under ARCHIVE_DIR, checked every ARCHIVE_INTERVAL_SECONDS
+HOT_RETENTION_DAYS = float(os.getenv("SCRAPER_HOT_RETENTION_DAYS", 0))
+ARCHIVE_DIR = Path(os.getenv("SCRAPER_ARCHIVE_DIR") or DATA_DIR / "archive")
+ARCHIVE_CHUNK_SIZE = int(os.getenv("SCRAPER_ARCHIVE_CHUNK_SIZE", 5000))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("SCRAPER_ARCHIVE_INTERVAL_SECONDS", 3600))
+ARCHIVE_COMPRESSION_LEVEL = int(os.getenv("SCRAPER_ARCHIVE_COMPRESSION_LEVEL", 9))
+
+# Live feed (/stream): events kept for resuming clients, per-client queue
+STREAM_BUFFER_SIZE = int(os.getenv("SCRAPER_STREAM_BUFFER_SIZE", 1000))
+STREAM_QUEUE_SIZE = int(os.getenv("SCRAPER_STREAM_QUEUE_SIZE", 500))
+STREAM_KEEPALIVE_SECONDS = 15
+
+# Multi-node coordination: scraper processes sharing one database register as
+# nodes and split the keywords through time-limited leases
+COORDINATION_ENABLED = (os.getenv("SCRAPER_COORDINATION") or "").strip().lower() in ("1", "true", "yes")
+NODE_ID = os.getenv("SCRAPER_NODE_ID") or None
+LEASE_TTL_SECONDS = float(os.getenv("SCRAPER_LEASE_TTL_SECONDS", 60))
+LEASE_RENEW_SECONDS = float(os.getenv("SCRAPER_LEASE_RENEW_SECONDS", 20))
+
+# Warm restarts: keywords, results, schedule and backoff state are checkpointed
+# every STATE_CHECKPOINT_SECONDS (0 disables) to Mongo, or to STATE_FILE without
+# it, and restored on startup unless older than STATE_MAX_AGE_SECONDS
+STATE_CHECKPOINT_SECONDS = float(os.getenv("SCRAPER_STATE_CHECKPOINT_SECONDS", 30))
+STATE_KEY = os.getenv("SCRAPER_STATE_KEY") or NODE_ID or "default"
+STATE_FILE = Path(os.getenv("SCRAPER_STATE_FILE") or DATA_DIR / "scraper_state.json")
+STATE_MAX_AGE_SECONDS = float(os.getenv("SCRAPER_STATE_MAX_AGE_SECONDS", 24 * 3600))
+# Start scraping on startup when the checkpointed scraper was running
+RESUME_ON_START = (os.getenv("SCRAPER_RESUME_ON_START") or "true").strip().lower() in ("1", "true", "yes")
+
+# Observability: observations kept per metrics series for percentiles, and the
+# log level applied by run_server
+METRICS_WINDOW_SIZE = int(os.getenv("SCRAPER_METRICS_WINDOW_SIZE", 1024))
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").upper()
 
 # API Configuration
 DEFAULT_HOST = "0.0.0.0"
@@ -0,0 +1,228 @@
+"""Keyword sharding across scraper processes through leases stored in Mongo."""
+
+import logging
+import math
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from threading import Thread, Event, Lock
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from .metrics import get_metrics
+from .utils import DatabaseManager
+from .config import NODE_ID, LEASE_TTL_SECONDS, LEASE_RENEW_SECONDS
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+
+def default_node_id() -> str:
+    """Node id unique per process: host name, pid and a random suffix."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaseCoordinator:
+    """
+    Claims a fair share of the keywords for this node and keeps it.
+
+    Every node registers in ``scraper_nodes`` with a heartbeat. Each keyword
+    has at most one document in ``keyword_leases`` naming its owner and an
+    expiry. A background thread renews this node's leases, releases keywords
+    above its fair share (keywords divided by live nodes) so new nodes get
+    work, and claims free or expired leases, which is how keywords of a
+    crashed node are taken over. Claims are a single conditional upsert on the
+    keyword's ``_id``, so two nodes can never hold the same lease.
+
+    A lease counts as held locally only until ``ttl - renew_interval`` after
+    its last successful renewal, so a node cut off from Mongo stops scraping
+    a keyword before another node can take it over.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        node_id: Optional[str] = NODE_ID,
+        ttl: float = LEASE_TTL_SECONDS,
+        renew_interval: float = LEASE_RENEW_SECONDS,
+    ):
+        """
+        Initialize the coordinator.
+
+        Args:
+            db: Connected database manager
+            node_id: Identifier of this node, generated when not set
+            ttl: Lease lifetime in seconds
+            renew_interval: Seconds between renewals, at most half the TTL
+        """
+        if not db.enabled:
+            raise RuntimeError("Coordination needs a database connection")
+        self.node_id = node_id or default_node_id()
+        self.ttl = ttl
+        self.renew_interval = min(renew_interval, ttl / 2)
+        self.nodes_col = db.db["scraper_nodes"]
+        self.leases_col = db.db["keyword_leases"]
+        self.nodes_col.create_index([("expires_at", 1)], expireAfterSeconds=0)
+        self.leases_col.create_index([("node", 1)])
+
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._keywords: List[str] = []
+        self._held: Dict[str, float] = {}
+        self.live_nodes = 1
+        self.target = 0
+        self.claims = 0
+        self.takeovers = 0
+        self.releases = 0
+        self.lost = 0
+
+    def start(self, keywords: List[str]):
+        """
+        Register this node and start claiming leases in the background.
+
+        Args:
+            keywords: Keywords this node may scrape
+        """
+        self.set_keywords(keywords)
+        self.stop_event.clear()
+        self._tick()
+        self.thread = Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop renewing, release every lease and deregister the node."""
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=5)
+        with self._lock:
+            held = list(self._held)
+            self._held.clear()
+        try:
+            if held:
+                self.leases_col.delete_many({"_id": {"$in": held}, "node": self.node_id})
+            self.nodes_col.delete_one({"_id": self.node_id})
+        except PyMongoError as e:
+            logger.warning("[coord] release on stop failed: %s", e)
+
+    def set_keywords(self, keywords: List[str]):
+        """Replace the keywords this node may claim; others are released next tick."""
+        with self._lock:
+            self._keywords = list(dict.fromkeys(keywords))
+
+    def owns(self, keyword: str) -> bool:
+        """Whether this node currently holds a valid lease on a keyword."""
+        with self._lock:
+            deadline = self._held.get(keyword)
+        return deadline is not None and deadline > time.monotonic()
+
+    def owned(self) -> Set[str]:
+        """Keywords this node currently holds valid leases on."""
+        now = time.monotonic()
+        with self._lock:
+            return {kw for kw, deadline in self._held.items() if deadline > now}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get lease counters for status reporting."""
+        owned = sorted(self.owned())
+        return {
+            'node_id': self.node_id,
+            'live_nodes': self.live_nodes,
+            'target': self.target,
+            'owned': owned,
+            'claims': self.claims,
+            'takeovers': self.takeovers,
+            'releases': self.releases,
+            'lost': self.lost,
+        }
+
+    def _loop(self):
+        while not self.stop_event.wait(self.renew_interval):
+            try:
+                self._tick()
+            except PyMongoError as e:
+                logger.warning("[coord] lease update failed: %s", e)
+
+    def _tick(self):
+        """Heartbeat, renew held leases, then shed or claim toward the fair share."""
+        now = datetime.now(timezone.utc)
+        expires = now + timedelta(seconds=self.ttl)
+        self.nodes_col.update_one(
+            {"_id": self.node_id},
+            {
+                "$set": {"heartbeat_at": now, "expires_at": expires, "keywords": len(self._held)},
+                "$setOnInsert": {"host": socket.gethostname(), "pid": os.getpid(), "started_at": now},
+            },
+            upsert=True,
+        )
+        self.live_nodes = max(1, self.nodes_col.count_documents({"expires_at": {"$gt": now}}))
+
+        with self._lock:
+            keywords = list(self._keywords)
+            held = list(self._held)
+        wanted = set(keywords)
+        self.target = math.ceil(len(keywords) / self.live_nodes) if keywords else 0
+
+        for kw in held:
+            if kw not in wanted:
+                self._release(kw)
+            elif not self._claim(kw, now, expires):
+                self.lost += 1
+                logger.warning("[coord] lost lease on '%s'", kw)
+
+        with self._lock:
+            held = list(self._held)
+        for kw in held[self.target:]:
+            self._release(kw)
+
+        with self._lock:
+            free = [kw for kw in keywords if kw not in self._held]
+        random.shuffle(free)
+        for kw in free:
+            if len(self._held) >= self.target:
+                break
+            self._claim(kw, now, expires)
+
+    def _claim(self, keyword: str, now: datetime, expires: datetime) -> bool:
+        """
+        Create, renew or take over the lease on a keyword.
+
+        Returns:
+            True if this node holds the lease afterwards
+        """
+        started = time.monotonic()
+        try:
+            before = self.leases_col.find_one_and_update(
+                {"_id": keyword, "$or": [{"node": self.node_id}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"node": self.node_id, "expires_at": expires, "renewed_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            # Held by another node: the upsert tried to insert a second lease
+            with self._lock:
+                self._held.pop(keyword, None)
+            return False
+
+        previous = before.get("node") if before else None
+        if previous != self.node_id:
+            self.claims += 1
+            metrics.inc('lease_claims_total', kind='takeover' if previous else 'new')
+            if previous:
+                self.takeovers += 1
+                logger.info("[coord] took over '%s' from expired node %s", keyword, previous)
+        with self._lock:
+            self._held[keyword] = started + self.ttl - self.renew_interval
+        return True
+
+    def _release(self, keyword: str):
+        """Give up a lease so another node can claim it."""
+        with self._lock:
+            self._held.pop(keyword, None)
+        self.leases_col.delete_one({"_id": keyword, "node": self.node_id})
+        self.releases += 1
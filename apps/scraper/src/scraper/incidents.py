@@ -0,0 +1,436 @@
+"""Online clustering of relevant tweets into incidents."""
+
+import logging
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+from bson import ObjectId
+from pymongo import UpdateOne, DESCENDING
+from pymongo.errors import PyMongoError
+
+from .metrics import get_metrics
+from .utils import DatabaseManager, get_db
+from .config import (
+    INCIDENTS_ENABLED,
+    INCIDENT_SIMILARITY,
+    INCIDENT_HALF_LIFE_SECONDS,
+    INCIDENT_IDLE_SECONDS,
+    INCIDENT_MAX_ACTIVE,
+    INCIDENT_SAMPLES,
+)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+# Fields returned by the API; centroids are only read back to warm the index
+INCIDENT_PROJECTION = {"centroid": 0}
+
+
+class Incident:
+    """Running state of one incident."""
+
+    __slots__ = ("id", "slot", "centroid", "weight", "count", "first_seen", "last_seen", "labels", "keywords", "samples")
+
+    def __init__(self, incident_id: str, slot: int, centroid: np.ndarray, now: float):
+        self.id = incident_id
+        self.slot = slot
+        self.centroid = centroid
+        self.weight = 0.0
+        self.count = 0
+        self.first_seen = now
+        self.last_seen = now
+        self.labels: Counter = Counter()
+        self.keywords: Counter = Counter()
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=INCIDENT_SAMPLES)
+
+    def label(self) -> Optional[str]:
+        """Most frequent classifier label of the incident's tweets."""
+        return self.labels.most_common(1)[0][0] if self.labels else None
+
+
+class IncidentAggregator:
+    """
+    Groups relevant tweets into incidents as they are ingested.
+
+    Every active incident has a unit-length centroid embedding, kept as one
+    row of a fixed-size matrix. A tweet's embedding is compared with all rows
+    in one matrix-vector product and joins the most similar incident if the
+    cosine similarity reaches ``threshold``; otherwise it starts a new one.
+    Joining moves the centroid towards the tweet by its share of the
+    incident's weight, which halves every ``half_life`` seconds, so an
+    incident follows how its story develops. Incidents without new tweets
+    for ``idle`` seconds are closed, and when all ``max_active`` rows are
+    taken the incident with the least decayed weight is closed to make room.
+    The cost of assigning a tweet is therefore bounded by ``max_active``,
+    however many tweets and incidents have been seen.
+
+    Tweets without an embedding that carry the ``incident_id`` of their
+    canonical tweet (near-duplicates, reused classifications) are counted
+    for that incident without moving its centroid.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        enabled: bool = INCIDENTS_ENABLED,
+        threshold: float = INCIDENT_SIMILARITY,
+        half_life: float = INCIDENT_HALF_LIFE_SECONDS,
+        idle: float = INCIDENT_IDLE_SECONDS,
+        max_active: int = INCIDENT_MAX_ACTIVE,
+    ):
+        """
+        Initialize the aggregator; active incidents are loaded from Mongo.
+
+        Args:
+            db: Database manager, defaults to the global one
+            enabled: Whether tweets are clustered at all
+            threshold: Lowest cosine similarity at which a tweet joins an incident
+            half_life: Seconds after which an incident's weight has halved
+            idle: Seconds without tweets after which an incident is closed
+            max_active: Incidents a tweet is compared with at most
+        """
+        self.db = db or get_db()
+        self.enabled = enabled
+        self.threshold = threshold
+        self.half_life = max(1.0, half_life)
+        self.idle = idle
+        self.max_active = max(1, max_active)
+        self.incidents_col = self.db.db["incidents"] if self.db.enabled else None
+        if self.incidents_col is not None:
+            self.incidents_col.create_index([("last_seen", DESCENDING)])
+            self.incidents_col.create_index([("label", 1), ("last_seen", DESCENDING)])
+            self.incidents_col.create_index([("keywords.keyword", 1), ("last_seen", DESCENDING)])
+
+        self._lock = Lock()
+        self._active: Dict[str, Incident] = {}
+        self._matrix: Optional[np.ndarray] = None
+        # Incident per matrix row, and which rows are taken
+        self._slots: List[Optional[Incident]] = [None] * self.max_active
+        self._occupied = np.zeros(self.max_active, dtype=bool)
+        self._dirty: Dict[str, Incident] = {}
+        self._closed: List[str] = []
+        self.created = 0
+        self.joined = 0
+        self.attached = 0
+        self.closed = 0
+        self._warm()
+
+    def assign(self, keyword: str, items: List[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """
+        Assign classified tweets to incidents.
+
+        Relevant items with an ``embedding`` are clustered; items with an
+        ``incident_id`` and no embedding are counted for that incident.
+        Sets ``incident_id`` on clustered items and removes their
+        ``embedding``. Changes are written by ``flush``.
+
+        Args:
+            keyword: Keyword the tweets were found for
+            items: Classified tweet records, newest first
+            now: Current time, defaults to the wall clock
+
+        Returns:
+            Number of items assigned to an incident
+        """
+        if not self.enabled:
+            for item in items:
+                item.pop('embedding', None)
+            return 0
+        now = time.time() if now is None else now
+        assigned = 0
+        with self._lock:
+            self._expire(now)
+            # Oldest first, so the first tweet of an incident becomes its seed
+            for item in reversed(items):
+                vector = item.pop('embedding', None)
+                if vector is not None and item.get('relevant'):
+                    incident = self._cluster(np.asarray(vector, dtype=np.float32), now)
+                elif item.get('incident_id') and item.get('relevant'):
+                    incident = self._active.get(item['incident_id'])
+                    if incident is None:
+                        continue
+                    incident.weight = self._decayed(incident, now) + 1.0
+                    self.attached += 1
+                    metrics.inc('incident_assignments_total', outcome='attached')
+                else:
+                    continue
+                item['incident_id'] = incident.id
+                self._count(incident, keyword, item, now)
+                assigned += 1
+        return assigned
+
+    def flush(self):
+        """Write incidents changed since the last flush in one bulk write."""
+        with self._lock:
+            dirty = list(self._dirty.values())
+            closed = self._closed
+            self._dirty = {}
+            self._closed = []
+            ops = [
+                UpdateOne({"_id": incident.id}, {"$set": self._document(incident)}, upsert=True)
+                for incident in dirty
+            ]
+        if self.incidents_col is None:
+            return
+        ops.extend(UpdateOne({"_id": incident_id}, {"$set": {"active": False}}) for incident_id in closed)
+        if not ops:
+            return
+        metrics.observe('mongo_write_batch_size', len(ops), op='incidents')
+        try:
+            with metrics.timer('mongo_write_seconds', op='incidents'):
+                self.incidents_col.bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            logger.warning("[incidents] write failed: %s", e)
+            metrics.inc('mongo_write_errors_total', op='incidents')
+
+    def list_incidents(
+        self,
+        label: Optional[str] = None,
+        keyword: Optional[str] = None,
+        since: Optional[datetime] = None,
+        active_only: bool = False,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get incidents, most recently active first.
+
+        Args:
+            label: Only incidents with this dominant label
+            keyword: Only incidents with tweets found for this keyword
+            since: Only incidents with tweets at or after this time
+            active_only: Only incidents that are still open
+            limit: Maximum number of incidents
+
+        Returns:
+            Incident summaries; from Mongo when connected, else the active ones
+        """
+        if self.incidents_col is None:
+            with self._lock:
+                docs = [dict(self._document(incident), _id=incident.id) for incident in self._active.values()]
+            docs = [
+                d for d in docs
+                if (label is None or d["label"] == label)
+                and (keyword is None or any(k["keyword"] == keyword for k in d["keywords"]))
+                and (since is None or d["last_seen"] >= since)
+            ]
+            docs.sort(key=lambda d: d["last_seen"], reverse=True)
+            return [self._serialize(d) for d in docs[:limit]]
+
+        query: Dict[str, Any] = {}
+        if label:
+            query["label"] = label
+        if keyword:
+            query["keywords.keyword"] = keyword
+        if since:
+            query["last_seen"] = {"$gte": since}
+        if active_only:
+            query["active"] = True
+        try:
+            cursor = (
+                self.incidents_col.find(query, projection=INCIDENT_PROJECTION)
+                .sort([("last_seen", DESCENDING)])
+                .limit(limit)
+            )
+            return [self._serialize(d) for d in cursor]
+        except PyMongoError as e:
+            logger.warning("[incidents] query failed: %s", e)
+            return []
+
+    def get_incident(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get one incident summary.
+
+        Args:
+            incident_id: Incident id
+
+        Returns:
+            The incident, or None if unknown
+        """
+        with self._lock:
+            incident = self._active.get(incident_id)
+            if incident is not None:
+                return self._serialize(dict(self._document(incident), _id=incident.id))
+        if self.incidents_col is None:
+            return None
+        try:
+            doc = self.incidents_col.find_one({"_id": incident_id}, projection=INCIDENT_PROJECTION)
+        except PyMongoError as e:
+            logger.warning("[incidents] lookup failed: %s", e)
+            return None
+        return self._serialize(doc) if doc else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of active incidents and assignment counters."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'active': len(self._active),
+                'max_active': self.max_active,
+                'created': self.created,
+                'joined': self.joined,
+                'attached': self.attached,
+                'closed': self.closed,
+            }
+
+    def _cluster(self, vector: np.ndarray, now: float) -> Incident:
+        """Join the most similar active incident or start one; the caller holds the lock."""
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+        if self._matrix is None or self._matrix.shape[1] != len(vector):
+            # First embedding, or the classifier model changed its dimension
+            self._close(list(self._active.values()), 'model_changed')
+            self._matrix = np.zeros((self.max_active, len(vector)), dtype=np.float32)
+
+        if self._active:
+            sims = self._matrix @ vector
+            sims[~self._occupied] = -np.inf
+            slot = int(sims.argmax())
+            if sims[slot] >= self.threshold:
+                incident = self._slots[slot]
+                decayed = self._decayed(incident, now)
+                centroid = incident.centroid * decayed + vector
+                incident.centroid = centroid / max(float(np.linalg.norm(centroid)), 1e-12)
+                incident.weight = decayed + 1.0
+                self._matrix[slot] = incident.centroid
+                self.joined += 1
+                metrics.inc('incident_assignments_total', outcome='joined')
+                return incident
+
+        if len(self._active) >= self.max_active:
+            weakest = min(self._active.values(), key=lambda i: self._decayed(i, now))
+            self._close([weakest], 'capacity')
+        slot = int(np.flatnonzero(~self._occupied)[0])
+        incident = Incident(str(ObjectId()), slot, vector, now)
+        incident.weight = 1.0
+        self._place(incident)
+        self.created += 1
+        metrics.inc('incident_assignments_total', outcome='created')
+        return incident
+
+    def _count(self, incident: Incident, keyword: str, item: Dict[str, Any], now: float):
+        """Add a tweet to an incident's counts and samples; the caller holds the lock."""
+        incident.count += 1
+        incident.last_seen = max(incident.last_seen, now)
+        if item.get('label'):
+            incident.labels[item['label']] += 1
+        incident.keywords[keyword] += 1
+        tweeted_at = item.get('tweeted_at')
+        incident.samples.append({
+            'text': item.get('text'),
+            'tweet_id': item.get('tweet_id'),
+            'author': item.get('author'),
+            'link': item.get('link'),
+            'tweeted_at': tweeted_at.isoformat() if isinstance(tweeted_at, datetime) else tweeted_at,
+        })
+        self._dirty[incident.id] = incident
+
+    def _decayed(self, incident: Incident, now: float) -> float:
+        """Weight of an incident decayed to ``now``."""
+        return incident.weight * 0.5 ** (max(0.0, now - incident.last_seen) / self.half_life)
+
+    def _place(self, incident: Incident):
+        """Make an incident matchable in its slot; the caller holds the lock."""
+        self._active[incident.id] = incident
+        self._slots[incident.slot] = incident
+        self._occupied[incident.slot] = True
+        self._matrix[incident.slot] = incident.centroid
+
+    def _close(self, incidents: List[Incident], reason: str):
+        """Remove incidents from matching; the caller holds the lock."""
+        for incident in incidents:
+            self._active.pop(incident.id, None)
+            self._slots[incident.slot] = None
+            self._occupied[incident.slot] = False
+            self._closed.append(incident.id)
+            self.closed += 1
+            metrics.inc('incidents_closed_total', reason=reason)
+
+    def _expire(self, now: float):
+        """Close incidents idle for longer than the idle timeout; the caller holds the lock."""
+        cutoff = now - self.idle
+        idle = [incident for incident in self._active.values() if incident.last_seen < cutoff]
+        if idle:
+            self._close(idle, 'idle')
+
+    def _document(self, incident: Incident) -> Dict[str, Any]:
+        """Build the stored representation of an incident."""
+        return {
+            "label": incident.label(),
+            "labels": [{"label": label, "count": n} for label, n in incident.labels.most_common()],
+            "keywords": [{"keyword": kw, "count": n} for kw, n in incident.keywords.most_common()],
+            "count": incident.count,
+            "weight": round(incident.weight, 4),
+            "first_seen": datetime.fromtimestamp(incident.first_seen, timezone.utc),
+            "last_seen": datetime.fromtimestamp(incident.last_seen, timezone.utc),
+            "active": incident.id in self._active,
+            "samples": list(incident.samples),
+            "centroid": incident.centroid.tolist(),
+        }
+
+    def _serialize(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a stored incident to its API representation."""
+        last_seen = doc["last_seen"]
+        age = max(0.0, time.time() - last_seen.timestamp())
+        return {
+            "id": str(doc["_id"]),
+            "label": doc.get("label"),
+            "labels": {entry["label"]: entry["count"] for entry in doc.get("labels") or []},
+            "keywords": {entry["keyword"]: entry["count"] for entry in doc.get("keywords") or []},
+            "count": doc.get("count", 0),
+            "heat": round(float(doc.get("weight") or 0.0) * 0.5 ** (age / self.half_life), 3),
+            "first_seen": doc["first_seen"].isoformat(),
+            "last_seen": last_seen.isoformat(),
+            "active": bool(doc.get("active")),
+            "samples": doc.get("samples") or [],
+        }
+
+    def _warm(self):
+        """Load incidents that are still active from Mongo."""
+        if not self.enabled or self.incidents_col is None:
+            return
+        since = datetime.fromtimestamp(time.time() - self.idle, timezone.utc)
+        try:
+            docs = list(
+                self.incidents_col.find({"active": True, "last_seen": {"$gte": since}})
+                .sort([("last_seen", DESCENDING)])
+                .limit(self.max_active)
+            )
+        except PyMongoError as e:
+            logger.warning("[incidents] warm failed: %s", e)
+            return
+        with self._lock:
+            for slot, doc in enumerate(docs):
+                centroid = np.asarray(doc.get("centroid") or [], dtype=np.float32)
+                if not len(centroid):
+                    continue
+                if self._matrix is None:
+                    self._matrix = np.zeros((self.max_active, len(centroid)), dtype=np.float32)
+                if len(centroid) != self._matrix.shape[1]:
+                    continue
+                incident = Incident(str(doc["_id"]), slot, centroid, doc["first_seen"].timestamp())
+                incident.last_seen = doc["last_seen"].timestamp()
+                incident.weight = float(doc.get("weight") or 0.0)
+                incident.count = int(doc.get("count") or 0)
+                incident.labels.update({e["label"]: e["count"] for e in doc.get("labels") or []})
+                incident.keywords.update({e["keyword"]: e["count"] for e in doc.get("keywords") or []})
+                incident.samples.extend(doc.get("samples") or [])
+                self._place(incident)
+        if self._active:
+            logger.info("[incidents] warmed with %s active incidents", len(self._active))
+
+
+# Global incident aggregator instance
+_aggregator: Optional[IncidentAggregator] = None
+
+
+def get_incidents() -> IncidentAggregator:
+    """Get or create the global incident aggregator."""
+    global _aggregator
+    if _aggregator is None:
+        _aggregator = IncidentAggregator()
+    return _aggregator
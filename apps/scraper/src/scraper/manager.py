@@ -1,19 +1,53 @@
 """Scraping manager for coordinating scraping operations."""
 
+import logging
 import time
 import random
-from threading import Thread, Event, Lock
-from typing import List, Dict, Optional, Any
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from threading import Thread, Event, Lock, current_thread
+from typing import List, Dict, Optional, Any, Union
 from selenium.common.exceptions import (
-    NoSuchWindowException,
     WebDriverException,
-    TimeoutException,
     NoSuchElementException
 )
 
-from .spiders.twitter_spider import XcancelScraper
-from .utils import get_db, is_relevant_bool, safe_close_driver
-from .config import BACKOFF_SECONDS, MAX_BACKOFF_SECONDS, STALL_TIMEOUT_SECONDS
+from .checkpoint import StateCheckpointer
+from .coordination import LeaseCoordinator
+from .incidents import get_incidents
+from .metrics import get_metrics
+from .spiders import create_scraper
+from .spiders.profiles import get_profile_pool
+from .stream import get_broadcaster
+from .scheduler import KeywordScheduler
+from .utils import (
+    get_db,
+    classify_texts,
+    classifier_stats,
+    safe_close_driver,
+    tweet_key,
+    text_hash,
+    SeenFilter,
+    rate_limiter_stats,
+    rate_limiter_state,
+    restore_rate_limiters,
+)
+from .utils.simhash import NearDuplicateIndex, simhash, hamming
+from .config import (
+    BACKOFF_SECONDS,
+    MAX_BACKOFF_SECONDS,
+    STALL_TIMEOUT_SECONDS,
+    STALL_ESCALATION_SECONDS,
+    DRIVER_RECOVERY_ATTEMPTS,
+    RESULTS_PER_KEYWORD,
+    SEEN_FILTER_CAPACITY,
+    NEAR_DUP_WINDOW_SECONDS,
+    NEAR_DUP_CAPACITY,
+    COORDINATION_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
 
 
 class ScraperManager:
@@ -25,39 +59,182 @@ class ScraperManager:
         self.scraping_thread: Optional[Thread] = None
         self.supervisor_thread: Optional[Thread] = None
         self.is_running = False
-        self.results: Dict[str, List] = {}
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self.results_lock = Lock()
+        self.results_version = 0
+        self.results_epoch = int(time.time())
         self.latest_keywords: List[str] = []
+        self.keywords_lock = Lock()
+        self.scheduler = KeywordScheduler([])
         self.last_progress_ts: float = 0.0
         self.restart_lock = Lock()
         self.backoff_seconds = BACKOFF_SECONDS
+        self.wrapper = None
+        self.failure_streak = 0
+        self.stall_tier = 0
+        self.recovery_requested = Event()
+        self.driver_startups: deque = deque(maxlen=50)
         self.db = get_db()
+        self.seen = SeenFilter()
+        self.near_dups = NearDuplicateIndex()
+        self.incidents = get_incidents()
+        self.broadcaster = get_broadcaster()
+        self.coordinator: Optional[LeaseCoordinator] = None
+        # Newest status id stored per keyword, so pagination stops at older tweets
+        self.last_seen: Dict[str, Dict[str, Any]] = {}
+        self.resume_pending = False
+        self.checkpointer = StateCheckpointer(self.db)
+        self._warm_seen()
+        self._warm_near_dups()
+        self._restore_state()
+    
+    def _warm_seen(self):
+        """Preload the seen-set with hashes of tweets already stored in Mongo."""
+        if not self.db.enabled:
+            return
+        loaded = self.seen.warm(self.db.iter_tweet_hashes(limit=SEEN_FILTER_CAPACITY))
+        logger.info("[seen] warmed with %s stored tweet hashes", loaded)
+    
+    def _warm_near_dups(self):
+        """Preload the near-duplicate index with tweets classified within its window."""
+        if not self.db.enabled or not self.near_dups.enabled:
+            return
+        since = datetime.now(timezone.utc) - timedelta(seconds=NEAR_DUP_WINDOW_SECONDS)
+        loaded = self.near_dups.warm(self.db.iter_fingerprints(since, limit=NEAR_DUP_CAPACITY))
+        logger.info("[near-dup] warmed with %s stored fingerprints", loaded)
+    
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Get the state a restarted process needs to resume warm.
+        
+        Maps are stored as lists of entries, since keywords and host names
+        are not safe Mongo field names.
+        
+        Returns:
+            JSON-compatible checkpoint state
+        """
+        with self.results_lock:
+            results = [{'keyword': kw, 'items': list(items)} for kw, items in self.results.items()]
+            last_seen = [dict(marker, keyword=kw) for kw, marker in self.last_seen.items()]
+        return {
+            'keywords': self.get_keywords(),
+            'running': self.is_running,
+            'results': results,
+            'last_seen': last_seen,
+            'schedule': [dict(st, keyword=kw) for kw, st in self.scheduler.export_state().items()],
+            'backoff_seconds': self.backoff_seconds,
+            'rate_limits': [dict(st, host=host) for host, st in rate_limiter_state().items()],
+        }
+    
+    def _restore_state(self):
+        """Load the last checkpoint so results are served before the first cycle."""
+        state = self.checkpointer.load()
+        if not state:
+            return
+        keywords = list(dict.fromkeys(state.get('keywords') or []))
+        with self.keywords_lock:
+            self.latest_keywords = keywords
+        with self.results_lock:
+            self.results = {
+                entry['keyword']: entry['items'][:RESULTS_PER_KEYWORD]
+                for entry in state.get('results') or []
+                if entry.get('keyword') in keywords
+            }
+            self.last_seen = {
+                entry['keyword']: {k: v for k, v in entry.items() if k != 'keyword'}
+                for entry in state.get('last_seen') or []
+                if entry.get('keyword') in keywords
+            }
+            self.results_version += 1
+        # Without Mongo the seen-set is cold; the restored tweets at least are known
+        for kw, items in self.results.items():
+            for item in items:
+                self.seen.add(tweet_key(kw, item.get('text') or '', item.get('tweet_id')))
+        
+        self.scheduler = KeywordScheduler(keywords)
+        self.scheduler.restore_state({
+            entry['keyword']: entry for entry in state.get('schedule') or [] if entry.get('keyword')
+        })
+        self.backoff_seconds = min(MAX_BACKOFF_SECONDS, float(state.get('backoff_seconds') or BACKOFF_SECONDS))
+        restore_rate_limiters({
+            entry['host']: entry for entry in state.get('rate_limits') or [] if entry.get('host')
+        })
+        self.resume_pending = bool(state.get('running') and keywords)
+        metrics.inc('state_restores_total')
+        logger.info(
+            "[state] restored %s keywords and %s results from checkpoint",
+            len(keywords), sum(len(items) for items in self.results.values())
+        )
+    
+    def resume_scraping(self) -> bool:
+        """
+        Start scraping again if the restored checkpoint was taken while running.
+        
+        Results, schedule and markers of the checkpoint are kept, so the
+        first cycle only visits keywords that are due and stops paginating at
+        tweets seen before the restart.
+        
+        Returns:
+            True if scraping was started
+        """
+        if not self.resume_pending:
+            return False
+        self.resume_pending = False
+        keywords = self.get_keywords()
+        return bool(keywords) and self.start_scraping(keywords, resume=True)
     
     def _touch_progress(self):
         """Update last progress timestamp."""
         self.last_progress_ts = time.time()
     
-    def start_scraping(self, keywords: List[str]) -> bool:
+    def start_scraping(self, keywords: List[str], resume: bool = False) -> bool:
         """
         Start scraping with given keywords.
         
         Args:
             keywords: List of keywords to scrape
+            resume: Keep current results, schedule and backoff instead of
+                starting fresh
             
         Returns:
             True if started successfully
+            
+        Raises:
+            RuntimeError: If coordination is enabled but the database is not
         """
         if self.is_running:
             return False
         
-        self.latest_keywords = keywords[:]
-        self.stop_event.clear()
-        self.results.clear()
+        with self.keywords_lock:
+            self.latest_keywords = list(dict.fromkeys(keywords))
+        schedule = self.scheduler.export_state() if resume else {}
+        if COORDINATION_ENABLED:
+            # Keywords are scheduled only once this node holds their lease
+            if self.coordinator is None:
+                self.coordinator = LeaseCoordinator(self.db)
+            self.coordinator.start(self.get_keywords())
+            self.scheduler = KeywordScheduler([])
+            self._sync_owned_keywords()
+        else:
+            self.scheduler = KeywordScheduler(self.get_keywords())
+        self.scheduler.restore_state(schedule)
+        # A fresh event per run, so a replaced thread that is still finishing
+        # is not revived by the next start
+        self.stop_event = Event()
+        if not resume:
+            with self.results_lock:
+                self.results.clear()
+                self.last_seen.clear()
+                self.results_version += 1
+            self.backoff_seconds = BACKOFF_SECONDS
         self.is_running = True
-        self.backoff_seconds = BACKOFF_SECONDS
+        self.failure_streak = 0
+        self.stall_tier = 0
+        self.recovery_requested.clear()
         
         self.scraping_thread = Thread(
             target=self._scraping_loop,
-            args=(self.latest_keywords,),
+            args=(self.get_keywords(),),
             daemon=True
         )
         self.scraping_thread.start()
@@ -79,28 +256,92 @@ class ScraperManager:
         
         if self.scraping_thread and self.scraping_thread.is_alive():
             self.scraping_thread.join(timeout=5)
+        if self.coordinator is not None:
+            self.coordinator.stop()
         
         return True
     
-    def restart_scraper(self, keywords: Optional[List[str]] = None) -> tuple[bool, str]:
+    def restart_scraper(
+        self,
+        keywords: Optional[List[str]] = None,
+        hard: bool = False
+    ) -> tuple[bool, str]:
         """
-        Restart scraper with optional new keywords.
+        Apply new keywords, restarting the scraping thread only when needed.
+        
+        A running scraper takes the new keywords on its next cycle and keeps
+        its browser. The thread is only stopped and started again when it is
+        not running or when ``hard`` is set.
         
         Args:
             keywords: Optional new keywords, uses latest if not provided
+            hard: Stop and start the scraping thread even if it is healthy
             
         Returns:
             Tuple of (success, message)
         """
         with self.restart_lock:
-            kw = keywords if keywords else self.latest_keywords
+            kw = keywords if keywords else self.get_keywords()
             if not kw:
                 return False, "No keywords to restart"
             
+            alive = bool(self.scraping_thread and self.scraping_thread.is_alive())
+            if self.is_running and alive and not hard:
+                self.set_keywords(kw)
+                return True, "Keywords updated"
+            
             self.stop_scraping()
             self.start_scraping(kw)
             return True, "Restarted"
     
+    def get_keywords(self) -> List[str]:
+        """Get the configured keywords."""
+        with self.keywords_lock:
+            return list(self.latest_keywords)
+    
+    def set_keywords(self, keywords: List[str]) -> List[str]:
+        """
+        Replace the keywords, live if the scraper is running.
+        
+        The scraping loop reads the schedule every cycle, so added keywords
+        are visited on the next cycle and removed ones are no longer visited.
+        Results of removed keywords are dropped.
+        
+        Args:
+            keywords: New keyword list
+            
+        Returns:
+            The keywords now configured
+        """
+        with self.keywords_lock:
+            self.latest_keywords = list(dict.fromkeys(keywords))
+            current = list(self.latest_keywords)
+        
+        if self.coordinator is not None and self.is_running:
+            self.coordinator.set_keywords(current)
+            self._sync_owned_keywords()
+        else:
+            self.scheduler.set_keywords(current)
+        
+        with self.results_lock:
+            for kw in [kw for kw in self.results if kw not in current]:
+                del self.results[kw]
+            for kw in [kw for kw in self.last_seen if kw not in current]:
+                del self.last_seen[kw]
+            self.results_version += 1
+        return current
+    
+    def add_keywords(self, keywords: List[str]) -> List[str]:
+        """Add keywords to the running set; returns the keywords now configured."""
+        with self.restart_lock:
+            return self.set_keywords(self.get_keywords() + list(keywords))
+    
+    def remove_keywords(self, keywords: List[str]) -> List[str]:
+        """Remove keywords from the running set; returns the keywords now configured."""
+        removed = set(keywords)
+        with self.restart_lock:
+            return self.set_keywords([kw for kw in self.get_keywords() if kw not in removed])
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Get current scraper status.
@@ -115,12 +356,263 @@ class ScraperManager:
                 None if not self.last_progress_ts 
                 else round(time.time() - self.last_progress_ts, 1)
             ),
-            'keywords': self.latest_keywords
+            'keywords': self.get_keywords(),
+            'schedule': self.scheduler.snapshot(),
+            'seen_filter': self.seen.stats(),
+            'near_duplicates': self.near_dups.stats(),
+            'incidents': self.incidents.stats(),
+            'stream': self.broadcaster.stats(),
+            'rate_limits': rate_limiter_stats(),
+            'classifier': classifier_stats(),
+            'driver': self._driver_stats(),
+            'stall_tier': self.stall_tier,
+            'coordination': self.coordinator.stats() if self.coordinator else None,
+            'checkpoint': self.checkpointer.stats(),
         }
     
-    def get_results(self) -> Dict[str, List]:
-        """Get current scraping results."""
-        return self.results.copy()
+    def _driver_stats(self) -> Dict[str, Any]:
+        """Summarize driver start-to-ready times."""
+        startups = list(self.driver_startups)
+        return {
+            'starts': len(startups),
+            'last_startup_sec': round(startups[-1], 2) if startups else None,
+            'avg_startup_sec': round(sum(startups) / len(startups), 2) if startups else None,
+            'max_startup_sec': round(max(startups), 2) if startups else None,
+            'profiles': get_profile_pool().stats(),
+        }
+    
+    def _sync_owned_keywords(self):
+        """Schedule exactly the keywords this node holds leases on."""
+        if self.coordinator is None:
+            return
+        owned = self.coordinator.owned()
+        if owned != set(self.scheduler.keywords()):
+            self.scheduler.set_keywords([kw for kw in self.get_keywords() if kw in owned])
+    
+    def _owns(self, keyword: str) -> bool:
+        """Whether this node may scrape a keyword right now."""
+        return self.coordinator is None or self.coordinator.owns(keyword)
+    
+    def get_results(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Get current scraping results with their stored relevance."""
+        return self.get_results_snapshot()[1]
+    
+    def get_results_snapshot(self) -> tuple[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get current results together with a version tag.
+        
+        The tag changes whenever results change, so it can be used as an ETag.
+        
+        Returns:
+            Tuple of (version tag, results by keyword)
+        """
+        with self.results_lock:
+            tag = f"{self.results_epoch}-{self.results_version}"
+            return tag, {kw: list(items) for kw, items in self.results.items()}
+    
+    def get_results_version(self) -> str:
+        """Get the current results version tag without copying results."""
+        with self.results_lock:
+            return f"{self.results_epoch}-{self.results_version}"
+    
+    def _is_known(self, keyword: str, tweet: Any) -> bool:
+        """
+        Check whether a tweet was already collected for a keyword.
+        
+        Used by the scrapers to stop paginating once they reach old tweets.
+        The seen-set answers most lookups; Mongo is only asked about misses,
+        since the set only remembers the most recent hashes.
+        
+        Args:
+            keyword: Search keyword
+            tweet: Parsed tweet record, or a bare tweet text
+        """
+        if isinstance(tweet, dict):
+            text, tweet_id = tweet.get('text') or '', tweet.get('tweet_id')
+        else:
+            text, tweet_id = str(tweet), None
+        if tweet_key(keyword, text, tweet_id) in self.seen:
+            return True
+        # Status ids grow with time, so ids up to the newest stored one are old
+        marker = self.last_seen.get(keyword)
+        if marker and tweet_id and str(tweet_id).isdigit() and int(tweet_id) <= int(marker['tweet_id']):
+            return True
+        if self.db.enabled:
+            return self.db.has_tweet(keyword, text, tweet_id)
+        return False
+    
+    def _process_tweets(self, keyword: str, tweets: List) -> int:
+        """
+        Classify new tweets in one batch, persist them and update results.
+        
+        Args:
+            keyword: Search keyword the tweets were found for
+            tweets: Parsed tweet records (see ``parse_page``) or bare texts, newest first
+            
+        Returns:
+            Number of tweets that were new
+        """
+        pending: Dict[str, Dict[str, Any]] = {}
+        for item in tweets:
+            record = dict(item) if isinstance(item, dict) else {'text': str(item or '')}
+            record['text'] = (record.get('text') or '').strip()
+            if not record['text']:
+                continue
+            
+            key = tweet_key(keyword, record['text'], record.get('tweet_id'))
+            if key in pending or key in self.seen:
+                continue
+            pending[key] = record
+        
+        if not pending:
+            with self.results_lock:
+                self.results.setdefault(keyword, [])
+            return 0
+        
+        records = list(pending.values())
+        # Text-keyed storage: tweets stored for other keywords keep their classification
+        existing = self.db.find_existing(records) if self.db.enabled else [None] * len(records)
+        reuse = [bool(doc and doc.get('classifier_version')) for doc in existing]
+        near = self._match_near_duplicates(records, reuse)
+        results = iter(classify_texts(
+            [r['text'] for r, hit, match in zip(records, reuse, near) if not hit and match is None],
+            embeddings=self.incidents.enabled,
+        ))
+        classified: List[Dict[str, Any]] = []
+        for record, doc, hit, match in zip(records, existing, reuse, near):
+            if hit:
+                classified.append(dict(record, reused=True, **self._stored_classification(doc)))
+            elif match is None:
+                classified.append(dict(record, **next(results)))
+            elif isinstance(match, int):
+                # Near-duplicate of an earlier tweet in this batch, filled in below
+                classified.append(record)
+            else:
+                classified.append(dict(record, **match))
+        # Canonical tweets first, so their near-duplicates inherit the incident
+        self.incidents.assign(keyword, classified)
+        batch_dups = []
+        for i, match in enumerate(near):
+            if isinstance(match, int):
+                classified[i] = dict(records[i], **self._near_dup_payload(classified[match]))
+                batch_dups.append(classified[i])
+            elif match is None and not reuse[i] and classified[i].get('classifier_version'):
+                self.near_dups.add(classified[i]['simhash'], self._near_dup_payload(classified[i]))
+        self.incidents.assign(keyword, batch_dups)
+        if any(reuse):
+            metrics.inc('classifications_reused_total', sum(reuse), keyword=keyword)
+        near_count = sum(match is not None for match in near)
+        if near_count:
+            metrics.inc('near_duplicates_total', near_count, keyword=keyword)
+        stored = self.db.upsert_tweets(keyword, classified, existing) if self.db.enabled else True
+        self.incidents.flush()
+        if stored:
+            for key in pending:
+                self.seen.add(key)
+        
+        fresh = []
+        for item in classified:
+            tweeted_at = item.get('tweeted_at')
+            fresh.append({
+                'text': item['text'],
+                'relevant': item['relevant'],
+                'label': item.get('label'),
+                'pending': not item.get('classifier_version'),
+                'near_duplicate_of': item.get('near_duplicate_of'),
+                'incident_id': item.get('incident_id'),
+                'tweet_id': item.get('tweet_id'),
+                'author': item.get('author'),
+                'tweeted_at': tweeted_at.isoformat() if tweeted_at else None,
+                'link': item.get('link'),
+            })
+        if stored:
+            now = time.time()
+            self.broadcaster.publish([
+                dict(item, keyword=keyword, scraped_at=now) for item in fresh
+            ])
+        with self.results_lock:
+            previous = self.results.get(keyword, [])
+            self.results[keyword] = (fresh + previous)[:RESULTS_PER_KEYWORD]
+            if stored:
+                self._advance_last_seen(keyword, records)
+            self.results_version += 1
+        return len(pending)
+    
+    def _advance_last_seen(self, keyword: str, records: List[Dict[str, Any]]):
+        """Move a keyword's marker to the newest stored status id; the caller holds the results lock."""
+        ids = [int(r['tweet_id']) for r in records if str(r.get('tweet_id') or '').isdigit()]
+        if not ids:
+            return
+        marker = self.last_seen.get(keyword)
+        newest = max(ids)
+        if marker is None or newest > int(marker['tweet_id']):
+            self.last_seen[keyword] = {'tweet_id': str(newest), 'at': time.time()}
+    
+    def _match_near_duplicates(
+        self,
+        records: List[Dict[str, Any]],
+        reuse: List[bool],
+    ) -> List[Union[None, int, Dict[str, Any]]]:
+        """
+        Fingerprint new tweets and find the canonical tweet each one nearly duplicates.
+        
+        Sets ``simhash`` on every record. Tweets matching a recently
+        classified tweet get its payload (classification and
+        ``near_duplicate_of``); tweets matching an earlier, unmatched tweet of
+        the same batch get that tweet's position, so only the first of a
+        group is classified.
+        
+        Args:
+            records: Tweet records of one batch
+            reuse: Whether each record already has a stored classification
+            
+        Returns:
+            Per record None (classify it), a batch position or an index payload
+        """
+        if not self.near_dups.enabled:
+            return [None] * len(records)
+        
+        near: List[Union[None, int, Dict[str, Any]]] = []
+        leaders: List[int] = []
+        for i, (record, hit) in enumerate(zip(records, reuse)):
+            fingerprint = record['simhash'] = simhash(record['text'])
+            match: Union[None, int, Dict[str, Any]] = None
+            if not hit and fingerprint:
+                found = self.near_dups.find(fingerprint)
+                if found:
+                    match = found[0]
+                else:
+                    match = next((
+                        j for j in leaders
+                        if hamming(fingerprint, records[j]['simhash']) <= self.near_dups.max_distance
+                    ), None)
+            if match is None and not hit and fingerprint:
+                leaders.append(i)
+            near.append(match)
+        return near
+    
+    @staticmethod
+    def _near_dup_payload(canonical: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields a near-duplicate takes over from its canonical tweet."""
+        return {
+            'near_duplicate_of': canonical.get('tweet_id') or text_hash(canonical['text']),
+            'relevant': canonical.get('relevant', False),
+            'label': canonical.get('label'),
+            'scores': canonical.get('scores') or {},
+            'classifier_version': canonical.get('classifier_version'),
+            'incident_id': canonical.get('incident_id'),
+        }
+    
+    @staticmethod
+    def _stored_classification(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Classification fields of a stored document, shaped like ``classify_texts`` output."""
+        return {
+            'relevant': bool(doc.get('relevant', False)),
+            'label': doc.get('label'),
+            'scores': doc.get('scores') or {},
+            'classifier_version': doc.get('classifier_version'),
+            'incident_id': doc.get('incident_id'),
+        }
     
     def _ensure_supervisor(self):
         """Ensure supervisor thread is running."""
@@ -130,106 +622,199 @@ class ScraperManager:
         self.supervisor_thread.start()
     
     def _supervisor_loop(self):
-        """Monitor scraping and restart if stalled."""
+        """
+        Monitor scraping and recover from stalls in escalating steps.
+        
+        After ``STALL_TIMEOUT_SECONDS`` without progress the loop is asked to
+        continue in a fresh tab. Every ``STALL_ESCALATION_SECONDS`` of further
+        stall escalates: the driver's processes are killed so a blocked call
+        fails and the loop starts a new driver, and finally the scraping
+        thread itself is restarted. A dead thread is restarted right away.
+        """
         while True:
             time.sleep(10)
             if not self.is_running:
                 continue
             
-            stalled = (
-                (time.time() - self.last_progress_ts) > STALL_TIMEOUT_SECONDS 
-                if self.last_progress_ts else False
-            )
-            dead = not (self.scraping_thread and self.scraping_thread.is_alive())
+            if not (self.scraping_thread and self.scraping_thread.is_alive()):
+                self._supervisor_action('restart_thread', 'dead_thread')
+                continue
+            
+            stalled_for = time.time() - self.last_progress_ts if self.last_progress_ts else 0.0
+            if stalled_for <= STALL_TIMEOUT_SECONDS:
+                self.stall_tier = 0
+                continue
             
-            if stalled or dead:
-                print(f"[supervisor] Detected {'stall' if stalled else 'dead thread'} -> restarting")
-                ok, msg = self.restart_scraper()
-                print(f"[supervisor] {msg}")
+            tier = min(3, 1 + int((stalled_for - STALL_TIMEOUT_SECONDS) // STALL_ESCALATION_SECONDS))
+            if tier <= self.stall_tier:
+                continue
+            self.stall_tier = tier
+            action = {1: 'new_tab', 2: 'kill_driver', 3: 'restart_thread'}[tier]
+            self._supervisor_action(action, 'stall')
+    
+    def _supervisor_action(self, action: str, reason: str):
+        """Run one recovery step of the supervisor."""
+        metrics.inc('supervisor_actions_total', action=action, reason=reason)
+        logger.warning("[supervisor] Detected %s -> %s", reason.replace('_', ' '), action)
+        if action == 'new_tab':
+            self.recovery_requested.set()
+        elif action == 'kill_driver':
+            wrapper = self.wrapper
+            if wrapper is not None and hasattr(wrapper, "abort"):
+                wrapper.abort()
+        else:
+            ok, msg = self.restart_scraper(hard=True)
+            self.stall_tier = 0
+            logger.info("[supervisor] %s", msg)
+    
+    def _recover_driver(self, wrapper, error: Exception):
+        """
+        Handle a failed visit with the cheapest recovery that may work.
+        
+        Consecutive failures first reload the page, then open a fresh tab;
+        the driver is only restarted after ``DRIVER_RECOVERY_ATTEMPTS``
+        failures in a row or when recovery itself fails.
+        
+        Returns:
+            The wrapper to keep using, or None if it was closed
+        """
+        self.failure_streak += 1
+        level = self.failure_streak
+        if level <= DRIVER_RECOVERY_ATTEMPTS and hasattr(wrapper, "recover"):
+            try:
+                wrapper.recover(level)
+                metrics.inc('driver_recoveries_total', action='reload' if level == 1 else 'new_tab')
+                logger.info("[scraper] recovered driver (level %s) after %s", level, type(error).__name__)
+                return wrapper
+            except Exception as e:
+                logger.warning("[scraper] recovery failed: %s", e)
+        
+        metrics.inc('driver_restarts_total', reason=type(error).__name__)
+        self.failure_streak = 0
+        self.wrapper = None
+        safe_close_driver(wrapper)
+        return None
     
     def _scraping_loop(self, keywords: List[str]):
         """
         Main scraping loop.
         
+        Keywords are visited when the scheduler reports them due rather
+        than in a fixed round-robin. The schedule is read every cycle, so
+        keyword changes apply without restarting the loop.
+        
         Args:
             keywords: Keywords to scrape
         """
+        stop_event = self.stop_event
         wrapper = None
         try:
-            while not self.stop_event.is_set():
+            while not stop_event.is_set():
                 if wrapper is None:
                     try:
-                        wrapper = XcancelScraper()
+                        wrapper = create_scraper()
+                        self.wrapper = wrapper
                         self.backoff_seconds = BACKOFF_SECONDS
+                        startup = getattr(wrapper, "startup_seconds", None)
+                        if startup is not None:
+                            self.driver_startups.append(startup)
+                            metrics.observe('driver_startup_seconds', startup)
                     except Exception as e:
-                        print(f"[scraper] init error: {e}; retrying in {self.backoff_seconds}s")
+                        metrics.inc('driver_init_errors_total', error=type(e).__name__)
+                        logger.warning("[scraper] init error: %s; retrying in %ss", e, self.backoff_seconds)
                         time.sleep(self.backoff_seconds + random.uniform(0, 0.5))
                         self.backoff_seconds = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2)
                         continue
                 
-                for keyword in keywords:
-                    if self.stop_event.is_set():
+                if self.recovery_requested.is_set():
+                    self.recovery_requested.clear()
+                    try:
+                        if hasattr(wrapper, "recover"):
+                            wrapper.recover(2)
+                            metrics.inc('driver_recoveries_total', action='new_tab')
+                    except Exception as e:
+                        wrapper = self._recover_driver(wrapper, e)
+                        continue
+                
+                self._sync_owned_keywords()
+                due = self.scheduler.due()
+                if not due:
+                    # Idle until the next keyword is due; waiting is progress
+                    self._touch_progress()
+                    stop_event.wait(min(5.0, self.scheduler.seconds_until_next()))
+                    continue
+                
+                # Engines that support it fetch the remaining keywords concurrently
+                prefetched: Dict[str, List] = {}
+                for idx, keyword in enumerate(due):
+                    if stop_event.is_set():
                         break
                     if wrapper is None:
                         break
+                    # Leases can lapse or move to a peer during a long cycle
+                    if not self._owns(keyword):
+                        prefetched.pop(keyword, None)
+                        logger.debug("[coord] lease on '%s' lost, skipping visit", keyword)
+                        continue
                     
                     try:
-                        print(f"Searching for keyword: {keyword}")
+                        logger.debug("Searching for keyword: %s", keyword)
                         self._touch_progress()
-                        tweets = wrapper.search_and_extract(keyword)
-                        
-                        self.results[keyword] = tweets[:5] if isinstance(tweets, list) else []
+                        if keyword not in prefetched and hasattr(wrapper, "search_many"):
+                            owned = [kw for kw in due[idx:] if self._owns(kw)]
+                            prefetched = wrapper.search_many(owned, is_known=self._is_known)
+                        if keyword in prefetched:
+                            tweets = prefetched.pop(keyword)
+                        else:
+                            tweets = wrapper.search_and_extract(keyword, is_known=self._is_known)
+                        if not self._owns(keyword):
+                            logger.info("[coord] lease on '%s' lost during the visit, dropping its results", keyword)
+                            continue
                         
-                        if isinstance(tweets, list) and self.db.enabled:
-                            for item in tweets:
-                                text = ""
-                                if isinstance(item, dict):
-                                    text = (item.get("text") or "").strip()
-                                else:
-                                    text = (str(item) or "").strip()
-                                
-                                if not text:
-                                    continue
-                                
-                                relevant = is_relevant_bool(text)
-                                self.db.upsert_tweet(keyword, text, relevant)
+                        # Scrapers return only new tweets, newest first
+                        new_count = 0
+                        if isinstance(tweets, list):
+                            metrics.inc('tweets_found_total', len(tweets), keyword=keyword)
+                            with metrics.timer('process_seconds', keyword=keyword):
+                                new_count = self._process_tweets(keyword, tweets)
+                            metrics.inc('tweets_new_total', new_count, keyword=keyword)
+                        self.scheduler.record(keyword, new_count)
+                        self.failure_streak = 0
                         
+                        # Request pacing is left to the shared host rate limiter
                         self._touch_progress()
-                        time.sleep(0.5)
                         
                     except NoSuchElementException as e:
-                        print(f"[scraper] no results for '{keyword}': {e}")
+                        logger.info("[scraper] no results for '%s': %s", keyword, e)
+                        self.scheduler.record(keyword, 0)
                         self._touch_progress()
                         time.sleep(0.3)
                         continue
                         
-                    except (NoSuchWindowException, TimeoutException) as e:
-                        print(f"[scraper] window/timeout for '{keyword}': {e}")
-                        safe_close_driver(wrapper)
-                        wrapper = None
-                        time.sleep(1 + random.uniform(0, 0.5))
-                        break
-                        
                     except WebDriverException as e:
-                        print(f"[scraper] WebDriverException: {e}")
-                        safe_close_driver(wrapper)
-                        wrapper = None
-                        time.sleep(self.backoff_seconds + random.uniform(0, 0.5))
-                        self.backoff_seconds = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2)
+                        # Includes timeouts and closed windows
+                        logger.warning("[scraper] %s for '%s': %s", type(e).__name__, keyword, e)
+                        self.scheduler.record_failure(keyword)
+                        wrapper = self._recover_driver(wrapper, e)
+                        if wrapper is None:
+                            time.sleep(self.backoff_seconds + random.uniform(0, 0.5))
+                            self.backoff_seconds = min(MAX_BACKOFF_SECONDS, self.backoff_seconds * 2)
                         break
                         
                     except Exception as e:
-                        print(f"[scraper] loop error for '{keyword}': {e}")
-                        safe_close_driver(wrapper)
-                        wrapper = None
-                        time.sleep(1 + random.uniform(0, 0.5))
+                        logger.warning("[scraper] loop error for '%s': %s", keyword, e)
+                        self.scheduler.record_failure(keyword)
+                        wrapper = self._recover_driver(wrapper, e)
+                        if wrapper is None:
+                            time.sleep(1 + random.uniform(0, 0.5))
                         break
-                
-                time.sleep(1)
         finally:
             safe_close_driver(wrapper)
-            self.is_running = False
-            print("Scraping stopped and driver closed.")
+            # A replaced thread that ends late must not stop its successor
+            if self.scraping_thread is current_thread():
+                self.wrapper = None
+                self.is_running = False
+            logger.info("Scraping stopped and driver closed.")
 
 
 # Global scraper instance
@@ -0,0 +1,172 @@
+"""In-process metrics for the scraping pipeline."""
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from .config import METRICS_WINDOW_SIZE
+
+# Label set of a series, e.g. (("keyword", "flood"),)
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Summary:
+    """Count, sum and percentiles over the most recent observations."""
+
+    def __init__(self, window: int):
+        """
+        Initialize the summary.
+
+        Args:
+            window: Number of recent observations kept for percentiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get totals and percentiles of the recent window."""
+        recent = sorted(self._recent)
+        return {
+            'count': self.count,
+            'sum': round(self.total, 4),
+            'avg': round(self.total / self.count, 4) if self.count else None,
+            'max': round(self.max, 4),
+            'p50': _percentile(recent, 0.50),
+            'p95': _percentile(recent, 0.95),
+            'p99': _percentile(recent, 0.99),
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and summaries keyed by name and labels.
+
+    Recording is a dictionary lookup and an append under a lock, cheap
+    enough for the hot path. Summaries keep a bounded window of recent
+    observations so percentiles follow current behaviour.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW_SIZE):
+        """
+        Initialize the registry.
+
+        Args:
+            window: Observations kept per summary series
+        """
+        self.window = window
+        self.started_at = time.time()
+        self._lock = Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._summaries: Dict[str, Dict[Labels, Summary]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+            **labels: Label values identifying the series
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        """
+        Record an observation in a summary.
+
+        Args:
+            name: Summary name
+            value: Observed value (seconds for latencies)
+            **labels: Label values identifying the series
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                summary = series[key] = Summary(self.window)
+            summary.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """Get the current value of one counter series."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get every series for the metrics endpoint.
+
+        Returns:
+            Dictionary with ``counters`` and ``summaries``, each mapping a
+            metric name to a list of ``{"labels": ..., ...}`` entries
+        """
+        with self._lock:
+            counters = {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            summaries = {
+                name: [{'labels': dict(key), **summary.snapshot()} for key, summary in series.items()]
+                for name, series in self._summaries.items()
+            }
+        return {
+            'uptime_sec': round(time.time() - self.started_at, 1),
+            'counters': counters,
+            'summaries': summaries,
+        }
+
+    def reset(self):
+        """Drop every series."""
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _percentile(values: list, q: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    idx = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+    return round(values[idx], 4)
+
+
+# Global metrics registry
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get or create the global metrics registry."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+        return _metrics
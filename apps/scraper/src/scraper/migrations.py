@@ -0,0 +1,259 @@
+"""One-off data migrations for the tweets collection.
+
+Run from the scraper directory:
+
+    python -m scraper.migrations dates
+    python -m scraper.migrations rollups
+    python -m scraper.migrations text-keys
+"""
+
+import argparse
+import logging
+from typing import Dict, Any, List
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import OperationFailure
+
+from .utils import get_db, DatabaseManager, text_hash
+from .utils.database import TEXT_KEYED
+from .utils.rollups import GRANULARITIES
+from .config import ROLLUP_MINUTE_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Indexes superseded by the keyset-friendly ones created in DatabaseManager._connect
+LEGACY_INDEXES = ["keyword_1_inserted_at_-1"]
+# Indexes of keyword storage, replaced by multikey ones over `keywords`
+KEYWORD_INDEXES = [
+    "keyword_1_text_sha1_1",
+    "keyword_tweet_id",
+    "keyword_1_inserted_at_-1__id_-1",
+    "keyword_1_relevant_1_inserted_at_-1__id_-1",
+]
+MERGE_BATCH_SIZE = 1000
+
+
+def migrate_dates(db: DatabaseManager) -> Dict[str, Any]:
+    """
+    Convert ISO string timestamps to native BSON dates and drop legacy indexes.
+
+    The conversion runs server-side with an update pipeline, so documents are
+    never pulled into the process.
+
+    Args:
+        db: Connected database manager
+
+    Returns:
+        Counts of converted documents per field and dropped indexes
+    """
+    if not db.enabled:
+        raise RuntimeError("Database is not connected")
+
+    report: Dict[str, Any] = {}
+    for field in ("inserted_at", "classified_at"):
+        result = db.tweets_col.update_many(
+            {field: {"$type": "string"}},
+            [{"$set": {field: {"$toDate": f"${field}"}}}],
+        )
+        report[field] = result.modified_count
+
+    report["dropped_indexes"] = _drop_indexes(db, LEGACY_INDEXES)
+    return report
+
+
+def merge_text_keys(db: DatabaseManager) -> Dict[str, Any]:
+    """
+    Convert keyword storage to text-keyed storage with one document per tweet.
+
+    Documents are grouped by status id, else by the hash of their normalized
+    text. The oldest document of a group is kept with the union of the
+    group's keywords and its classification; the others are deleted. Only
+    the group keys are held in memory (roughly 150 bytes per distinct tweet).
+    Run it with scraping stopped, then restart with
+    ``SCRAPER_TWEET_STORAGE=text``.
+
+    Args:
+        db: Connected database manager
+
+    Returns:
+        Document, storage and index sizes before and after, and the
+        classifier calls the merged copies had cost
+    """
+    if not db.enabled:
+        raise RuntimeError("Database is not connected")
+
+    before = _storage_stats(db)
+    survivors: Dict[str, Any] = {}
+    ops: List[Any] = []
+    kept = merged = memberships = 0
+    cursor = (
+        db.tweets_col.find({}, projection={"_id": 1, "keyword": 1, "keywords": 1, "text": 1, "tweet_id": 1})
+        .sort([("_id", 1)])
+        .batch_size(MERGE_BATCH_SIZE)
+    )
+    for doc in cursor:
+        keywords = doc.get("keywords") or ([doc["keyword"]] if doc.get("keyword") else [])
+        text_sha1 = text_hash(doc.get("text") or "")
+        keys = [f"text:{text_sha1}"]
+        if doc.get("tweet_id"):
+            keys.insert(0, f"id:{doc['tweet_id']}")
+        survivor = next((survivors[k] for k in keys if k in survivors), None)
+        memberships += len(keywords)
+
+        if survivor is None:
+            survivor = doc["_id"]
+            ops.append(UpdateOne({"_id": survivor}, {
+                "$set": {"text_sha1": text_sha1},
+                "$addToSet": {"keywords": {"$each": keywords}},
+                "$unset": {"keyword": ""},
+            }))
+            kept += 1
+        else:
+            ops.append(UpdateOne({"_id": survivor}, {"$addToSet": {"keywords": {"$each": keywords}}}))
+            ops.append(DeleteOne({"_id": doc["_id"]}))
+            merged += 1
+        for key in keys:
+            survivors.setdefault(key, survivor)
+
+        if len(ops) >= MERGE_BATCH_SIZE:
+            db.tweets_col.bulk_write(ops, ordered=True)
+            ops = []
+    if ops:
+        db.tweets_col.bulk_write(ops, ordered=True)
+
+    db.create_indexes(text_keyed=True)
+    dropped = _drop_indexes(db, KEYWORD_INDEXES)
+    after = _storage_stats(db)
+    return {
+        "documents_before": before["count"],
+        "documents_after": after["count"],
+        "merged": merged,
+        "kept": kept,
+        "keyword_memberships": memberships,
+        # Every merged copy had been sent to the classifier on its own
+        "classifier_calls_avoided": merged,
+        "data_bytes_before": before["size"],
+        "data_bytes_after": after["size"],
+        "index_bytes_before": before["totalIndexSize"],
+        "index_bytes_after": after["totalIndexSize"],
+        "saved_bytes": before["size"] + before["totalIndexSize"] - after["size"] - after["totalIndexSize"],
+        "dropped_indexes": dropped,
+    }
+
+
+def _storage_stats(db: DatabaseManager) -> Dict[str, int]:
+    """Document count, data size and index size of the tweets collection."""
+    stats = next(db.tweets_col.aggregate([{"$collStats": {"storageStats": {}}}]), {})
+    storage = stats.get("storageStats", {})
+    return {field: int(storage.get(field, 0)) for field in ("count", "size", "totalIndexSize")}
+
+
+def _drop_indexes(db: DatabaseManager, names: List[str]) -> List[str]:
+    """Drop the named indexes that exist; returns the dropped names."""
+    dropped = []
+    existing = db.tweets_col.index_information()
+    for name in names:
+        if name in existing:
+            try:
+                db.tweets_col.drop_index(name)
+                dropped.append(name)
+            except OperationFailure as e:
+                logger.warning("[migrate] could not drop index %s: %s", name, e)
+    return dropped
+
+
+def rebuild_rollups(db: DatabaseManager) -> Dict[str, Any]:
+    """
+    Recompute the time-bucketed counts from the tweets collection.
+
+    Needed once for tweets stored before rollups existed, or to repair counts.
+    Buckets are recomputed server-side with ``$dateTrunc`` (MongoDB 5.0+) and
+    replace the stored ones through ``$merge``; tweets ingested while this
+    runs may be counted in the old buckets only, so run it while scraping is
+    stopped.
+
+    Args:
+        db: Connected database manager
+
+    Returns:
+        Number of buckets per granularity after the rebuild
+    """
+    if not db.enabled:
+        raise RuntimeError("Database is not connected")
+
+    report: Dict[str, Any] = {}
+    for granularity in GRANULARITIES:
+        db.tweets_col.aggregate(_rollup_pipeline(granularity, db.rollups_col.name), allowDiskUse=True)
+        report[granularity] = db.rollups_col.count_documents({"granularity": granularity})
+    return report
+
+
+def _rollup_pipeline(granularity: str, into: str) -> list:
+    """Aggregation grouping tweets by keyword, bucket and label, merged into the rollups."""
+    bucket = {"$dateTrunc": {"date": {"$ifNull": ["$tweeted_at", "$inserted_at"]}, "unit": granularity}}
+    fields: Dict[str, Any] = {"granularity": granularity}
+    if granularity == "minute" and ROLLUP_MINUTE_RETENTION_DAYS > 0:
+        fields["expires_at"] = {
+            "$dateAdd": {
+                "startDate": "$bucket",
+                "unit": "second",
+                "amount": int(ROLLUP_MINUTE_RETENTION_DAYS * 86400),
+            }
+        }
+    stages: list = [{"$match": {"inserted_at": {"$type": "date"}}}]
+    if TEXT_KEYED:
+        # Count a text-keyed tweet once for every keyword it matched
+        stages += [{"$unwind": "$keywords"}, {"$set": {"keyword": "$keywords"}}]
+    return stages + [
+        {"$group": {
+            "_id": {"keyword": "$keyword", "bucket": bucket, "label": "$label"},
+            "total": {"$sum": 1},
+            "relevant": {"$sum": {"$cond": ["$relevant", 1, 0]}},
+        }},
+        {"$group": {
+            "_id": {"keyword": "$_id.keyword", "bucket": "$_id.bucket"},
+            "total": {"$sum": "$total"},
+            "relevant": {"$sum": "$relevant"},
+            "labels": {"$push": {"k": "$_id.label", "v": "$relevant"}},
+        }},
+        {"$project": {
+            "_id": 0,
+            "keyword": "$_id.keyword",
+            "bucket": "$_id.bucket",
+            "total": 1,
+            "relevant": 1,
+            "labels": {"$arrayToObject": {"$filter": {
+                "input": "$labels",
+                "cond": {"$and": [{"$gt": ["$$this.v", 0]}, {"$eq": [{"$type": "$$this.k"}, "string"]}]},
+            }}},
+        }},
+        {"$set": fields},
+        {"$merge": {
+            "into": into,
+            "on": ["granularity", "keyword", "bucket"],
+            "whenMatched": "replace",
+            "whenNotMatched": "insert",
+        }},
+    ]
+
+
+MIGRATIONS = {
+    "dates": migrate_dates,
+    "rollups": rebuild_rollups,
+    "text-keys": merge_text_keys,
+}
+
+
+def main():
+    """Run a migration by name from the command line."""
+    parser = argparse.ArgumentParser(description="Scraper data migrations")
+    parser.add_argument("name", choices=sorted(MIGRATIONS), help="Migration to run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    report = MIGRATIONS[args.name](get_db())
+    logger.info("[migrate] %s: %s", args.name, report)
+
+
+if __name__ == "__main__":
+    main()
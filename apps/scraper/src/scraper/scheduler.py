@@ -0,0 +1,225 @@
+"""Yield-adaptive scheduling of keyword visits."""
+
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from .config import (
+    SCHEDULER_MIN_INTERVAL_SECONDS,
+    SCHEDULER_MAX_INTERVAL_SECONDS,
+    SCHEDULER_TARGET_NEW_PER_VISIT,
+    SCHEDULER_SMOOTHING,
+)
+
+
+class KeywordScheduler:
+    """
+    Decides which keywords are due for a visit.
+
+    Each keyword tracks an exponentially weighted rate of new tweets per
+    second. The next visit is planned for when about
+    ``target_new_per_visit`` new tweets should have accumulated, so trending
+    keywords are visited often and quiet ones rarely. A visit that finds
+    nothing new doubles the interval; all intervals are clamped to
+    ``[min_interval, max_interval]``. A failed visit leaves the rate alone
+    and retries after a delay that doubles with each consecutive failure.
+    """
+
+    def __init__(
+        self,
+        keywords: List[str],
+        min_interval: float = SCHEDULER_MIN_INTERVAL_SECONDS,
+        max_interval: float = SCHEDULER_MAX_INTERVAL_SECONDS,
+        target_new_per_visit: float = SCHEDULER_TARGET_NEW_PER_VISIT,
+        smoothing: float = SCHEDULER_SMOOTHING,
+    ):
+        """
+        Initialize the scheduler with every keyword due immediately.
+
+        Args:
+            keywords: Keywords to schedule
+            min_interval: Shortest time between visits of one keyword
+            max_interval: Longest time between visits of one keyword
+            target_new_per_visit: New tweets a visit should ideally find
+            smoothing: Weight of the latest observation in the rate average
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.target_new_per_visit = target_new_per_visit
+        self.smoothing = smoothing
+        self._lock = Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self.set_keywords(keywords)
+
+    def set_keywords(self, keywords: List[str]):
+        """
+        Replace the scheduled keywords, keeping state for those that remain.
+
+        Args:
+            keywords: New keyword list; added keywords are due immediately
+        """
+        now = time.time()
+        with self._lock:
+            self._state = {
+                kw: self._state.get(kw) or self._new_state(now)
+                for kw in keywords
+            }
+
+    def keywords(self) -> List[str]:
+        """Get the scheduled keywords."""
+        with self._lock:
+            return list(self._state)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """
+        Get keywords whose next visit time has passed.
+
+        Args:
+            now: Current time, defaults to ``time.time()``
+
+        Returns:
+            Due keywords, highest yield rate first
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [kw for kw, st in self._state.items() if st['next_due'] <= now]
+            due.sort(key=lambda kw: (-self._state[kw]['rate'], self._state[kw]['next_due']))
+            return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """Get the time until the earliest keyword becomes due."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if not self._state:
+                return self.max_interval
+            return max(0.0, min(st['next_due'] for st in self._state.values()) - now)
+
+    def record(self, keyword: str, new_count: int, now: Optional[float] = None):
+        """
+        Record the outcome of a visit and plan the next one.
+
+        Args:
+            keyword: Visited keyword
+            new_count: Number of new tweets the visit found
+            now: Current time, defaults to ``time.time()``
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            st = self._state.get(keyword)
+            if st is None:
+                return
+
+            elapsed = max(1.0, now - st['last_visit']) if st['last_visit'] else st['interval']
+            observed = new_count / elapsed
+            st['rate'] = (
+                observed if st['visits'] == 0
+                else self.smoothing * observed + (1 - self.smoothing) * st['rate']
+            )
+
+            if new_count > 0:
+                st['idle_visits'] = 0
+                interval = self.target_new_per_visit / max(st['rate'], 1e-9)
+            else:
+                st['idle_visits'] += 1
+                interval = st['interval'] * 2
+
+            st['interval'] = min(self.max_interval, max(self.min_interval, interval))
+            st['last_visit'] = now
+            st['last_new'] = new_count
+            st['failures'] = 0
+            st['visits'] += 1
+            st['total_new'] += new_count
+            st['next_due'] = now + st['interval']
+
+    def record_failure(self, keyword: str, now: Optional[float] = None):
+        """
+        Record a visit that raised, so the keyword is retried later.
+
+        Args:
+            keyword: Keyword whose visit failed
+            now: Current time, defaults to ``time.time()``
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            st = self._state.get(keyword)
+            if st is None:
+                return
+            st['failures'] += 1
+            delay = self.min_interval * 2 ** min(st['failures'] - 1, 32)
+            st['next_due'] = now + min(self.max_interval, max(self.min_interval, delay))
+
+    def snapshot(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the schedule for status reporting.
+
+        Returns:
+            One entry per keyword, ordered by next due time
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            items = sorted(self._state.items(), key=lambda kv: kv[1]['next_due'])
+            return [
+                {
+                    'keyword': kw,
+                    'next_due_in_sec': round(max(0.0, st['next_due'] - now), 1),
+                    'interval_sec': round(st['interval'], 1),
+                    'rate_per_min': round(st['rate'] * 60, 3),
+                    'last_new': st['last_new'],
+                    'idle_visits': st['idle_visits'],
+                    'failures': st['failures'],
+                    'visits': st['visits'],
+                    'total_new': st['total_new'],
+                }
+                for kw, st in items
+            ]
+
+    def export_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the per-keyword planning state for a checkpoint.
+
+        Returns:
+            Copy of the state of every keyword; times are epoch seconds
+        """
+        with self._lock:
+            return {kw: dict(st) for kw, st in self._state.items()}
+
+    def restore_state(self, state: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Take over the planning state of scheduled keywords from a checkpoint.
+
+        Keywords not currently scheduled are ignored. Restored intervals are
+        clamped to the configured bounds, so a visit missed while the process
+        was down is due immediately and a changed bound applies.
+
+        Args:
+            state: Output of ``export_state``
+
+        Returns:
+            Number of keywords restored
+        """
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for kw, saved in state.items():
+                if kw not in self._state:
+                    continue
+                st = self._new_state(now)
+                st.update({k: v for k, v in saved.items() if k in st})
+                st['interval'] = min(self.max_interval, max(self.min_interval, float(st['interval'])))
+                st['next_due'] = min(float(st['next_due']), now + st['interval'])
+                self._state[kw] = st
+                restored += 1
+        return restored
+
+    def _new_state(self, now: float) -> Dict[str, Any]:
+        return {
+            'rate': 0.0,
+            'interval': self.min_interval,
+            'next_due': now,
+            'last_visit': 0.0,
+            'last_new': None,
+            'idle_visits': 0,
+            'failures': 0,
+            'visits': 0,
+            'total_new': 0,
+        }
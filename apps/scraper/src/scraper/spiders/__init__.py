@@ -1,2 +1,22 @@
 # This package will contain the spiders of your Scrapy project
 # Please refer to the documentation for information on how to create and manage your spiders.
+
+from ..config import SCRAPER_ENGINE
+
+
+def create_scraper(engine: str = SCRAPER_ENGINE):
+    """
+    Create a scraper for the configured engine.
+
+    Args:
+        engine: "selenium" (default) or "http"
+
+    Returns:
+        Scraper exposing ``search_and_extract`` and ``close``
+    """
+    if engine == "http":
+        from .http_spider import XcancelHttpScraper
+        return XcancelHttpScraper()
+
+    from .twitter_spider import XcancelScraper
+    return XcancelScraper()
@@ -0,0 +1,274 @@
+"""Browserless HTTP scraping engine for xcancel search results."""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import quote
+
+import aiohttp
+
+from .parsing import TweetRecord, parse_page, detect_block, take_until_known
+from .twitter_spider import XcancelScraper
+from ..metrics import get_metrics
+from ..utils.ratelimit import get_rate_limiter
+from ..config import (
+    XCANCEL_BASE_URL,
+    USER_AGENT,
+    HTTP_CONCURRENCY,
+    HTTP_TIMEOUT_SECONDS,
+    MAX_PAGES_PER_KEYWORD,
+    MAX_ITEMS_PER_KEYWORD,
+)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+KnownPredicate = Callable[[str, TweetRecord], bool]
+
+
+class XcancelHttpScraper:
+    """
+    Fetch search result pages with a pooled aiohttp client.
+
+    Exposes the same ``search_and_extract`` interface as ``XcancelScraper``
+    plus ``search_many`` for fetching several keywords concurrently. When a
+    challenge page is served instead of results, the keyword is retried with
+    a lazily started Selenium scraper.
+    """
+
+    def __init__(
+        self,
+        base_url: str = XCANCEL_BASE_URL,
+        concurrency: int = HTTP_CONCURRENCY,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        fallback_factory: Optional[Callable[[], XcancelScraper]] = XcancelScraper,
+    ):
+        """
+        Initialize the HTTP scraper.
+
+        Args:
+            base_url: Root URL of the xcancel instance (or a local stand-in)
+            concurrency: Maximum number of in-flight requests
+            timeout: Total timeout per request in seconds
+            fallback_factory: Callable creating the Selenium fallback, or None to disable
+        """
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self._fallback_factory = fallback_factory
+        self._fallback: Optional[XcancelScraper] = None
+        self.limiter = get_rate_limiter(self.base_url)
+        self._loop = asyncio.new_event_loop()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def search_url(self, keyword: str, cursor: Optional[str] = None) -> str:
+        """Build the search result URL for a keyword or a continuation cursor."""
+        if cursor:
+            return f"{self.base_url}/search{cursor}"
+        return f"{self.base_url}/search?f=tweets&q={quote(keyword)}"
+
+    def search_and_extract(
+        self,
+        keyword: str,
+        is_known: Optional[KnownPredicate] = None,
+        max_pages: int = MAX_PAGES_PER_KEYWORD,
+        max_items: int = MAX_ITEMS_PER_KEYWORD,
+    ) -> List[TweetRecord]:
+        """
+        Fetch and parse search results for a single keyword.
+
+        Args:
+            keyword: Search keyword
+            is_known: Predicate ``(keyword, tweet)`` that stops pagination at stored tweets
+            max_pages: Maximum number of result pages to follow
+            max_items: Maximum number of new tweets to collect
+
+        Returns:
+            New tweet records, newest first
+        """
+        return self.search_many([keyword], is_known, max_pages, max_items)[keyword]
+
+    def search_many(
+        self,
+        keywords: List[str],
+        is_known: Optional[KnownPredicate] = None,
+        max_pages: int = MAX_PAGES_PER_KEYWORD,
+        max_items: int = MAX_ITEMS_PER_KEYWORD,
+    ) -> Dict[str, List[TweetRecord]]:
+        """
+        Fetch and parse search results for several keywords concurrently.
+
+        Args:
+            keywords: Search keywords
+            is_known: Predicate ``(keyword, tweet)`` that stops pagination at stored tweets
+            max_pages: Maximum number of result pages to follow per keyword
+            max_items: Maximum number of new tweets to collect per keyword
+
+        Returns:
+            Mapping of keyword to new tweet records, newest first
+        """
+        collected = self._loop.run_until_complete(
+            self._fetch_all(keywords, is_known, max_pages, max_items)
+        )
+
+        results: Dict[str, List[TweetRecord]] = {}
+        for keyword in keywords:
+            tweets = collected.get(keyword)
+            if tweets is None:
+                results[keyword] = self._search_with_fallback(keyword, is_known, max_pages, max_items)
+                continue
+            results[keyword] = tweets
+        return results
+
+    def recover(self, level: int = 1):
+        """
+        Drop pooled connections, and recover the Selenium fallback if running.
+
+        Args:
+            level: Recovery level passed on to the fallback driver
+        """
+        if self._session is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self._session.close())
+        self._session = None
+        if self._fallback is not None:
+            self._fallback.recover(level)
+
+    def abort(self):
+        """Kill the Selenium fallback, the only part that can block indefinitely."""
+        if self._fallback is not None:
+            self._fallback.abort()
+
+    def close(self):
+        """Close the HTTP session, the event loop and any fallback driver."""
+        logger.debug("Closing the HTTP scraper.")
+        try:
+            if self._session is not None and not self._loop.is_closed():
+                self._loop.run_until_complete(self._session.close())
+        finally:
+            self._session = None
+            if not self._loop.is_closed():
+                self._loop.close()
+            if self._fallback is not None:
+                fallback, self._fallback = self._fallback, None
+                fallback.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session on first use inside the event loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "User-Agent": USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml",
+                    "Accept-Language": "en-US,en;q=0.9",
+                },
+            )
+        return self._session
+
+    async def _fetch_all(
+        self,
+        keywords: List[str],
+        is_known: Optional[KnownPredicate],
+        max_pages: int,
+        max_items: int,
+    ) -> Dict[str, Optional[List[TweetRecord]]]:
+        """Paginate all keywords concurrently, bounded by the connector limit."""
+        session = await self._get_session()
+        collected = await asyncio.gather(
+            *(self._paginate(session, kw, is_known, max_pages, max_items) for kw in keywords)
+        )
+        return dict(zip(keywords, collected))
+
+    async def _paginate(
+        self,
+        session: aiohttp.ClientSession,
+        keyword: str,
+        is_known: Optional[KnownPredicate],
+        max_pages: int,
+        max_items: int,
+    ) -> Optional[List[TweetRecord]]:
+        """
+        Follow the result timeline for a keyword until a known tweet or a cap.
+
+        Returns:
+            New tweet records, or None if the first page was a challenge
+        """
+        known = (lambda tweet: is_known(keyword, tweet)) if is_known else None
+        collected: List[TweetRecord] = []
+        cursor: Optional[str] = None
+        started = time.perf_counter()
+
+        try:
+            for page in range(max(1, max_pages)):
+                body = await self._fetch(session, keyword, cursor)
+                if body is None:
+                    return None if page == 0 else collected
+                if not body:
+                    break
+
+                # Known-tweet checks may hit the database, keep them off the event loop
+                tweets, cursor = parse_page(body)
+                new_tweets, done = await asyncio.to_thread(
+                    take_until_known, tweets, known, max_items - len(collected)
+                )
+                collected.extend(new_tweets)
+                if done:
+                    break
+
+                if not cursor:
+                    break
+
+            return collected
+        finally:
+            metrics.observe('scrape_seconds', time.perf_counter() - started, keyword=keyword, engine='http')
+
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        keyword: str,
+        cursor: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Fetch one result page for a keyword through the host rate limiter.
+
+        Returns:
+            Page HTML, empty string on network errors or rate limiting,
+            None on a challenge page
+        """
+        if cursor is None:
+            logger.debug("Searching for keyword: %s", keyword)
+        await self.limiter.acquire_async()
+        try:
+            async with session.get(self.search_url(keyword, cursor)) as response:
+                body = await response.text(errors="replace")
+                blocked = detect_block(body, response.status)
+                self.limiter.report(blocked)
+                metrics.inc('pages_fetched_total', engine='http', outcome=blocked or 'ok')
+                if blocked == 'challenge':
+                    logger.warning("[http] challenge page for '%s' (status %s)", keyword, response.status)
+                    return None
+                if blocked:
+                    logger.warning("[http] %s for '%s' (status %s)", blocked, keyword, response.status)
+                    return ""
+                return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Search failed for %s: %s", keyword, e)
+            metrics.inc('pages_fetched_total', engine='http', outcome='error')
+            return ""
+
+    def _search_with_fallback(
+        self,
+        keyword: str,
+        is_known: Optional[KnownPredicate],
+        max_pages: int,
+        max_items: int,
+    ) -> List[TweetRecord]:
+        """Retry a challenged keyword with the Selenium engine."""
+        if self._fallback_factory is None:
+            return []
+        if self._fallback is None:
+            logger.info("[http] starting Selenium fallback")
+            self._fallback = self._fallback_factory()
+        return self._fallback.search_and_extract(keyword, is_known, max_pages, max_items)
@@ -0,0 +1,191 @@
+"""Shared parsing helpers for xcancel search result pages."""
+
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+CSS_SEARCH_INPUT = 'div.search-bar input[placeholder="Search..."]'
+CSS_SEARCH_BTN = 'div.search-bar form button'
+CSS_ARTICLE = 'div.timeline-item'
+CSS_TWEET_TEXT = 'div.timeline-item div.tweet-content.media-body'
+CSS_TWEET_FALLBACK = 'span'
+
+# Phrases seen on interstitial/anti-bot pages served instead of results
+CHALLENGE_MARKERS = (
+    'verifying your browser',
+    'just a moment',
+    'cf-challenge',
+    'challenge-form',
+    'anubis',
+    'captcha',
+)
+CHALLENGE_STATUS_CODES = (403, 503)
+# Nitter instances answer "Instance has been rate limited." when throttled
+RATE_LIMIT_MARKERS = (
+    'rate limited',
+    'too many requests',
+)
+RATE_LIMIT_STATUS_CODES = (429,)
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one class among several."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# XPath equivalents of the CSS selectors, evaluated with lxml directly
+XPATH_ITEM = f"//div[{_has_class('timeline-item')}]"
+XPATH_CONTENT = f".//div[{_has_class('tweet-content')}]"
+XPATH_TWEET_LINK = f".//a[{_has_class('tweet-link')}]/@href"
+XPATH_DATE_LINK = f".//span[{_has_class('tweet-date')}]/a"
+XPATH_USERNAME = f".//a[{_has_class('username')}]/text()"
+XPATH_LOAD_MORE = f"//div[{_has_class('show-more')}]//a/@href"
+XPATH_FALLBACK = f"//{CSS_TWEET_FALLBACK}/text()"
+
+# One parsed tweet: tweet_id, author, text, tweeted_at, link
+TweetRecord = Dict[str, Any]
+
+# Status links look like /<user>/status/<id>#m
+STATUS_LINK_RE = re.compile(r"/([^/?#]+)/status/(\d+)")
+# Nitter shows the full date in the title of the date link
+TWEET_DATE_FORMAT = "%b %d, %Y · %I:%M %p %Z"
+TWEET_URL = "https://x.com/{author}/status/{tweet_id}"
+
+
+def parse_page(page_source: str) -> Tuple[List[TweetRecord], Optional[str]]:
+    """
+    Parse a search result page into tweet records and the next-page cursor.
+    
+    Each ``div.timeline-item`` becomes a record with ``tweet_id``, ``author``,
+    ``text`` (whitespace-normalized, including link text), ``tweeted_at``
+    (UTC datetime) and ``link``. Fields missing from the markup are None.
+    
+    Args:
+        page_source: Raw HTML of the page
+        
+    Returns:
+        Tuple of (records in page order, query string of the next page or None)
+    """
+    if not page_source or not page_source.strip():
+        return [], None
+    try:
+        root = lxml_html.fromstring(page_source)
+    except (etree.ParserError, ValueError):
+        return [], None
+    
+    tweets = [t for t in (_parse_item(item) for item in root.xpath(XPATH_ITEM)) if t]
+    logger.debug("Parsed %s timeline items.", len(tweets))
+    if not tweets:
+        texts = [t.strip() for t in root.xpath(XPATH_FALLBACK) if t.strip()]
+        logger.debug("Fallback selector used: %s, found %s elements.", CSS_TWEET_FALLBACK, len(texts))
+        tweets = [_record(text) for text in texts]
+    
+    cursor = next((href for href in reversed(root.xpath(XPATH_LOAD_MORE)) if 'cursor=' in href), None)
+    return tweets, cursor
+
+
+def _parse_item(item) -> Optional[TweetRecord]:
+    """Build a tweet record from one timeline item, or None if it has no text."""
+    content = item.xpath(XPATH_CONTENT)
+    if not content:
+        return None
+    text = " ".join(content[0].text_content().split())
+    if not text:
+        return None
+    
+    date_links = item.xpath(XPATH_DATE_LINK)
+    hrefs = item.xpath(XPATH_TWEET_LINK) + [a.get('href') or '' for a in date_links]
+    match = next((m for m in (STATUS_LINK_RE.search(h) for h in hrefs) if m), None)
+    author = match.group(1) if match else None
+    if author is None:
+        usernames = [u.strip().lstrip('@') for u in item.xpath(XPATH_USERNAME)]
+        author = next((u for u in usernames if u), None)
+    
+    tweeted_at = None
+    if date_links:
+        tweeted_at = _parse_date(date_links[0].get('title'))
+    return _record(text, match.group(2) if match else None, author, tweeted_at)
+
+
+def _record(
+    text: str,
+    tweet_id: Optional[str] = None,
+    author: Optional[str] = None,
+    tweeted_at: Optional[datetime] = None,
+) -> TweetRecord:
+    link = TWEET_URL.format(author=author, tweet_id=tweet_id) if tweet_id and author else None
+    return {
+        'tweet_id': tweet_id,
+        'author': author,
+        'text': text,
+        'tweeted_at': tweeted_at,
+        'link': link,
+    }
+
+
+def _parse_date(title: Optional[str]) -> Optional[datetime]:
+    """Parse a Nitter date title such as "Sep 3, 2025 · 4:05 PM UTC"."""
+    if not title:
+        return None
+    try:
+        return datetime.strptime(title.strip(), TWEET_DATE_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def take_until_known(
+    tweets: List[TweetRecord],
+    is_known: Optional[Callable[[TweetRecord], bool]],
+    limit: int
+) -> Tuple[List[TweetRecord], bool]:
+    """
+    Collect tweet records in timeline order until a known tweet or the item cap.
+    
+    Args:
+        tweets: Records from one result page, newest first
+        is_known: Predicate returning True for tweets already stored
+        limit: Maximum number of new records to collect
+        
+    Returns:
+        Tuple of (new records, whether pagination should stop)
+    """
+    new_tweets: List[TweetRecord] = []
+    for tweet in tweets:
+        if not tweet.get('text'):
+            continue
+        if is_known is not None and is_known(tweet):
+            return new_tweets, True
+        if len(new_tweets) >= limit:
+            return new_tweets, True
+        new_tweets.append(tweet)
+    return new_tweets, len(new_tweets) >= limit
+
+
+def detect_block(page_source: str, status: int = 200) -> Optional[str]:
+    """
+    Classify a response that is not a usable result page.
+    
+    Args:
+        page_source: Raw HTML of the page
+        status: HTTP status code of the response (200 for browser pages)
+        
+    Returns:
+        "rate_limited", "challenge", or None for a normal page
+    """
+    if status in RATE_LIMIT_STATUS_CODES:
+        return 'rate_limited'
+    if status in CHALLENGE_STATUS_CODES:
+        return 'challenge'
+    
+    head = (page_source or '')[:20000].lower()
+    if 'class="timeline' in head:
+        return None
+    if any(marker in head for marker in RATE_LIMIT_MARKERS):
+        return 'rate_limited'
+    if any(marker in head for marker in CHALLENGE_MARKERS):
+        return 'challenge'
+    return None
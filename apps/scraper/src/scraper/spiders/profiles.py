@@ -0,0 +1,170 @@
+"""Pool of reusable Chrome profile directories."""
+
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from ..config import PROFILE_ROOT, PROFILE_POOL_SIZE, PROFILE_TEMPLATE_DIR
+
+# Files Chrome leaves behind that block reuse of a profile after a crash
+_SINGLETON_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket")
+
+
+def default_profile_root() -> Path:
+    """Prefer tmpfs (/dev/shm) for profiles, fall back to the temp directory."""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / "scraper-profiles"
+    return Path(tempfile.gettempdir()) / "scraper-profiles"
+
+
+class ProfilePool:
+    """
+    Fixed set of profile slots reused across driver restarts.
+
+    A restarted driver gets a profile that already holds cookies and cache
+    from the previous session instead of a cold one. Empty slots are seeded
+    from an optional template profile. Slots are cleaned at startup (stale
+    locks, legacy ``selenium_profile_*`` directories) and removed at exit.
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = PROFILE_ROOT,
+        size: int = PROFILE_POOL_SIZE,
+        template: Optional[str] = PROFILE_TEMPLATE_DIR,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            root: Directory holding the slots, defaults to tmpfs when available
+            size: Number of slots
+            template: Profile directory copied into empty slots
+        """
+        self.root = Path(root) if root else default_profile_root()
+        self.size = max(1, size)
+        self.template = Path(template) if template else None
+        self._lock = Lock()
+        self._in_use: Dict[str, bool] = {}
+        self.seeded = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def slots(self) -> List[Path]:
+        """Get the slot directories."""
+        return [self.root / f"profile_{i}" for i in range(self.size)]
+
+    def acquire(self) -> str:
+        """
+        Reserve a free profile slot.
+
+        Returns:
+            Path of the profile directory to pass as ``--user-data-dir``
+
+        Raises:
+            RuntimeError: If every slot is in use
+        """
+        with self._lock:
+            for slot in self.slots():
+                key = str(slot)
+                if self._in_use.get(key):
+                    continue
+                self._in_use[key] = True
+                self._prepare(slot)
+                return key
+        raise RuntimeError(f"All {self.size} browser profiles are in use")
+
+    def release(self, path: str, discard: bool = False):
+        """
+        Return a slot to the pool.
+
+        Args:
+            path: Path returned by ``acquire``
+            discard: Delete the profile, e.g. after a crash that may have corrupted it
+        """
+        slot = Path(path)
+        if discard:
+            shutil.rmtree(slot, ignore_errors=True)
+            self.discarded += 1
+        else:
+            self._remove_locks(slot)
+        with self._lock:
+            self._in_use.pop(str(slot), None)
+
+    def cleanup_stale(self, legacy_dir: Optional[str] = None):
+        """
+        Remove leftovers from previous runs.
+
+        Args:
+            legacy_dir: Directory to scan for old ``selenium_profile_*`` folders
+        """
+        legacy = Path(legacy_dir or os.getcwd())
+        for old in legacy.glob("selenium_profile_*"):
+            if old.is_dir():
+                shutil.rmtree(old, ignore_errors=True)
+        for slot in self.slots():
+            self._remove_locks(slot)
+
+    def cleanup(self):
+        """Remove every slot directory; called at shutdown."""
+        with self._lock:
+            self._in_use.clear()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get slot usage for status reporting."""
+        with self._lock:
+            in_use = sum(1 for v in self._in_use.values() if v)
+        return {
+            'root': str(self.root),
+            'size': self.size,
+            'in_use': in_use,
+            'seeded': self.seeded,
+            'reused': self.reused,
+            'discarded': self.discarded,
+        }
+
+    def _prepare(self, slot: Path):
+        """Create or reuse a slot directory."""
+        if slot.is_dir() and any(slot.iterdir()):
+            self._remove_locks(slot)
+            self.reused += 1
+            return
+        slot.parent.mkdir(parents=True, exist_ok=True)
+        if self.template and self.template.is_dir():
+            shutil.copytree(
+                self.template, slot, symlinks=True, dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(*_SINGLETON_FILES),
+            )
+            self.seeded += 1
+        else:
+            slot.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _remove_locks(slot: Path):
+        for name in _SINGLETON_FILES:
+            try:
+                (slot / name).unlink()
+            except OSError:
+                pass
+
+
+# Global profile pool
+_profile_pool: Optional[ProfilePool] = None
+_profile_pool_lock = Lock()
+
+
+def get_profile_pool() -> ProfilePool:
+    """Get or create the global profile pool, cleaning up stale profiles once."""
+    global _profile_pool
+    with _profile_pool_lock:
+        if _profile_pool is None:
+            _profile_pool = ProfilePool()
+            _profile_pool.cleanup_stale()
+            atexit.register(_profile_pool.cleanup)
+        return _profile_pool
@@ -1,20 +1,44 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from scrapy.selector import Selector
+import logging
 import time
 import random
 import undetected_chromedriver as uc
-import os
 import ssl
 
+from .parsing import (
+    CSS_SEARCH_INPUT,
+    CSS_SEARCH_BTN,
+    CSS_ARTICLE,
+    CSS_TWEET_TEXT,
+    CSS_TWEET_FALLBACK,
+    parse_page,
+    take_until_known,
+    detect_block,
+)
+from .profiles import get_profile_pool
+from ..metrics import get_metrics
+from ..utils.ratelimit import get_rate_limiter
+from ..utils.helpers import descendant_pids, kill_pids
+from ..config import (
+    XCANCEL_BASE_URL,
+    USER_AGENT,
+    MAX_PAGES_PER_KEYWORD,
+    MAX_ITEMS_PER_KEYWORD,
+    PAGE_LOAD_TIMEOUT_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
 
 class XcancelScraper:
-    CSS_SEARCH_INPUT = 'div.search-bar input[placeholder="Search..."]'
-    CSS_SEARCH_BTN = 'div.search-bar form button'
-    CSS_ARTICLE = 'div.timeline-item'
-    CSS_TWEET_TEXT = 'div.timeline-item div.tweet-content.media-body'
-    CSS_TWEET_FALLBACK = 'span'
+    CSS_SEARCH_INPUT = CSS_SEARCH_INPUT
+    CSS_SEARCH_BTN = CSS_SEARCH_BTN
+    CSS_ARTICLE = CSS_ARTICLE
+    CSS_TWEET_TEXT = CSS_TWEET_TEXT
+    CSS_TWEET_FALLBACK = CSS_TWEET_FALLBACK
 
     def human_typing(self, element, text, min_delay=0.1, max_delay=0.3):
 
@@ -23,7 +47,8 @@ class XcancelScraper:
             delay = random.uniform(min_delay, max_delay)
             time.sleep(delay)
 
-    def __init__(self):
+    def __init__(self, profile_pool=None):
+        started = time.monotonic()
         options = uc.ChromeOptions()
 
         options.add_argument("--headless")
@@ -31,21 +56,58 @@ class XcancelScraper:
         options.add_argument("--no-sandbox")
         options.add_argument("--window-size=1920,1080")
 
-        user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " \
-                     "AppleWebKit/537.36 (KHTML, like Gecko) " \
-                     "Chrome/140.0.7339.82 Safari/537.36"
-        options.add_argument(f"--user-agent={user_agent}")
+        options.add_argument(f"--user-agent={USER_AGENT}")
 
-        profile_path = os.path.join(os.getcwd(), f"selenium_profile_{random.randint(1000,9999)}")
-        options.add_argument(f"--user-data-dir={profile_path}")
+        # Reuse a warm profile from the pool instead of a fresh directory per start
+        self.profile_pool = profile_pool or get_profile_pool()
+        self.profile_path = self.profile_pool.acquire()
+        options.add_argument(f"--user-data-dir={self.profile_path}")
 
         ssl._create_default_https_context = ssl._create_unverified_context
-        self.driver = uc.Chrome(options=options)
-
-    def search_and_extract(self, keyword):
-        print(f"Searching for keyword: {keyword}")
-        self.driver.get('https://xcancel.com/')
-        time.sleep(random.uniform(3,6))
+        try:
+            self.driver = uc.Chrome(options=options)
+        except Exception:
+            self.profile_pool.release(self.profile_path, discard=True)
+            raise
+        # A hung navigation raises TimeoutException instead of stalling the loop
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT_SECONDS)
+        self.limiter = get_rate_limiter(XCANCEL_BASE_URL)
+        self.startup_seconds = time.monotonic() - started
+        logger.info("Driver ready in %.2fs (profile %s).", self.startup_seconds, self.profile_path)
+
+    def driver_pids(self):
+        """Process IDs of this driver's chromedriver, browser and their children."""
+        roots = set()
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is not None and getattr(process, "pid", None):
+            roots.add(process.pid)
+        browser_pid = getattr(self.driver, "browser_pid", None)
+        if browser_pid:
+            roots.add(browser_pid)
+
+        pids = set(roots)
+        for pid in roots:
+            pids |= descendant_pids(pid)
+        return pids
+
+    def search_and_extract(self, keyword, is_known=None,
+                           max_pages=MAX_PAGES_PER_KEYWORD, max_items=MAX_ITEMS_PER_KEYWORD):
+        """
+        Search for a keyword and page through the result timeline.
+
+        Pagination stops at the first tweet for which ``is_known(keyword, tweet)``
+        is true, so repeated cycles only return tweets not seen before.
+
+        Returns:
+            New tweet records (see ``parse_page``), newest first
+        """
+        logger.debug("Searching for keyword: %s", keyword)
+        started = time.perf_counter()
+        self.limiter.acquire()
+        self.driver.get(f'{XCANCEL_BASE_URL}/')
+        time.sleep(random.uniform(1,2))
+        known = (lambda tweet: is_known(keyword, tweet)) if is_known else None
         try:
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_SEARCH_INPUT))
@@ -55,40 +117,97 @@ class XcancelScraper:
             self.human_typing(search_input, keyword, 0.15, 0.4)
             search_btn = self.driver.find_element(By.CSS_SELECTOR, self.CSS_SEARCH_BTN)
             time.sleep(random.uniform(0.5, 1.5))
+            self.limiter.acquire()
             search_btn.click()
 
-            #Xcancel has a random wait screen sometimes so...
-            time.sleep(10)
-
-            try:
-                WebDriverWait(self.driver, 30).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_TWEET_TEXT))
-                )
-            except Exception:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_TWEET_FALLBACK))
-                )
+            # Xcancel sometimes shows a wait screen; _wait_for_results polls
+            # for the timeline instead of sleeping a fixed worst case
+            collected = []
+            for page in range(max(1, max_pages)):
+                try:
+                    self._wait_for_results()
+                finally:
+                    page_source = self.driver.page_source
+                    blocked = detect_block(page_source)
+                    self.limiter.report(blocked)
+                    metrics.inc('pages_fetched_total', engine='selenium', outcome=blocked or 'ok')
+                if blocked:
+                    logger.warning("[selenium] %s page for '%s'", blocked, keyword)
+                    break
+
+                tweets, cursor = parse_page(page_source)
+                new_tweets, done = take_until_known(tweets, known, max_items - len(collected))
+                collected.extend(new_tweets)
+                if done:
+                    break
+
+                if not cursor:
+                    break
+                self.limiter.acquire()
+                self.driver.get(f'{XCANCEL_BASE_URL}/search{cursor}')
+
+            logger.info("Collected %s new tweets for '%s' over %s page(s).", len(collected), keyword, page + 1)
+            return collected
 
-            sel = Selector(text=self.driver.page_source)
-            tweet_elements = sel.css(self.CSS_TWEET_TEXT)
-            tweet_texts = tweet_elements.xpath('text()').getall()
-
-            print(f"Selector used: {self.CSS_TWEET_TEXT}, found {len(tweet_texts)} elements.")
-            if not tweet_texts:
-                tweet_elements = sel.css(self.CSS_TWEET_FALLBACK)
-                tweet_texts = tweet_elements.xpath('text()').getall()
-                print(f"Fallback selector used: {self.CSS_TWEET_FALLBACK}, found {len(tweet_texts)} elements.")
-
-            top_5 = tweet_texts[:5]
-            while len(top_5) < 5:
-                top_5.append("")
+        except Exception as e:
+            logger.warning("Search failed for %s: %s", keyword, e)
+            return []
+        finally:
+            metrics.observe('scrape_seconds', time.perf_counter() - started, keyword=keyword, engine='selenium')
 
-            return [tweet.strip() for tweet in top_5]
+    def _wait_for_results(self):
+        try:
+            WebDriverWait(self.driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_TWEET_TEXT))
+            )
+        except Exception:
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.CSS_TWEET_FALLBACK))
+            )
 
-        except Exception as e:
-            print(f"Search failed for {keyword}: {e}")
-            return [""] * 5
+    def recover(self, level=1):
+        """
+        Bring a misbehaving browser back without restarting it.
+
+        Args:
+            level: 1 reloads the start page in the current tab, 2 or more
+                replaces every tab with a fresh one
+        """
+        if level <= 1:
+            self.driver.get(f'{XCANCEL_BASE_URL}/')
+            return
+
+        handles = self.driver.window_handles
+        if handles:
+            # The current tab may be gone; new_window needs a live context
+            self.driver.switch_to.window(handles[-1])
+        self.driver.switch_to.new_window('tab')
+        fresh = self.driver.current_window_handle
+        for handle in handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(fresh)
+        self.driver.get(f'{XCANCEL_BASE_URL}/')
+
+    def abort(self):
+        """
+        Kill this driver's processes from another thread.
+
+        A WebDriver call blocked in the scraping thread then fails and the
+        scraping loop replaces the driver itself.
+        """
+        kill_pids(self.driver_pids())
 
     def close(self):
-        print("Closing the WebDriver.")
-        self.driver.quit()
+        logger.debug("Closing the WebDriver.")
+        # Collect this driver's process tree first; quit() forgets the PIDs
+        pids = self.driver_pids()
+        clean = True
+        try:
+            self.driver.quit()
+        except Exception:
+            clean = False
+            raise
+        finally:
+            kill_pids(pids)
+            self.profile_pool.release(self.profile_path, discard=not clean)
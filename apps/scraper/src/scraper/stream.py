@@ -0,0 +1,192 @@
+"""In-process fan-out of newly stored tweets to streaming clients."""
+
+import json
+import time
+from collections import deque
+from queue import Queue, Full, Empty
+from threading import Lock
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set
+
+from .config import STREAM_BUFFER_SIZE, STREAM_QUEUE_SIZE, STREAM_KEEPALIVE_SECONDS
+
+
+class Subscription:
+    """A single client's view of the broadcast feed."""
+
+    def __init__(self, keywords: Optional[Set[str]], relevant_only: bool, queue_size: int):
+        """
+        Initialize a subscription.
+
+        Args:
+            keywords: Keywords to receive, or None for all
+            relevant_only: Only receive relevant tweets
+            queue_size: Events buffered before the client is considered too slow
+        """
+        self.keywords = keywords
+        self.relevant_only = relevant_only
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """Check whether an event passes this subscription's filters."""
+        if self.relevant_only and not event.get('relevant'):
+            return False
+        if self.keywords is not None and event.get('keyword') not in self.keywords:
+            return False
+        return True
+
+
+class TweetBroadcaster:
+    """
+    Publishes stored tweets to all subscribers from one place.
+
+    Events get a resume token ``<epoch>-<seq>`` and are kept in a bounded ring
+    buffer, so a reconnecting client that sends its last token (as SSE
+    ``Last-Event-ID``) receives what it missed, as long as it is still buffered.
+    """
+
+    def __init__(self, buffer_size: int = STREAM_BUFFER_SIZE, queue_size: int = STREAM_QUEUE_SIZE):
+        """
+        Initialize the broadcaster.
+
+        Args:
+            buffer_size: Recent events kept for resuming clients
+            queue_size: Per-subscriber queue size
+        """
+        self.epoch = int(time.time())
+        self.queue_size = queue_size
+        self._seq = 0
+        self._buffer: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self._subscribers: List[Subscription] = []
+        self._lock = Lock()
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def publish(self, events: List[Dict[str, Any]]):
+        """
+        Assign resume tokens to events and push them to matching subscribers.
+
+        Args:
+            events: Tweet events (keyword, text, relevant, label, ...)
+        """
+        if not events:
+            return
+        with self._lock:
+            for event in events:
+                self._seq += 1
+                event = dict(event, id=f"{self.epoch}-{self._seq}", seq=self._seq)
+                self._buffer.append(event)
+                self.published += 1
+                for sub in self._subscribers:
+                    if sub.overflowed or not sub.matches(event):
+                        continue
+                    try:
+                        sub.queue.put_nowait(event)
+                    except Full:
+                        # Slow client: close its stream, it resumes from the buffer
+                        sub.overflowed = True
+                        self.dropped_subscribers += 1
+
+    def subscribe(
+        self,
+        keywords: Optional[Set[str]] = None,
+        relevant_only: bool = False,
+        last_event_id: Optional[str] = None
+    ) -> tuple[Subscription, List[Dict[str, Any]]]:
+        """
+        Register a subscriber and collect the events it missed.
+
+        Args:
+            keywords: Keywords to receive, or None for all
+            relevant_only: Only receive relevant tweets
+            last_event_id: Resume token of the last event the client saw
+
+        Returns:
+            Tuple of (subscription, buffered events newer than the token)
+        """
+        sub = Subscription(keywords, relevant_only, self.queue_size)
+        after = self._parse_token(last_event_id)
+        with self._lock:
+            backlog = []
+            if after is not None:
+                backlog = [e for e in self._buffer if e['seq'] > after and sub.matches(e)]
+            self._subscribers.append(sub)
+        return sub, backlog
+
+    def unsubscribe(self, sub: Subscription):
+        """Remove a subscriber."""
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def stream(self, sub: Subscription, backlog: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Render a subscription as server-sent events.
+
+        Args:
+            sub: Subscription returned by ``subscribe``
+            backlog: Missed events returned by ``subscribe``
+
+        Yields:
+            SSE frames, with keepalive comments while idle
+        """
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield self._format(event)
+            while True:
+                try:
+                    event = sub.queue.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                except Empty:
+                    if sub.overflowed:
+                        # Queue drained after overflow; the client reconnects
+                        # with its last id and catches up from the buffer
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield self._format(event)
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get broadcaster counters for status reporting."""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'published': self.published,
+                'buffered': len(self._buffer),
+                'dropped_subscribers': self.dropped_subscribers,
+            }
+
+    def _parse_token(self, token: Optional[str]) -> Optional[int]:
+        """
+        Turn a resume token into a sequence number.
+
+        Tokens from a previous process (different epoch) replay the whole buffer.
+        """
+        if not token:
+            return None
+        epoch, _, seq = token.partition('-')
+        try:
+            if int(epoch) != self.epoch:
+                return 0
+            return int(seq)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _format(event: Dict[str, Any]) -> str:
+        payload = {k: v for k, v in event.items() if k != 'seq'}
+        return f"id: {event['id']}\nevent: tweet\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+# Global broadcaster instance
+_broadcaster: Optional[TweetBroadcaster] = None
+
+
+def get_broadcaster() -> TweetBroadcaster:
+    """Get or create the global broadcaster instance."""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = TweetBroadcaster()
+    return _broadcaster
@@ -1,16 +1,49 @@
 """Utility exports."""
 
-from .database import DatabaseManager, get_db
-from .relevance import check_text_relevance, is_relevant_bool
-from .helpers import load_keywords_from_file, sanitize_keywords, force_kill_drivers, safe_close_driver
+from .database import DatabaseManager, get_db, tweet_hash, tweet_key, text_hash
+from .relevance import classify_texts, get_classifier_version, classifier_stats
+from .embedded import EmbeddedClassifier, get_embedded_classifier
+from .helpers import (
+    load_keywords_from_file,
+    sanitize_keywords,
+    force_kill_drivers,
+    safe_close_driver,
+    descendant_pids,
+    kill_pids,
+)
+from .seen import SeenFilter
+from .ratelimit import (
+    HostRateLimiter,
+    get_rate_limiter,
+    rate_limiter_stats,
+    rate_limiter_state,
+    restore_rate_limiters,
+)
+from .circuit import CircuitBreaker, get_classifier_breaker
 
 __all__ = [
     'DatabaseManager',
     'get_db',
-    'check_text_relevance',
-    'is_relevant_bool',
+    'tweet_hash',
+    'tweet_key',
+    'text_hash',
+    'classify_texts',
+    'get_classifier_version',
+    'classifier_stats',
+    'EmbeddedClassifier',
+    'get_embedded_classifier',
     'load_keywords_from_file',
     'sanitize_keywords',
     'force_kill_drivers',
     'safe_close_driver',
+    'descendant_pids',
+    'kill_pids',
+    'SeenFilter',
+    'HostRateLimiter',
+    'get_rate_limiter',
+    'rate_limiter_stats',
+    'rate_limiter_state',
+    'restore_rate_limiters',
+    'CircuitBreaker',
+    'get_classifier_breaker',
 ]
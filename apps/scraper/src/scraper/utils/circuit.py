@@ -0,0 +1,147 @@
+"""Circuit breaker that makes calls to an unhealthy dependency fail fast."""
+
+import logging
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS
+from ..metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed, open and half-open states around calls to one dependency.
+
+    While closed every call goes through. ``failure_threshold`` failures in a
+    row open the circuit, and calls are refused without waiting for the
+    dependency. After ``reset_timeout`` seconds a single probe call is let
+    through (half-open): its success closes the circuit, its failure opens it
+    again for another timeout. Recovery listeners run whenever a success
+    follows one or more failures, so work deferred meanwhile can be resumed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Dependency name used in logs and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._listeners: List[Callable[[], None]] = []
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, reporting an open circuit as half-open once a probe is due."""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Ask whether a call may be made now.
+
+        Returns:
+            True if the call should go ahead; it must be followed by
+            ``record_success`` or ``record_failure``
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Record a successful call, closing the circuit after a probe."""
+        with self._lock:
+            recovered = self._failures > 0
+            self._failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+            listeners = list(self._listeners) if recovered else []
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.warning("[circuit] %s recovery listener failed: %s", self.name, e)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit at the threshold or after a probe."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = time.monotonic()
+                self.opened += 1
+                self._transition(OPEN)
+
+    def on_recovery(self, listener: Callable[[], None]):
+        """Register a callback run after a success that follows failures."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the state and counters for status reporting."""
+        state = self.state
+        with self._lock:
+            retry_in: Optional[float] = None
+            if self._state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'opened': self.opened,
+                'rejected': self.rejected,
+                'retry_in_sec': retry_in,
+            }
+
+    def _transition(self, state: str):
+        """Change state; the caller holds the lock."""
+        if state == self._state:
+            return
+        logger.info("[circuit] %s %s -> %s", self.name, self._state, state)
+        self._state = state
+        metrics.inc('circuit_transitions_total', circuit=self.name, state=state)
+
+
+# Global classifier breaker instance
+_classifier_breaker: Optional[CircuitBreaker] = None
+
+
+def get_classifier_breaker() -> CircuitBreaker:
+    """Get or create the breaker guarding classifier calls."""
+    global _classifier_breaker
+    if _classifier_breaker is None:
+        _classifier_breaker = CircuitBreaker("classifier")
+    return _classifier_breaker
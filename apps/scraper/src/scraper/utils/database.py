@@ -1,12 +1,126 @@
 """Database utilities for MongoDB operations."""
 
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
+import logging
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from datetime import datetime, timezone
 import hashlib
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
 
-from ..config import MONGODB_URI, DB_NAME
+from .rollups import GRANULARITIES, RollupBatch, bucket_start, fill_series
+from .simhash import to_int64, from_int64
+from ..config import MONGODB_URI, DB_NAME, TWEET_STORAGE_MODE
+from ..metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
+
+# In text-keyed storage a tweet document lists every keyword it matched
+TEXT_KEYED = TWEET_STORAGE_MODE == "text"
+KEYWORD_FIELD = "keywords" if TEXT_KEYED else "keyword"
+
+TWEET_PROJECTION = {
+    "_id": 1,
+    "keyword": 1,
+    "keywords": 1,
+    "text": 1,
+    "tweet_id": 1,
+    "author": 1,
+    "tweeted_at": 1,
+    "link": 1,
+    "relevant": 1,
+    "label": 1,
+    "classifier_version": 1,
+    "pending": 1,
+    "near_duplicate_of": 1,
+    "incident_id": 1,
+    "inserted_at": 1,
+}
+TWEET_SORT = [("inserted_at", -1), ("_id", -1)]
+
+
+def encode_cursor(inserted_at: datetime, doc_id: ObjectId) -> str:
+    """Encode a keyset cursor as ``<inserted_at ISO>,<_id>``."""
+    return f"{inserted_at.isoformat()},{doc_id}"
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, ObjectId]]:
+    """
+    Decode a keyset cursor produced by ``encode_cursor``.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (inserted_at, _id), or None if the cursor is malformed
+    """
+    try:
+        ts, _, oid = cursor.rpartition(",")
+        inserted_at = datetime.fromisoformat(ts)
+        if inserted_at.tzinfo is None:
+            inserted_at = inserted_at.replace(tzinfo=timezone.utc)
+        return inserted_at, ObjectId(oid)
+    except (ValueError, InvalidId, TypeError):
+        return None
+
+
+def tweet_hash(keyword: str, text: str) -> str:
+    """
+    Compute the dedup hash stored as ``text_sha1`` for a keyword/tweet pair.
+    
+    Args:
+        keyword: Search keyword
+        text: Tweet text
+        
+    Returns:
+        Hex SHA1 digest
+    """
+    return hashlib.sha1(f"{keyword}|{text}".encode("utf-8")).hexdigest()
+
+
+def tweet_key(keyword: str, text: str, tweet_id: Optional[str] = None) -> str:
+    """
+    Compute the seen-set key of a tweet: its status id when known, else its text.
+    
+    Args:
+        keyword: Search keyword
+        text: Tweet text
+        tweet_id: Status id parsed from the tweet link
+        
+    Returns:
+        Hex SHA1 digest
+    """
+    if tweet_id:
+        return hashlib.sha1(f"{keyword}|id:{tweet_id}".encode("utf-8")).hexdigest()
+    return tweet_hash(keyword, text)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different copies of a tweet match."""
+    return " ".join(text.split()).casefold()
+
+
+def text_hash(text: str) -> str:
+    """
+    Compute the keyword-independent ``text_sha1`` of text-keyed storage.
+    
+    Args:
+        text: Tweet text
+        
+    Returns:
+        Hex SHA1 digest of the normalized text
+    """
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _is_duplicate_only(error: BulkWriteError) -> bool:
+    """Whether every failed write of a bulk was a duplicate key."""
+    details = error.details or {}
+    return not details.get("writeConcernErrors") and all(
+        e.get("code") == 11000 for e in details.get("writeErrors", [])
+    )
 
 
 class DatabaseManager:
@@ -17,27 +131,78 @@ class DatabaseManager:
         self.client = None
         self.db = None
         self.tweets_col = None
+        self.rollups_col = None
         self.enabled = False
         self._connect()
     
     def _connect(self):
         """Establish connection to MongoDB."""
         try:
-            self.client = MongoClient(MONGODB_URI)
+            self.client = MongoClient(MONGODB_URI, tz_aware=True)
             self.client.admin.command("ping")
-            print(f"[mongo] connected to {MONGODB_URI}")
+            logger.info("[mongo] connected to %s", MONGODB_URI)
             
             self.db = self.client[DB_NAME]
             self.tweets_col = self.db["tweets"]
+            self.create_indexes()
             
-            # Create indexes
-            self.tweets_col.create_index([("keyword", 1), ("text_sha1", 1)], unique=True)
-            self.tweets_col.create_index([("keyword", 1), ("inserted_at", -1)])
+            # Time-bucketed counts; a series read is one range scan on this index
+            self.rollups_col = self.db["tweet_rollups"]
+            self.rollups_col.create_index(
+                [("granularity", 1), ("keyword", 1), ("bucket", 1)], unique=True
+            )
+            self.rollups_col.create_index([("expires_at", 1)], expireAfterSeconds=0)
             
             self.enabled = True
         except Exception as e:
             self.enabled = False
-            print(f"[mongo] connection failed: {e}")
+            logger.warning("[mongo] connection failed: %s", e)
+    
+    def create_indexes(self, text_keyed: bool = TEXT_KEYED):
+        """
+        Create the tweet indexes of a storage mode; keyset reads sort on (inserted_at, _id).
+        
+        Args:
+            text_keyed: Create the indexes of text-keyed storage, where the
+                keyword indexes are multikey indexes over ``keywords``
+        """
+        field = "keywords" if text_keyed else "keyword"
+        if text_keyed:
+            self.tweets_col.create_index([("text_sha1", 1)], unique=True, name="text_sha1_unique")
+            self.tweets_col.create_index(
+                [("tweet_id", 1)],
+                unique=True,
+                partialFilterExpression={"tweet_id": {"$type": "string"}},
+                name="tweet_id_unique",
+            )
+        else:
+            self.tweets_col.create_index([("keyword", 1), ("text_sha1", 1)], unique=True)
+            self.tweets_col.create_index(
+                [("keyword", 1), ("tweet_id", 1)],
+                unique=True,
+                partialFilterExpression={"tweet_id": {"$type": "string"}},
+                name="keyword_tweet_id",
+            )
+        self.tweets_col.create_index([(field, 1), ("inserted_at", -1), ("_id", -1)])
+        self.tweets_col.create_index(
+            [(field, 1), ("relevant", 1), ("inserted_at", -1), ("_id", -1)]
+        )
+        self.tweets_col.create_index(
+            [("inserted_at", -1), ("_id", -1)],
+            partialFilterExpression={"relevant": True},
+            name="relevant_recent",
+        )
+        self.tweets_col.create_index([("classifier_version", 1)])
+        self.tweets_col.create_index(
+            [("pending", 1), ("_id", 1)],
+            partialFilterExpression={"pending": True},
+            name="pending_queue",
+        )
+        self.tweets_col.create_index(
+            [("incident_id", 1), ("inserted_at", -1), ("_id", -1)],
+            partialFilterExpression={"incident_id": {"$type": "string"}},
+            name="incident_recent",
+        )
     
     def upsert_tweet(self, keyword: str, text: str, relevant: bool) -> bool:
         """
@@ -51,12 +216,12 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
-        if not self.enabled or not self.tweets_col:
+        if not self.enabled or self.tweets_col is None:
             return False
         
         try:
-            text_sha1 = self._sha1(f"{keyword}|{text}")
-            now_iso = self._now_iso()
+            text_sha1 = tweet_hash(keyword, text)
+            now = self._now()
             
             self.tweets_col.update_one(
                 {"keyword": keyword, "text_sha1": text_sha1},
@@ -65,7 +230,7 @@ class DatabaseManager:
                         "keyword": keyword,
                         "text": text,
                         "text_sha1": text_sha1,
-                        "inserted_at": now_iso,
+                        "inserted_at": now,
                     },
                     "$set": {
                         "relevant": relevant,
@@ -75,63 +240,513 @@ class DatabaseManager:
             )
             return True
         except PyMongoError as e:
-            print(f"[DB upsert] error for '{keyword}': {e}")
+            logger.warning("[DB upsert] error for '%s': %s", keyword, e)
             return False
     
+    def upsert_tweets(
+        self,
+        keyword: str,
+        classified: List[Dict[str, Any]],
+        existing: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> bool:
+        """
+        Insert or update a batch of classified tweets in one round-trip.
+        
+        Tweets with a status id are matched on their id, so an edited or
+        re-rendered text updates the stored tweet instead of adding a copy;
+        tweets without one fall back to ``text_sha1``. A different id with a
+        text already stored is dropped as a duplicate. In keyword storage the
+        match includes the keyword; in text-keyed storage the keyword is added
+        to the document's ``keywords`` set.
+        
+        Args:
+            keyword: Search keyword
+            classified: Results from ``classify_texts`` (text, relevant, label,
+                scores, classifier_version), optionally merged with the parsed
+                record fields (tweet_id, author, tweeted_at, link); items with
+                ``reused`` set carry the stored classification
+            existing: Stored documents matching each item, as returned by
+                ``find_existing``, in text-keyed storage
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled or self.tweets_col is None:
+            return False
+        if not classified:
+            return True
+        
+        now = self._now()
+        ops = []
+        op_items: Dict[int, int] = {}
+        added: List[Dict[str, Any]] = []
+        for index, item in enumerate(classified):
+            doc = existing[index] if existing else None
+            classification = self._classification_fields(item, now)
+            fresh = bool(item.get('classifier_version')) and not item.get('reused')
+            if doc is not None:
+                # Text-keyed tweet already stored for other keywords
+                if keyword in (doc.get("keywords") or []):
+                    continue
+                update: Dict[str, Any] = {"$addToSet": {"keywords": keyword}}
+                if fresh:
+                    update["$set"] = classification
+                    update["$unset"] = {"pending": ""}
+                ops.append(UpdateOne({"_id": doc["_id"]}, update))
+                added.append(item)
+                continue
+            
+            text = item['text']
+            tweet_id = item.get('tweet_id')
+            if TEXT_KEYED:
+                text_sha1 = text_hash(text)
+                on_insert = {"text": text, "text_sha1": text_sha1, "inserted_at": now}
+                scope: Dict[str, Any] = {}
+            else:
+                text_sha1 = tweet_hash(keyword, text)
+                on_insert = {"keyword": keyword, "text": text, "text_sha1": text_sha1, "inserted_at": now}
+                scope = {"keyword": keyword}
+            if tweet_id:
+                on_insert.update({
+                    "tweet_id": tweet_id,
+                    "author": item.get('author'),
+                    "tweeted_at": item.get('tweeted_at'),
+                    "link": item.get('link'),
+                })
+                match = dict(scope, tweet_id=tweet_id)
+            else:
+                match = dict(scope, text_sha1=text_sha1)
+            if item.get('simhash') is not None:
+                on_insert["simhash"] = to_int64(item['simhash'])
+            if item.get('near_duplicate_of'):
+                on_insert["near_duplicate_of"] = item['near_duplicate_of']
+            if item.get('incident_id'):
+                on_insert["incident_id"] = item['incident_id']
+            update = {"$setOnInsert": on_insert}
+            if TEXT_KEYED:
+                update["$addToSet"] = {"keywords": keyword}
+            if fresh:
+                update["$set"] = classification
+                update["$unset"] = {"pending": ""}
+            else:
+                # Never overwrite a real classification with a failed one;
+                # new tweets wait in the pending queue instead
+                on_insert.update(classification)
+                if not item.get('classifier_version'):
+                    on_insert["pending"] = True
+            op_items[len(ops)] = index
+            ops.append(UpdateOne(match, update, upsert=True))
+        
+        if not ops:
+            return True
+        metrics.observe('mongo_write_batch_size', len(ops), op='upsert_tweets')
+        try:
+            with metrics.timer('mongo_write_seconds', op='upsert_tweets'):
+                result = self.tweets_col.bulk_write(ops, ordered=False)
+            self._count_inserted(keyword, classified, op_items, result.upserted_ids, added, now)
+            return True
+        except BulkWriteError as e:
+            if _is_duplicate_only(e):
+                # Same text under another id, or a concurrent insert; the rest went through
+                upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+                self._count_inserted(keyword, classified, op_items, upserted, added, now)
+                return True
+            logger.warning("[DB upsert] batch error for '%s': %s", keyword, e)
+            metrics.inc('mongo_write_errors_total', op='upsert_tweets')
+            return False
+        except PyMongoError as e:
+            logger.warning("[DB upsert] batch error for '%s': %s", keyword, e)
+            metrics.inc('mongo_write_errors_total', op='upsert_tweets')
+            return False
+    
+    def find_existing(self, records: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up stored text-keyed documents for parsed tweets in one query.
+        
+        Only used in text-keyed storage, where a tweet found for a new keyword
+        reuses the stored document and its classification.
+        
+        Args:
+            records: Tweet records with ``text`` and optional ``tweet_id``
+            
+        Returns:
+            Stored document (keywords and classification) or None per record;
+            all None in keyword storage
+        """
+        if not TEXT_KEYED or not self.enabled or self.tweets_col is None or not records:
+            return [None] * len(records)
+        
+        hashes = [text_hash(r['text']) for r in records]
+        ids = [r['tweet_id'] for r in records if r.get('tweet_id')]
+        branches: List[Dict[str, Any]] = [{"text_sha1": {"$in": hashes}}]
+        if ids:
+            branches.append({"tweet_id": {"$in": ids}})
+        projection = {
+            "_id": 1, "tweet_id": 1, "text_sha1": 1, "keywords": 1,
+            "relevant": 1, "label": 1, "scores": 1, "classifier_version": 1, "incident_id": 1,
+        }
+        try:
+            docs = list(self.tweets_col.find({"$or": branches}, projection=projection))
+        except PyMongoError as e:
+            logger.warning("[DB lookup] batch error: %s", e)
+            return [None] * len(records)
+        
+        by_id = {d["tweet_id"]: d for d in docs if d.get("tweet_id")}
+        by_hash = {d["text_sha1"]: d for d in docs}
+        return [
+            by_id.get(r.get('tweet_id')) or by_hash.get(h)
+            for r, h in zip(records, hashes)
+        ]
+    
+    def find_stale_classifications(
+        self,
+        version: str,
+        after_id=None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find tweets not classified by the given classifier version.
+        
+        Args:
+            version: Current classifier version
+            after_id: Only return documents with a larger ``_id`` (keyset paging)
+            limit: Maximum number of documents
+            
+        Returns:
+            Documents with ``_id`` and ``text``, ordered by ``_id``
+        """
+        if not self.enabled or self.tweets_col is None:
+            return []
+        
+        query: Dict[str, Any] = {"classifier_version": {"$ne": version}}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        
+        try:
+            return list(
+                self.tweets_col.find(query, projection={"_id": 1, "text": 1})
+                .sort([("_id", 1)])
+                .limit(limit)
+            )
+        except PyMongoError as e:
+            logger.warning("[DB stale] error: %s", e)
+            return []
+    
+    def find_pending(self, after_id=None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Find tweets stored while the classifier could not classify them.
+        
+        Args:
+            after_id: Only return documents with a larger ``_id`` (keyset paging)
+            limit: Maximum number of documents
+            
+        Returns:
+            Documents with ``_id`` and ``text``, ordered by ``_id``
+        """
+        if not self.enabled or self.tweets_col is None:
+            return []
+        
+        query: Dict[str, Any] = {"pending": True}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        
+        try:
+            return list(
+                self.tweets_col.find(query, projection={"_id": 1, "text": 1})
+                .sort([("pending", 1), ("_id", 1)])
+                .limit(limit)
+            )
+        except PyMongoError as e:
+            logger.warning("[DB pending] error: %s", e)
+            return []
+    
+    def count_pending(self) -> Optional[int]:
+        """Count tweets waiting for classification, or None if unknown."""
+        if not self.enabled or self.tweets_col is None:
+            return None
+        try:
+            return self.tweets_col.count_documents({"pending": True})
+        except PyMongoError as e:
+            logger.warning("[DB pending] error: %s", e)
+            return None
+    
+    def ensure_archive_index(self):
+        """Create the index that lets the archiver range-scan old tweets."""
+        if self.enabled and self.tweets_col is not None:
+            self.tweets_col.create_index([("inserted_at", 1), ("_id", 1)])
+    
+    def find_archivable(self, cutoff: datetime, limit: int) -> List[Dict[str, Any]]:
+        """
+        Find the oldest tweets inserted before a cutoff.
+        
+        Tweets still waiting in the pending queue are left out, so they
+        stay in Mongo until the backfill has classified them.
+        
+        Args:
+            cutoff: End of the range (exclusive)
+            limit: Maximum number of documents
+            
+        Returns:
+            Full documents ordered by ``(inserted_at, _id)``
+        """
+        if not self.enabled or self.tweets_col is None:
+            return []
+        return list(
+            self.tweets_col.find({"inserted_at": {"$lt": cutoff}, "pending": {"$ne": True}})
+            .sort([("inserted_at", 1), ("_id", 1)])
+            .limit(limit)
+        )
+    
+    def delete_tweets(self, doc_ids: List[Any]) -> int:
+        """
+        Delete tweets by ``_id``.
+        
+        Returns:
+            Number of documents deleted
+        """
+        if not self.enabled or self.tweets_col is None or not doc_ids:
+            return 0
+        with metrics.timer('mongo_write_seconds', op='delete_tweets'):
+            return self.tweets_col.delete_many({"_id": {"$in": doc_ids}}).deleted_count
+    
+    def update_classifications(self, updates: List[tuple]) -> int:
+        """
+        Store classification results for existing documents.
+        
+        Args:
+            updates: ``(doc_id, classified)`` pairs, ``classified`` as returned
+                by ``classify_texts``
+            
+        Returns:
+            Number of documents modified
+        """
+        if not self.enabled or self.tweets_col is None or not updates:
+            return 0
+        
+        now = self._now()
+        updates = [(doc_id, item) for doc_id, item in updates if item.get('classifier_version')]
+        ops = [
+            UpdateOne({"_id": doc_id}, {"$set": self._classification_fields(item, now), "$unset": {"pending": ""}})
+            for doc_id, item in updates
+        ]
+        if not ops:
+            return 0
+        
+        metrics.observe('mongo_write_batch_size', len(ops), op='update_classifications')
+        try:
+            rollups = self._reclassification_deltas(updates)
+            with metrics.timer('mongo_write_seconds', op='update_classifications'):
+                modified = self.tweets_col.bulk_write(ops, ordered=False).modified_count
+            self._apply_rollups(rollups)
+            return modified
+        except PyMongoError as e:
+            logger.warning("[DB update] batch error: %s", e)
+            metrics.inc('mongo_write_errors_total', op='update_classifications')
+            return 0
+    
+    def has_tweet(self, keyword: str, text: str, tweet_id: Optional[str] = None) -> bool:
+        """
+        Check whether a tweet is already stored for a keyword.
+        
+        Args:
+            keyword: Search keyword
+            text: Tweet text
+            tweet_id: Status id; also matches tweets stored by id
+            
+        Returns:
+            True if a matching document exists
+        """
+        if not self.enabled or self.tweets_col is None:
+            return False
+        
+        try:
+            if TEXT_KEYED:
+                branches = [{"text_sha1": text_hash(text)}]
+                if tweet_id:
+                    branches.append({"tweet_id": tweet_id})
+                query: Dict[str, Any] = {"keywords": keyword, "$or": branches}
+            else:
+                query = {"keyword": keyword, "text_sha1": tweet_hash(keyword, text)}
+                if tweet_id:
+                    # Both branches are index lookups; the text branch covers tweets stored before ids
+                    query = {"$or": [query, {"keyword": keyword, "tweet_id": tweet_id}]}
+            return self.tweets_col.find_one(query, projection={"_id": 1}) is not None
+        except PyMongoError as e:
+            logger.warning("[DB lookup] error for '%s': %s", keyword, e)
+            return False
+    
+    def iter_tweet_hashes(self, limit: int) -> Iterator[str]:
+        """
+        Iterate over seen-set keys of the most recently stored tweets.
+        
+        Args:
+            limit: Maximum number of keys to return
+            
+        Yields:
+            ``tweet_key`` values (id-based where stored, else ``text_sha1``), newest first
+        """
+        if not self.enabled or self.tweets_col is None:
+            return
+        
+        try:
+            projection = {"_id": 0, "keyword": 1, "keywords": 1, "tweet_id": 1, "text_sha1": 1}
+            if TEXT_KEYED:
+                # Keys are per keyword, so they are rebuilt from the text
+                projection["text"] = 1
+            cursor = (
+                self.tweets_col.find({}, projection=projection)
+                .sort([("_id", -1)])
+                .limit(limit)
+                .batch_size(10000)
+            )
+            for doc in cursor:
+                if "keywords" in doc:
+                    for kw in doc["keywords"]:
+                        yield tweet_key(kw, doc.get("text", ""), doc.get("tweet_id"))
+                elif doc.get("tweet_id"):
+                    yield tweet_key(doc.get("keyword", ""), "", doc["tweet_id"])
+                else:
+                    yield doc.get("text_sha1")
+        except PyMongoError as e:
+            logger.warning("[DB hashes] error: %s", e)
+    
+    def iter_fingerprints(self, since: datetime, limit: int) -> Iterator[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Iterate over SimHash fingerprints of recently classified canonical tweets.
+        
+        Args:
+            since: Only tweets inserted at or after this time
+            limit: Maximum number of tweets
+            
+        Yields:
+            ``(fingerprint, inserted_at timestamp, payload)`` tuples for the
+            near-duplicate index, newest first
+        """
+        if not self.enabled or self.tweets_col is None:
+            return
+        
+        query = {
+            "inserted_at": {"$gte": since},
+            "simhash": {"$exists": True},
+            "near_duplicate_of": {"$exists": False},
+            "classifier_version": {"$ne": None},
+        }
+        projection = {
+            "_id": 0, "simhash": 1, "inserted_at": 1, "tweet_id": 1, "text": 1,
+            "relevant": 1, "label": 1, "scores": 1, "classifier_version": 1, "incident_id": 1,
+        }
+        try:
+            cursor = self.tweets_col.find(query, projection=projection).sort(TWEET_SORT).limit(limit).batch_size(10000)
+            for doc in cursor:
+                yield from_int64(doc["simhash"]), doc["inserted_at"].timestamp(), {
+                    "near_duplicate_of": doc.get("tweet_id") or text_hash(doc.get("text", "")),
+                    "relevant": bool(doc.get("relevant", False)),
+                    "label": doc.get("label"),
+                    "scores": doc.get("scores") or {},
+                    "classifier_version": doc.get("classifier_version"),
+                    "incident_id": doc.get("incident_id"),
+                }
+        except PyMongoError as e:
+            logger.warning("[DB fingerprints] error: %s", e)
+    
     def fetch_tweets(
         self, 
         keyword: Optional[str] = None, 
         keywords: Optional[List[str]] = None,
         limit: int = 10,
-        relevant_only: bool = False
+        relevant_only: bool = False,
+        before: Optional[str] = None,
+        incident_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
-        Fetch tweets from database.
+        Fetch tweets from database, newest first.
         
         Args:
             keyword: Single keyword to filter
             keywords: Multiple keywords to filter
             limit: Maximum number of results
             relevant_only: Only return relevant tweets
+            before: Keyset cursor; only return tweets older than it
+            incident_id: Only return tweets assigned to this incident
             
         Returns:
-            List of tweet documents
+            List of tweet documents, each with a ``cursor`` for the next page
         """
-        if not self.enabled or not self.tweets_col:
+        if not self.enabled or self.tweets_col is None:
             return []
         
         try:
-            query = {}
-            if keyword:
-                query["keyword"] = keyword
-            elif keywords:
-                query["keyword"] = {"$in": keywords}
+            query = self._tweet_query(keyword, relevant_only, before)
+            if not keyword and keywords:
+                query[KEYWORD_FIELD] = {"$in": keywords}
+            if incident_id:
+                query["incident_id"] = incident_id
             
-            if relevant_only:
-                query["relevant"] = True
-            
-            docs = list(
-                self.tweets_col.find(query)
-                .sort([("inserted_at", -1)])
+            docs = (
+                self.tweets_col.find(query, projection=TWEET_PROJECTION)
+                .sort(TWEET_SORT)
                 .limit(limit)
             )
+            tweets = [self._serialize(d) for d in docs]
+            if keyword:
+                for tweet in tweets:
+                    tweet["keyword"] = keyword
+            return tweets
+        except Exception as e:
+            logger.warning("[DB fetch] error: %s", e)
+            return []
+    
+    def fetch_tweets_grouped(
+        self,
+        keywords: List[str],
+        limit: int = 10,
+        relevant_only: bool = False,
+        before: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch the newest tweets for several keywords in a single query.
+        
+        Each keyword is an index-backed ``$match``/``$sort``/``$limit`` branch
+        combined with ``$unionWith``, so every keyword gets up to ``limit``
+        tweets regardless of how active the others are.
+        
+        Args:
+            keywords: Keywords to fetch
+            limit: Maximum number of results per keyword
+            relevant_only: Only return relevant tweets
+            before: Keyset cursor applied to every keyword
             
+        Returns:
+            Mapping of keyword to tweet documents, newest first
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {kw: [] for kw in keywords}
+        if not self.enabled or self.tweets_col is None or not keywords:
+            return groups
+        
+        def branch(kw: str) -> List[Dict[str, Any]]:
             return [
-                {
-                    "keyword": d.get("keyword", ""),
-                    "text": d.get("text", ""),
-                    "relevant": bool(d.get("relevant", False)),
-                    "inserted_at": d.get("inserted_at"),
-                }
-                for d in docs
+                {"$match": self._tweet_query(kw, relevant_only, before)},
+                {"$sort": dict(TWEET_SORT)},
+                {"$limit": limit},
+                {"$project": TWEET_PROJECTION},
+                # Text-keyed documents can match several branches
+                {"$set": {"keyword": kw}},
             ]
+        
+        pipeline = branch(keywords[0])
+        for kw in keywords[1:]:
+            pipeline.append({"$unionWith": {"coll": self.tweets_col.name, "pipeline": branch(kw)}})
+        
+        try:
+            for doc in self.tweets_col.aggregate(pipeline):
+                groups.setdefault(doc.get("keyword", ""), []).append(self._serialize(doc))
         except Exception as e:
-            print(f"[DB fetch] error: {e}")
-            return []
+            logger.warning("[DB fetch] grouped error: %s", e)
+        return groups
     
     def update_relevance(self, doc_id, relevant: bool) -> bool:
         """Update relevance field for a document."""
-        if not self.enabled or not self.tweets_col:
+        if not self.enabled or self.tweets_col is None:
             return False
         
         try:
@@ -141,18 +756,177 @@ class DatabaseManager:
             )
             return True
         except PyMongoError as e:
-            print(f"[DB update] error: {e}")
+            logger.warning("[DB update] error: %s", e)
             return False
     
+    def fetch_timeseries(
+        self,
+        keywords: List[str],
+        granularity: str,
+        since: datetime,
+        until: datetime,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Read tweet counts per bucket from the rollup collection.
+        
+        The cost depends on the number of buckets in the range, not on the
+        size of the tweets collection.
+        
+        Args:
+            keywords: Keywords to read
+            granularity: "minute" or "hour"
+            since: Start of the range; its whole bucket is included
+            until: End of the range (exclusive)
+            
+        Returns:
+            Mapping of keyword to a dense series (see ``fill_series``)
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        docs: Dict[str, List[Dict[str, Any]]] = {kw: [] for kw in keywords}
+        if self.enabled and self.rollups_col is not None and keywords:
+            try:
+                cursor = self.rollups_col.find(
+                    {
+                        "granularity": granularity,
+                        "keyword": {"$in": keywords},
+                        "bucket": {"$gte": bucket_start(since, granularity), "$lt": until},
+                    },
+                    projection={"_id": 0, "keyword": 1, "bucket": 1, "total": 1, "relevant": 1, "labels": 1},
+                ).sort([("keyword", 1), ("bucket", 1)])
+                for doc in cursor:
+                    docs.setdefault(doc["keyword"], []).append(doc)
+            except PyMongoError as e:
+                logger.warning("[DB timeseries] error: %s", e)
+        return {kw: fill_series(items, granularity, since, until) for kw, items in docs.items()}
+    
+    def _count_inserted(
+        self,
+        keyword: str,
+        classified: List[Dict[str, Any]],
+        op_items: Dict[int, int],
+        upserted: Dict[int, Any],
+        added: List[Dict[str, Any]],
+        now: datetime,
+    ):
+        """
+        Add tweets newly stored for a keyword to the rollup buckets.
+        
+        Args:
+            keyword: Search keyword
+            classified: Items of the batch
+            op_items: Item index of each upsert, keyed by operation index
+            upserted: Operation indexes that inserted a document
+            added: Items of text-keyed documents that gained the keyword
+            now: Insertion time, used for tweets without a date
+        """
+        items = [classified[op_items[op]] for op in upserted if op in op_items] + added
+        if not items:
+            return
+        batch = RollupBatch()
+        for item in items:
+            batch.add(keyword, item.get('tweeted_at') or now, bool(item.get('relevant')), item.get('label'))
+        self._apply_rollups(batch)
+    
+    def _reclassification_deltas(self, updates: List[tuple]) -> RollupBatch:
+        """Move reclassified tweets between relevant and label counters."""
+        batch = RollupBatch()
+        new = {doc_id: item for doc_id, item in updates}
+        previous = self.tweets_col.find(
+            {"_id": {"$in": list(new)}},
+            projection={"keyword": 1, "keywords": 1, "tweeted_at": 1, "inserted_at": 1, "relevant": 1, "label": 1},
+        )
+        for doc in previous:
+            ts = doc.get("tweeted_at") or doc.get("inserted_at")
+            if not isinstance(ts, datetime):
+                continue
+            item = new[doc["_id"]]
+            before = (bool(doc.get("relevant")), doc.get("label"))
+            after = (bool(item.get('relevant')), item.get('label'))
+            if before == after:
+                continue
+            for kw in doc.get("keywords") or [doc.get("keyword", "")]:
+                batch.add(kw, ts, *before, sign=-1, count_total=False)
+                batch.add(kw, ts, *after, count_total=False)
+        return batch
+    
+    def _apply_rollups(self, batch: RollupBatch):
+        """Write collected bucket changes; failures only cost dashboard accuracy."""
+        ops = batch.ops()
+        if not ops or self.rollups_col is None:
+            return
+        try:
+            with metrics.timer('mongo_write_seconds', op='rollups'):
+                self.rollups_col.bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            logger.warning("[DB rollups] error: %s", e)
+            metrics.inc('mongo_write_errors_total', op='rollups')
+    
     @staticmethod
-    def _now_iso() -> str:
-        """Get current time as ISO string."""
-        return datetime.now(timezone.utc).isoformat()
+    def _classification_fields(item: Dict[str, Any], classified_at: datetime) -> Dict[str, Any]:
+        """Build the stored classification fields from a classifier result."""
+        return {
+            "relevant": bool(item.get('relevant', False)),
+            "label": item.get('label'),
+            "scores": item.get('scores') or {},
+            "classifier_version": item.get('classifier_version'),
+            "classified_at": classified_at,
+        }
     
     @staticmethod
-    def _sha1(text: str) -> str:
-        """Compute SHA1 hash of text."""
-        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    def _now() -> datetime:
+        """Get current UTC time, stored as a native BSON date."""
+        return datetime.now(timezone.utc)
+    
+    @staticmethod
+    def _serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a projected tweet document to its API representation."""
+        inserted_at = doc.get("inserted_at")
+        tweeted_at = doc.get("tweeted_at")
+        cursor = None
+        if isinstance(inserted_at, datetime):
+            cursor = encode_cursor(inserted_at, doc["_id"])
+            inserted_at = inserted_at.isoformat()
+        return {
+            "id": str(doc["_id"]),
+            "keyword": doc.get("keyword") or (doc.get("keywords") or [""])[0],
+            "keywords": doc.get("keywords") or ([doc["keyword"]] if doc.get("keyword") else []),
+            "text": doc.get("text", ""),
+            "tweet_id": doc.get("tweet_id"),
+            "author": doc.get("author"),
+            "tweeted_at": tweeted_at.isoformat() if isinstance(tweeted_at, datetime) else tweeted_at,
+            "link": doc.get("link"),
+            "relevant": bool(doc.get("relevant", False)),
+            "label": doc.get("label"),
+            "classifier_version": doc.get("classifier_version"),
+            "pending": bool(doc.get("pending")),
+            "near_duplicate_of": doc.get("near_duplicate_of"),
+            "incident_id": doc.get("incident_id"),
+            "inserted_at": inserted_at,
+            "cursor": cursor,
+        }
+    
+    @staticmethod
+    def _tweet_query(
+        keyword: Optional[str] = None,
+        relevant_only: bool = False,
+        before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a tweet filter, adding the keyset condition for ``before``."""
+        query: Dict[str, Any] = {}
+        if keyword:
+            query[KEYWORD_FIELD] = keyword
+        if relevant_only:
+            query["relevant"] = True
+        
+        position = decode_cursor(before) if before else None
+        if position:
+            inserted_at, doc_id = position
+            query["$or"] = [
+                {"inserted_at": {"$lt": inserted_at}},
+                {"inserted_at": inserted_at, "_id": {"$lt": doc_id}},
+            ]
+        return query
 
 
 # Global database instance
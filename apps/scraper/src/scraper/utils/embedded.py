@@ -0,0 +1,194 @@
+"""In-process classification with the classifier package, for single-node setups."""
+
+import logging
+import time
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread, Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import CLASSIFY_BATCH_SIZE, EMBEDDED_CLASSIFIER_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# A submitted batch, whether it wants embeddings, and the future its results
+# are delivered through
+Job = Tuple[List[str], bool, Future]
+
+
+class EmbeddedClassifier:
+    """
+    Hosts the classifier package's ``DisasterClassifier`` inside the scraper.
+
+    All model work runs on one worker thread, so the model is loaded once and
+    never used concurrently. Callers put their batch on a queue and block on
+    a future. The worker drains every batch waiting in the queue, up to
+    ``batch_size`` texts, and runs them through one encoder pass, so keyword
+    batches and backfill batches submitted at the same time share it. The
+    encoder releases the GIL while it runs, so API threads keep serving.
+    """
+
+    def __init__(self, batch_size: int = CLASSIFY_BATCH_SIZE, timeout: float = EMBEDDED_CLASSIFIER_TIMEOUT_SECONDS):
+        """
+        Initialize the embedded classifier; the model loads when the worker starts.
+
+        Args:
+            batch_size: Texts merged into one encoder pass at most
+            timeout: Seconds a caller waits for its batch
+        """
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.queue: "Queue[Job]" = Queue()
+        self.thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._model = None
+        self._is_related = None
+        self._version: Optional[str] = None
+        self._stats: Dict[str, Any] = {
+            'loaded': False,
+            'load_seconds': None,
+            'passes': 0,
+            'batches': 0,
+            'texts': 0,
+            'error': None,
+        }
+
+    def start(self) -> bool:
+        """Start the worker thread, which loads the model first, if not running."""
+        with self._lock:
+            if self.thread and self.thread.is_alive():
+                return False
+            self.thread = Thread(target=self._loop, name="embedded-classifier", daemon=True)
+            self.thread.start()
+        return True
+
+    def classify(self, texts: List[str], embeddings: bool = False) -> List[Dict[str, Any]]:
+        """
+        Classify texts on the worker thread.
+
+        Args:
+            texts: Texts to classify
+            embeddings: Also return the embedding of every relevant text
+
+        Returns:
+            One dictionary per text in the format of ``classify_texts``
+
+        Raises:
+            RuntimeError: If the classifier package or its model cannot be loaded
+            TimeoutError: If the batch is not done within the timeout
+        """
+        if not texts:
+            return []
+        self.start()
+        future: Future = Future()
+        self.queue.put((list(texts), embeddings, future))
+        return future.result(timeout=self.timeout)
+
+    def version(self) -> Optional[str]:
+        """Version tag of the hosted classifier, or None if the package is missing."""
+        if self._version is None:
+            try:
+                from classifier.config import CLASSIFIER_VERSION
+            except ImportError:
+                return None
+            self._version = CLASSIFIER_VERSION
+        return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        """Get load state and throughput counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['queued'] = self.queue.qsize()
+        stats['version'] = self._version
+        return stats
+
+    def _loop(self):
+        try:
+            self._load()
+        except Exception as e:
+            # Retried on the next batch; callers get the error meanwhile
+            logger.warning("[classifier] embedded model failed to load: %s", e)
+        while True:
+            jobs = [self.queue.get()]
+            size = len(jobs[0][0])
+            while size < self.batch_size:
+                try:
+                    job = self.queue.get_nowait()
+                except Empty:
+                    break
+                jobs.append(job)
+                size += len(job[0])
+            self._run(jobs)
+
+    def _run(self, jobs: List[Job]):
+        """Classify the texts of several jobs in one pass and resolve their futures."""
+        texts = [t for batch, _, _ in jobs for t in batch]
+        try:
+            self._load()
+            embeddings = self._model.embed(texts)
+            labels, sims = self._model.similarity_matrix(texts, embeddings)
+            results = []
+            for text, row, vector in zip(texts, sims, embeddings):
+                best = int(row.argmax())
+                relevant = bool(self._is_related(text, float(row[best])))
+                results.append({
+                    'text': text,
+                    'relevant': relevant,
+                    'label': labels[best],
+                    'scores': {label: float(score) for label, score in zip(labels, row)},
+                    'classifier_version': self._version,
+                    'embedding': vector if relevant else None,
+                })
+        except Exception as e:
+            with self._lock:
+                self._stats['error'] = str(e)
+            for _, _, future in jobs:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self._stats['passes'] += 1
+            self._stats['batches'] += len(jobs)
+            self._stats['texts'] += len(texts)
+            self._stats['error'] = None
+        offset = 0
+        for batch, with_embeddings, future in jobs:
+            answered = results[offset:offset + len(batch)]
+            if not with_embeddings:
+                answered = [{k: v for k, v in r.items() if k != 'embedding'} for r in answered]
+            future.set_result(answered)
+            offset += len(batch)
+
+    def _load(self):
+        """Import the classifier package and build its model, once."""
+        if self._model is not None:
+            return
+        started = time.perf_counter()
+        try:
+            from classifier.config import CLASSIFIER_VERSION
+            from classifier.models import get_classifier
+            from classifier.utils import is_related_from_similarity
+        except ImportError as e:
+            raise RuntimeError(
+                "CLASSIFIER_MODE=embedded needs the classifier package installed in the scraper environment"
+            ) from e
+        model = get_classifier()
+        self._is_related = is_related_from_similarity
+        self._version = CLASSIFIER_VERSION
+        self._model = model
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats.update(loaded=True, load_seconds=round(elapsed, 2), error=None)
+        logger.info("[classifier] embedded model %s loaded in %.1fs", CLASSIFIER_VERSION, elapsed)
+
+
+# Global embedded classifier instance
+_embedded: Optional[EmbeddedClassifier] = None
+
+
+def get_embedded_classifier() -> EmbeddedClassifier:
+    """Get or create the global embedded classifier."""
+    global _embedded
+    if _embedded is None:
+        _embedded = EmbeddedClassifier()
+    return _embedded
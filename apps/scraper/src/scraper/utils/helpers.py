@@ -1,9 +1,15 @@
 """Helper utilities for the scraper."""
 
 import json
+import logging
+import os
+import signal
 import subprocess
+import sys
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Set
+
+logger = logging.getLogger(__name__)
 
 
 def load_keywords_from_file(file_path: Path) -> List[str]:
@@ -22,7 +28,7 @@ def load_keywords_from_file(file_path: Path) -> List[str]:
             if isinstance(data, dict) and isinstance(data.get("keywords"), list):
                 return [str(kw).strip() for kw in data["keywords"] if str(kw).strip()]
     except Exception as e:
-        print(f"[keywords] failed to load: {e}")
+        logger.warning("[keywords] failed to load: %s", e)
     return []
 
 
@@ -54,7 +60,7 @@ def sanitize_keywords(keywords: List[str], max_count: int = 50, max_length: int
 
 
 def force_kill_drivers():
-    """Force kill Chrome and ChromeDriver processes (Windows)."""
+    """Force kill all Chrome and ChromeDriver processes (Windows, last resort)."""
     try:
         subprocess.run(["taskkill", "/F", "/IM", "chromedriver.exe", "/T"], capture_output=True)
         subprocess.run(["taskkill", "/F", "/IM", "chrome.exe", "/T"], capture_output=True)
@@ -62,12 +68,79 @@ def force_kill_drivers():
         pass
 
 
+def descendant_pids(pid: int) -> Set[int]:
+    """
+    Collect all descendant process IDs of a process.
+    
+    Uses ``/proc/<pid>/task/*/children`` on Linux and ``pgrep -P`` elsewhere.
+    
+    Args:
+        pid: Root process ID
+        
+    Returns:
+        Set of descendant process IDs (excluding ``pid``)
+    """
+    found: Set[int] = set()
+    stack = [pid]
+    while stack:
+        parent = stack.pop()
+        for child in _child_pids(parent):
+            if child not in found:
+                found.add(child)
+                stack.append(child)
+    return found
+
+
+def _child_pids(pid: int) -> List[int]:
+    """List direct children of a process."""
+    task_dir = Path(f"/proc/{pid}/task")
+    if task_dir.is_dir():
+        children: List[int] = []
+        try:
+            for task in task_dir.iterdir():
+                content = (task / "children").read_text().split()
+                children.extend(int(c) for c in content)
+        except OSError:
+            pass
+        return children
+    
+    try:
+        out = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True)
+        return [int(line) for line in out.stdout.split() if line.strip().isdigit()]
+    except Exception:
+        return []
+
+
+def kill_pids(pids: Iterable[int]):
+    """
+    Kill the given processes if they are still alive.
+    
+    Args:
+        pids: Process IDs to kill
+    """
+    for pid in pids:
+        if not pid or pid == os.getpid():
+            continue
+        try:
+            if sys.platform == "win32":
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+            else:
+                os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        except Exception:
+            pass
+
+
 def safe_close_driver(wrapper):
-    """Safely close Selenium driver wrapper."""
+    """
+    Safely close a scraper wrapper.
+    
+    Wrappers are responsible for reaping their own browser processes, so
+    only the processes of the driver being closed are touched.
+    """
     try:
         if wrapper:
             wrapper.close()
-    except Exception:
-        pass
-    finally:
-        force_kill_drivers()
+    except Exception as e:
+        logger.warning("[driver] close failed: %s", e)
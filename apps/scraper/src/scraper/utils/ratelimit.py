@@ -0,0 +1,230 @@
+"""Adaptive per-host rate limiting shared by all scraper workers."""
+
+import asyncio
+import logging
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from ..config import (
+    RATE_LIMIT_INITIAL_RPS,
+    RATE_LIMIT_MIN_RPS,
+    RATE_LIMIT_MAX_RPS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_INCREASE_RPS,
+    RATE_LIMIT_HEALTHY_STREAK,
+    RATE_LIMIT_BLOCK_COOLDOWN_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Token bucket for one host with additive-increase/multiplicative-decrease.
+
+    Every request reserves a token first. A blocked response (rate-limit or
+    challenge page) halves the rate and pauses the host for a cooldown;
+    every ``healthy_streak`` successful responses in a row raise the rate by
+    ``increase`` until ``max_rate``. The rate therefore settles just below
+    what the host tolerates instead of using fixed worst-case delays.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = RATE_LIMIT_INITIAL_RPS,
+        min_rate: float = RATE_LIMIT_MIN_RPS,
+        max_rate: float = RATE_LIMIT_MAX_RPS,
+        burst: float = RATE_LIMIT_BURST,
+        increase: float = RATE_LIMIT_INCREASE_RPS,
+        healthy_streak: int = RATE_LIMIT_HEALTHY_STREAK,
+        cooldown: float = RATE_LIMIT_BLOCK_COOLDOWN_SECONDS,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            host: Host name this limiter throttles
+            rate: Initial requests per second
+            min_rate: Lowest rate after repeated blocks
+            max_rate: Highest rate reached while healthy
+            burst: Bucket size (requests allowed back to back)
+            increase: Rate added after each healthy streak
+            healthy_streak: Consecutive successes needed before increasing
+            cooldown: Pause after a block, doubled for consecutive blocks
+        """
+        self.host = host
+        self.rate = min(max_rate, max(min_rate, rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.increase = increase
+        self.healthy_streak = max(1, healthy_streak)
+        self.cooldown = cooldown
+
+        self._lock = Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._streak = 0
+        self._consecutive_blocks = 0
+
+        self.requests = 0
+        self.blocks = 0
+        self.waited_seconds = 0.0
+        self.last_block_reason: Optional[str] = None
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly from the future.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            wait = max(wait, self._paused_until - now)
+            self.requests += 1
+            self.waited_seconds += wait
+            return wait
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait inside an event loop until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def report(self, blocked_reason: Optional[str]):
+        """
+        Feed back the outcome of a request.
+
+        Args:
+            blocked_reason: Why the response was blocked, or None if healthy
+        """
+        if blocked_reason:
+            self.report_blocked(blocked_reason)
+        else:
+            self.report_success()
+
+    def report_success(self):
+        """Record a healthy response and raise the rate after a streak."""
+        with self._lock:
+            self._consecutive_blocks = 0
+            self._streak += 1
+            if self._streak >= self.healthy_streak:
+                self._streak = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def report_blocked(self, reason: str = "blocked"):
+        """Record a blocked response: halve the rate and pause the host."""
+        with self._lock:
+            self._streak = 0
+            self._consecutive_blocks += 1
+            self.blocks += 1
+            self.last_block_reason = reason
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Drop saved-up tokens so the reduced rate applies right away
+            self._tokens = min(self._tokens, 0.0)
+            pause = self.cooldown * (2 ** min(self._consecutive_blocks - 1, 5))
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            logger.warning("[ratelimit] %s: %s; rate -> %.3f req/s, pausing %.0fs", self.host, reason, self.rate, pause)
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Get the learned rate and any pause for a checkpoint.
+
+        Returns:
+            Rate, consecutive blocks and the end of the pause in epoch seconds
+        """
+        with self._lock:
+            paused_for = self._paused_until - time.monotonic()
+            return {
+                'rate': round(self.rate, 4),
+                'consecutive_blocks': self._consecutive_blocks,
+                'paused_until': round(time.time() + paused_for) if paused_for > 0 else None,
+            }
+
+    def restore_state(self, state: Dict[str, Any]):
+        """
+        Resume from a checkpointed rate, so a restart does not probe a host
+        that blocked this scraper at the initial rate again.
+
+        Args:
+            state: Output of ``export_state``
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, max(self.min_rate, float(state.get('rate') or self.rate)))
+            self._consecutive_blocks = int(state.get('consecutive_blocks') or 0)
+            paused_until = state.get('paused_until')
+            if paused_until:
+                remaining = float(paused_until) - time.time()
+                if remaining > 0:
+                    self._paused_until = max(self._paused_until, time.monotonic() + remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the current rate and counters for status reporting."""
+        with self._lock:
+            return {
+                'rate_per_sec': round(self.rate, 4),
+                'requests': self.requests,
+                'blocks': self.blocks,
+                'last_block_reason': self.last_block_reason,
+                'paused_for_sec': round(max(0.0, self._paused_until - time.monotonic()), 1),
+                'waited_seconds': round(self.waited_seconds, 1),
+            }
+
+
+# Limiters shared by every worker, keyed by host
+_limiters: Dict[str, HostRateLimiter] = {}
+_limiters_lock = Lock()
+
+
+def get_rate_limiter(url_or_host: str) -> HostRateLimiter:
+    """
+    Get or create the shared limiter for a host.
+
+    Args:
+        url_or_host: Full URL or bare host name
+
+    Returns:
+        Limiter shared by all callers for that host
+    """
+    host = urlparse(url_or_host).netloc if "://" in url_or_host else url_or_host
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostRateLimiter(host)
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every host limiter."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.stats() for host, limiter in limiters.items()}
+
+
+def rate_limiter_state() -> Dict[str, Dict[str, Any]]:
+    """Get the checkpoint state of every host limiter."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.export_state() for host, limiter in limiters.items()}
+
+
+def restore_rate_limiters(state: Dict[str, Dict[str, Any]]):
+    """Restore host limiters from ``rate_limiter_state`` output."""
+    for host, saved in state.items():
+        get_rate_limiter(host).restore_state(saved)
@@ -1,58 +1,266 @@
 """Relevance checking utilities using classifier API."""
 
+import json
+import logging
+import time
+import numpy as np
+import pyarrow as pa
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-from ..config import CLASSIFIER_URL
+from ..config import (
+    CLASSIFIER_URL,
+    CLASSIFY_BATCH_SIZE,
+    CLASSIFIER_MODE,
+    CLASSIFIER_WIRE_FORMAT,
+    CIRCUIT_SLOW_CALL_SECONDS,
+)
+from ..metrics import get_metrics
+from .circuit import CircuitBreaker, OPEN, get_classifier_breaker
+from .embedded import get_embedded_classifier
 
+logger = logging.getLogger(__name__)
+metrics = get_metrics()
 
-def check_text_relevance(text: str, classifier_url: str = None) -> Dict[str, Any]:
+_VERSION_TTL_SECONDS = 60
+_version_cache: Dict[str, Any] = {'version': None, 'fetched_at': 0.0}
+
+# Media type of an Arrow IPC stream, shared with the classifier API
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+
+def classify_texts(
+    texts: List[str],
+    classifier_url: str = None,
+    embeddings: bool = False,
+) -> List[Dict[str, Any]]:
     """
-    Check if text is disaster-relevant using classifier API.
+    Classify texts in batches using the classifier batch endpoint.
     
     Args:
-        text: Text to check
+        texts: Texts to classify
         classifier_url: Optional custom classifier URL
+        embeddings: Also return the embedding of every relevant text
         
     Returns:
-        Dictionary with text and relevant boolean
+        One dictionary per text with ``relevant``, ``label``, ``scores`` and
+        ``classifier_version``, and with ``embeddings`` an ``embedding``
+        (unit-length float32 array, None for irrelevant texts). Texts that could not be classified get
+        ``relevant: False`` and ``classifier_version: None``; they are stored
+        as pending and classified once the classifier recovers. While the
+        circuit breaker is open batches fail immediately instead of waiting
+        for a timeout. In embedded mode the texts are classified in-process
+        unless ``classifier_url`` is given.
     """
     url = (classifier_url or CLASSIFIER_URL).rstrip("/")
+    embedded = _use_embedded(classifier_url)
+    breaker = get_classifier_breaker()
+    results: List[Dict[str, Any]] = []
     
-    try:
-        response = requests.post(
-            f"{url}/api/is_relevant",
-            json={"text": text},
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
+    for start in range(0, len(texts), CLASSIFY_BATCH_SIZE):
+        batch = texts[start:start + CLASSIFY_BATCH_SIZE]
+        metrics.observe('classifier_batch_size', len(batch))
+        if embedded:
+            results.extend(_classify_embedded(batch, embeddings))
+            continue
+        if not breaker.allow():
+            metrics.inc('classifier_requests_total', endpoint='batch', outcome='circuit_open')
+            results.extend(_unclassified(t) for t in batch)
+            continue
+        started = time.perf_counter()
+        params = {"embeddings": "1"} if embeddings else None
+        try:
+            if CLASSIFIER_WIRE_FORMAT == 'arrow':
+                response = requests.post(
+                    f"{url}/api/classify/batch",
+                    params=params,
+                    data=_encode_texts(batch),
+                    headers={"Content-Type": ARROW_MIME, "Accept": ARROW_MIME},
+                    timeout=30
+                )
+            else:
+                response = requests.post(
+                    f"{url}/api/classify/batch",
+                    params=params,
+                    json={"texts": batch},
+                    headers={"Content-Type": "application/json"},
+                    timeout=30
+                )
+            metrics.observe('classifier_request_seconds', time.perf_counter() - started, endpoint='batch')
+            if response.status_code != 200:
+                logger.warning("API error: %s - %s", response.status_code, response.text[:200])
+                metrics.inc('classifier_requests_total', endpoint='batch', outcome=f'http_{response.status_code}')
+                _record_status(breaker, response.status_code)
+                results.extend(_unclassified(t) for t in batch)
+                continue
+            
+            if response.headers.get('Content-Type', '').startswith(ARROW_MIME):
+                version, answered = _decode_results(response.content)
+                wire = 'arrow'
+            else:
+                payload = response.json()
+                version = payload.get('version')
+                answered = payload.get('results') or []
+                wire = 'json'
+            metrics.observe('classifier_response_bytes', len(response.content), format=wire)
+            for text, item in zip(batch, answered):
+                result = {
+                    'text': text,
+                    'relevant': bool(item.get('relevant', False)),
+                    'label': item.get('predicted_label'),
+                    'scores': item.get('similarity_scores') or {},
+                    'classifier_version': version,
+                }
+                if embeddings:
+                    vector = item.get('embedding')
+                    result['embedding'] = None if vector is None else np.asarray(vector, dtype=np.float32)
+                results.append(result)
+            # Keep results aligned with the input if the response came up short
+            results.extend(_unclassified(t) for t in batch[len(answered):])
+            if version:
+                _version_cache.update(version=version, fetched_at=time.time())
+            metrics.inc('classifier_requests_total', endpoint='batch', outcome='ok')
+            _record_call(breaker, time.perf_counter() - started)
+        except (requests.exceptions.RequestException, ValueError, pa.ArrowException) as e:
+            logger.warning("Request failed: %s", e)
+            metrics.inc('classifier_requests_total', endpoint='batch', outcome=type(e).__name__)
+            breaker.record_failure()
+            results.extend(_unclassified(t) for t in batch)
+    
+    return results
+
+
+def get_classifier_version(classifier_url: str = None) -> Optional[str]:
+    """
+    Get the version tag of the running classifier, cached for a minute.
+    
+    Args:
+        classifier_url: Optional custom classifier URL
         
+    Returns:
+        Version string, or None if the classifier is unreachable
+    """
+    if _use_embedded(classifier_url):
+        return get_embedded_classifier().version()
+    if _version_cache['version'] and time.time() - _version_cache['fetched_at'] < _VERSION_TTL_SECONDS:
+        return _version_cache['version']
+    
+    breaker = get_classifier_breaker()
+    if breaker.state == OPEN:
+        return None
+    url = (classifier_url or CLASSIFIER_URL).rstrip("/")
+    try:
+        response = requests.get(f"{url}/health", timeout=5)
         if response.status_code == 200:
-            result = response.json()
-            return {
-                'text': text,
-                'relevant': result.get('relevant', False)
-            }
-        else:
-            print(f"API error: {response.status_code} - {response.text}")
-            return {'text': text, 'relevant': False}
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-        return {'text': text, 'relevant': False}
-
-
-def is_relevant_bool(text: str) -> bool:
+            version = response.json().get('version')
+            if version:
+                _version_cache.update(version=version, fetched_at=time.time())
+            return version
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.warning("Request failed: %s", e)
+        # Only failures count; a success here must not resume deferred work
+        # from inside a caller that is itself starting it
+        breaker.record_failure()
+    return None
+
+
+def classifier_stats() -> Dict[str, Any]:
+    """Get the classifier mode and, in embedded mode, the state of the in-process model."""
+    if CLASSIFIER_MODE != 'embedded':
+        return {'mode': CLASSIFIER_MODE, 'url': CLASSIFIER_URL, 'circuit': get_classifier_breaker().stats()}
+    return {'mode': CLASSIFIER_MODE, **get_embedded_classifier().stats()}
+
+
+def _record_call(breaker: CircuitBreaker, elapsed: float):
+    """Record an answered request, counting one slower than the limit as a failure."""
+    if elapsed > CIRCUIT_SLOW_CALL_SECONDS:
+        logger.warning("Classifier answered in %.1fs", elapsed)
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _record_status(breaker: CircuitBreaker, status: int):
+    """Record an error response; only overload and server errors mean the classifier is unhealthy."""
+    if status == 429 or status >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _use_embedded(classifier_url: Optional[str]) -> bool:
+    """Whether to classify in-process; an explicit URL always goes over HTTP."""
+    return CLASSIFIER_MODE == 'embedded' and not classifier_url
+
+
+def _classify_embedded(batch: List[str], embeddings: bool = False) -> List[Dict[str, Any]]:
+    """Classify one batch with the in-process model, or mark it unclassified on failure."""
+    started = time.perf_counter()
+    try:
+        results = get_embedded_classifier().classify(batch, embeddings)
+    except Exception as e:
+        logger.warning("Embedded classification failed: %s", e)
+        metrics.inc('classifier_requests_total', endpoint='embedded', outcome=type(e).__name__)
+        return [_unclassified(t) for t in batch]
+    metrics.observe('classifier_request_seconds', time.perf_counter() - started, endpoint='embedded')
+    metrics.inc('classifier_requests_total', endpoint='embedded', outcome='ok')
+    return results
+
+
+def _encode_texts(texts: List[str]) -> bytes:
+    """Encode a batch request as an Arrow IPC stream with one ``text`` column."""
+    batch = pa.RecordBatch.from_arrays([pa.array(texts, pa.string())], names=["text"])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode_results(body: bytes) -> Tuple[Optional[str], List[Dict[str, Any]]]:
     """
-    Simple boolean check for text relevance.
+    Decode an Arrow batch response into the items of the JSON format.
+    
+    The score matrix arrives as one float32 buffer; it only becomes per-label
+    dictionaries here, because tweets store their scores that way. An
+    ``embedding`` column becomes one array view per relevant row.
     
     Args:
-        text: Text to check
+        body: Arrow IPC stream from the classifier
         
     Returns:
-        True if relevant, False otherwise
+        Tuple of (classifier version, result items)
     """
-    result = check_text_relevance(text)
-    try:
-        return bool(result.get('relevant', False))
-    except Exception:
-        return False
+    table = pa.ipc.open_stream(body).read_all()
+    meta = table.schema.metadata or {}
+    version = meta.get(b'version', b'').decode() or None
+    labels = json.loads(meta.get(b'labels', b'[]'))
+    scores = table.column('scores').combine_chunks().flatten().to_numpy()
+    rows = scores.reshape(table.num_rows, len(labels)).tolist() if labels else [[] for _ in range(table.num_rows)]
+    items = [
+        {'predicted_label': label, 'relevant': relevant, 'similarity_scores': dict(zip(labels, row))}
+        for label, relevant, row in zip(
+            table.column('predicted_label').to_pylist(),
+            table.column('relevant').to_pylist(),
+            rows,
+        )
+    ]
+    if 'embedding' in table.column_names:
+        column = table.column('embedding').combine_chunks()
+        size = column.type.list_size
+        # The values buffer keeps a slot per row, null rows included
+        matrix = column.values.slice(column.offset * size, len(column) * size).to_numpy()
+        matrix = matrix.reshape(len(column), size)
+        for item, row, missing in zip(items, matrix, column.is_null().to_pylist()):
+            item['embedding'] = None if missing else row
+    return version, items
+
+
+def _unclassified(text: str) -> Dict[str, Any]:
+    """Placeholder result for a text the classifier did not answer for."""
+    return {
+        'text': text,
+        'relevant': False,
+        'label': None,
+        'scores': {},
+        'classifier_version': None,
+    }
@@ -0,0 +1,137 @@
+"""Time-bucketed tweet counts maintained alongside the tweets collection."""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from ..config import ROLLUP_MINUTE_RETENTION_DAYS
+
+# Bucket widths served by the timeseries endpoint
+GRANULARITIES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+}
+
+# (granularity, keyword, bucket start) -> field -> delta
+Deltas = Dict[Tuple[str, str, datetime], Dict[str, int]]
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    """
+    Truncate a timestamp to the start of its bucket.
+
+    Args:
+        ts: Timestamp; naive values are taken as UTC
+        granularity: Key of ``GRANULARITIES``
+
+    Returns:
+        UTC start of the bucket
+    """
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    ts = ts.astimezone(timezone.utc).replace(second=0, microsecond=0)
+    if granularity == "hour":
+        ts = ts.replace(minute=0)
+    return ts
+
+
+def label_field(label: str) -> str:
+    """Field name of a label counter; Mongo field names cannot hold dots or a leading $."""
+    return "labels." + str(label).replace(".", "_").lstrip("$")
+
+
+class RollupBatch:
+    """
+    Count changes collected during one write, applied with one ``$inc`` upsert per bucket.
+
+    ``total`` counts every stored tweet, ``relevant`` the relevant ones and
+    ``labels.<label>`` the relevant ones per predicted label. Tweets are
+    bucketed by ``tweeted_at`` when known, else by ``inserted_at``.
+    """
+
+    def __init__(self):
+        self.deltas: Deltas = defaultdict(lambda: defaultdict(int))
+
+    def add(
+        self,
+        keyword: str,
+        ts: datetime,
+        relevant: bool,
+        label: Optional[str],
+        sign: int = 1,
+        count_total: bool = True,
+    ):
+        """
+        Count one tweet in every granularity.
+
+        Args:
+            keyword: Search keyword
+            ts: Time the tweet is bucketed by
+            relevant: Whether the tweet is relevant
+            label: Predicted label
+            sign: 1 to add the tweet, -1 to remove it (reclassification)
+            count_total: Whether to change ``total`` as well
+        """
+        for granularity in GRANULARITIES:
+            fields = self.deltas[(granularity, keyword, bucket_start(ts, granularity))]
+            if count_total:
+                fields["total"] += sign
+            if relevant:
+                fields["relevant"] += sign
+                if label:
+                    fields[label_field(label)] += sign
+
+    def ops(self) -> List[UpdateOne]:
+        """Build the upserts, skipping buckets whose changes cancel out."""
+        expires_after = timedelta(days=ROLLUP_MINUTE_RETENTION_DAYS)
+        ops = []
+        for (granularity, keyword, bucket), fields in self.deltas.items():
+            inc = {field: delta for field, delta in fields.items() if delta}
+            if not inc:
+                continue
+            update: Dict[str, Any] = {"$inc": inc}
+            if granularity == "minute" and ROLLUP_MINUTE_RETENTION_DAYS > 0:
+                # Only minute buckets expire; hour buckets are kept
+                update["$setOnInsert"] = {"expires_at": bucket + expires_after}
+            ops.append(UpdateOne(
+                {"granularity": granularity, "keyword": keyword, "bucket": bucket},
+                update,
+                upsert=True,
+            ))
+        return ops
+
+
+def fill_series(
+    docs: List[Dict[str, Any]],
+    granularity: str,
+    since: datetime,
+    until: datetime,
+) -> List[Dict[str, Any]]:
+    """
+    Turn bucket documents of one keyword into a dense series with zero buckets.
+
+    Args:
+        docs: Rollup documents sorted by bucket
+        granularity: Key of ``GRANULARITIES``
+        since: Start of the range
+        until: End of the range (exclusive)
+
+    Returns:
+        One point per bucket with ``t`` (ISO 8601), ``total``, ``relevant`` and ``labels``
+    """
+    by_bucket = {bucket_start(d["bucket"], granularity): d for d in docs}
+    step = GRANULARITIES[granularity]
+    points = []
+    bucket = bucket_start(since, granularity)
+    while bucket < until:
+        doc = by_bucket.get(bucket, {})
+        points.append({
+            "t": bucket.isoformat(),
+            "total": doc.get("total", 0),
+            "relevant": doc.get("relevant", 0),
+            "labels": {k: v for k, v in (doc.get("labels") or {}).items() if v},
+        })
+        bucket += step
+    return points
@@ -0,0 +1,130 @@
+"""Bounded in-memory seen-set for tweet hashes."""
+
+import math
+import time
+from threading import Lock
+from typing import Any, Dict, Iterable, List
+
+from ..config import SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE
+
+
+class SeenFilter:
+    """
+    Generational Bloom filter of tweet hashes.
+
+    Keys are hex digests (the ``text_sha1`` stored in Mongo), so bit positions
+    are derived from the digest itself instead of rehashing. Two generations
+    are kept: once the current one holds ``capacity`` keys it becomes the
+    previous one and the oldest generation is dropped, which bounds memory
+    while remembering the most recent ``capacity``-``2 * capacity`` keys.
+    """
+
+    def __init__(self, capacity: int = SEEN_FILTER_CAPACITY, error_rate: float = SEEN_FILTER_ERROR_RATE):
+        """
+        Initialize the filter.
+
+        Args:
+            capacity: Keys per generation
+            error_rate: Target false positive rate per generation
+        """
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+
+        self._lock = Lock()
+        self._current = bytearray((self.num_bits + 7) // 8)
+        self._previous = bytearray((self.num_bits + 7) // 8)
+        self._current_count = 0
+        self._previous_count = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.rotations = 0
+        self.warmed = 0
+        self.warm_seconds = 0.0
+
+    def _positions(self, key: str) -> List[int]:
+        """Derive bit positions by double hashing on two halves of the digest."""
+        h1 = int(key[:16], 16)
+        h2 = int(key[16:32], 16) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    @staticmethod
+    def _test(bits: bytearray, positions: List[int]) -> bool:
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def add(self, key: str):
+        """Record a key as seen."""
+        positions = self._positions(key)
+        with self._lock:
+            if self._test(self._current, positions):
+                return
+            if self._current_count >= self.capacity:
+                self._previous, self._current = self._current, bytearray(len(self._current))
+                self._previous_count, self._current_count = self._current_count, 0
+                self.rotations += 1
+            for p in positions:
+                self._current[p >> 3] |= 1 << (p & 7)
+            self._current_count += 1
+
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a key was probably seen, updating hit statistics.
+
+        Args:
+            key: Hex digest of the tweet
+
+        Returns:
+            True if seen (subject to the false positive rate), False if definitely new
+        """
+        positions = self._positions(key)
+        with self._lock:
+            seen = self._test(self._current, positions) or self._test(self._previous, positions)
+            if seen:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return seen
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains(key)
+
+    def warm(self, keys: Iterable[str]) -> int:
+        """
+        Preload keys, e.g. hashes of tweets already stored in Mongo.
+
+        Args:
+            keys: Iterable of hex digests
+
+        Returns:
+            Number of keys loaded
+        """
+        started = time.time()
+        count = 0
+        for key in keys:
+            if key:
+                self.add(key)
+                count += 1
+        self.warmed += count
+        self.warm_seconds = round(time.time() - started, 3)
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit rate and memory usage for status reporting."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': self._current_count + self._previous_count,
+                'capacity': self.capacity,
+                'error_rate': self.error_rate,
+                'hash_functions': self.num_hashes,
+                'memory_bytes': len(self._current) + len(self._previous),
+                'lookups': lookups,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'rotations': self.rotations,
+                'warmed': self.warmed,
+                'warm_seconds': self.warm_seconds,
+            }
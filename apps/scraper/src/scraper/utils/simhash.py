@@ -0,0 +1,218 @@
+"""SimHash fingerprints and a banded index for near-duplicate tweet lookup."""
+
+import hashlib
+import re
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..config import NEAR_DUP_MAX_DISTANCE, NEAR_DUP_WINDOW_SECONDS, NEAR_DUP_CAPACITY
+
+FINGERPRINT_BITS = 64
+# Parts that differ between copies of the same text: links (t.co wrappers,
+# tracking ids), retweet prefixes and mentions
+NOISE_RE = re.compile(r"https?://\S+|\b\S+\.\S+/\S*|^rt\b|@\w+")
+TOKEN_RE = re.compile(r"\w+")
+DIGITS_RE = re.compile(r"\d+")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Features are the lowercase words and word pairs, with links, retweet
+    prefixes and mentions removed and every number reduced to one token, so
+    retweets, changed links or different figures in a templated alert only
+    flip a few bits.
+
+    Args:
+        text: Tweet text
+
+    Returns:
+        Unsigned 64-bit fingerprint, 0 for a text without words
+    """
+    tokens = TOKEN_RE.findall(DIGITS_RE.sub("0", NOISE_RE.sub(" ", text.lower())))
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+def to_int64(fingerprint: int) -> int:
+    """Store an unsigned fingerprint in a signed BSON long."""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def from_int64(value: int) -> int:
+    """Read a fingerprint stored by ``to_int64``."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "ts", "payload")
+
+    def __init__(self, fingerprint: int, ts: float, payload: Dict[str, Any]):
+        self.fingerprint = fingerprint
+        self.ts = ts
+        self.payload = payload
+
+
+class NearDuplicateIndex:
+    """
+    Fingerprints of recently classified tweets, searchable by Hamming distance.
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    at most ``max_distance`` bits apart agree on at least one band, so a
+    lookup only compares the entries sharing a band value with the query
+    instead of scanning the window. Entries older than ``window`` seconds, or
+    beyond ``capacity``, are evicted oldest first.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = NEAR_DUP_MAX_DISTANCE,
+        window: float = NEAR_DUP_WINDOW_SECONDS,
+        capacity: int = NEAR_DUP_CAPACITY,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            max_distance: Largest Hamming distance counted as a near-duplicate,
+                negative to disable the index
+            window: Seconds an entry stays searchable
+            capacity: Maximum number of entries
+        """
+        self.max_distance = min(max_distance, FINGERPRINT_BITS // 4 - 1)
+        self.window = window
+        self.capacity = max(1, capacity)
+        bands = max(1, self.max_distance + 1)
+        width, extra = divmod(FINGERPRINT_BITS, bands)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for i in range(bands):
+            bits = width + (1 if i < extra else 0)
+            self._bands.append((shift, (1 << bits) - 1))
+            shift += bits
+
+        self._lock = Lock()
+        self._entries: Deque[_Entry] = deque()
+        self._buckets: List[Dict[int, List[_Entry]]] = [{} for _ in self._bands]
+        self.lookups = 0
+        self.hits = 0
+        self.compared = 0
+        self.warmed = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether near-duplicate suppression is configured."""
+        return self.max_distance >= 0
+
+    def find(self, fingerprint: int, now: Optional[float] = None) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Find the closest entry within the distance threshold.
+
+        Args:
+            fingerprint: Fingerprint of the new tweet
+            now: Current time, defaults to the wall clock
+
+        Returns:
+            Tuple of (payload, distance) of the closest entry, or None
+        """
+        if not self.enabled or not fingerprint:
+            return None
+        with self._lock:
+            self._evict(time.time() if now is None else now)
+            self.lookups += 1
+            best: Optional[_Entry] = None
+            best_distance = self.max_distance + 1
+            seen = set()
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                for entry in buckets.get((fingerprint >> shift) & mask, ()):
+                    if id(entry) in seen:
+                        continue
+                    seen.add(id(entry))
+                    distance = hamming(fingerprint, entry.fingerprint)
+                    if distance < best_distance:
+                        best, best_distance = entry, distance
+            self.compared += len(seen)
+            if best is None:
+                return None
+            self.hits += 1
+            return best.payload, best_distance
+
+    def add(self, fingerprint: int, payload: Dict[str, Any], ts: Optional[float] = None):
+        """
+        Make a classified tweet findable.
+
+        Args:
+            fingerprint: Fingerprint of the tweet
+            payload: Canonical reference and classification returned by ``find``
+            ts: Time the tweet was classified, defaults to the wall clock
+        """
+        if not self.enabled or not fingerprint:
+            return
+        entry = _Entry(fingerprint, time.time() if ts is None else ts, payload)
+        with self._lock:
+            self._entries.append(entry)
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                buckets.setdefault((fingerprint >> shift) & mask, []).append(entry)
+            self._evict(time.time())
+
+    def warm(self, items: Iterable[Tuple[int, float, Dict[str, Any]]]) -> int:
+        """
+        Load stored fingerprints, oldest first.
+
+        Args:
+            items: ``(fingerprint, timestamp, payload)`` tuples
+
+        Returns:
+            Number of entries loaded
+        """
+        if not self.enabled:
+            return 0
+        loaded = 0
+        for fingerprint, ts, payload in sorted(items, key=lambda item: item[1]):
+            self.add(fingerprint, payload, ts)
+            loaded += 1
+        self.warmed += loaded
+        return loaded
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit counters for status reporting."""
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'max_distance': self.max_distance,
+                'entries': len(self._entries),
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'hit_rate': round(self.hits / self.lookups, 4) if self.lookups else None,
+                'avg_compared': round(self.compared / self.lookups, 2) if self.lookups else None,
+                'warmed': self.warmed,
+            }
+
+    def _evict(self, now: float):
+        """Drop expired and surplus entries; the caller holds the lock."""
+        cutoff = now - self.window
+        while self._entries and (self._entries[0].ts < cutoff or len(self._entries) > self.capacity):
+            entry = self._entries.popleft()
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                key = (entry.fingerprint >> shift) & mask
+                bucket = buckets.get(key)
+                if bucket is None:
+                    continue
+                bucket.remove(entry)
+                if not bucket:
+                    del buckets[key]